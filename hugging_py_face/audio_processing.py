@@ -1,19 +1,24 @@
 from pandas import DataFrame
 from typing import Text, List, Dict, Optional, Union
 
+from .columnar import add_classification_columns
+from .frames import supports_frames
+from .deadlines import supports_deadline
 from .multimedia_processing import MultimediaProcessing
 
 
 class AudioProcessing(MultimediaProcessing):
-    def __init__(self, api_token):
-        super().__init__(api_token)
+    def __init__(self, api_token: Text, api_url: Optional[Text] = None, config: Optional[Dict] = None):
+        super().__init__(api_token, api_url, config)
 
+    @supports_deadline
     def automatic_speech_recognition(self, inputs: Union[Text, List], model: Optional[Text] = None) -> Union[Dict, List]:
         """
         Perform speech recognition on an audio file from a file path or an url.
 
         :param inputs: a string or a list of strings of the file paths or urls of the audio files to perform speech recognition on.
         :param model: the model to use for the speech recognition task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a dictionary or a list of dictionaries containing the text recognized from the audio file(s).
         """
         if type(inputs) == list:
@@ -21,6 +26,8 @@ class AudioProcessing(MultimediaProcessing):
         elif type(inputs) == str:
             return self._query(inputs, model=model, task="automatic-speech-recognition")
 
+    @supports_deadline
+    @supports_frames
     def automatic_speech_recognition_in_df(self, df: DataFrame, column: Text, model: Optional[Text] = None) -> DataFrame:
         """
         Perform speech recognition on audio files from a DataFrame.
@@ -28,18 +35,21 @@ class AudioProcessing(MultimediaProcessing):
         :param df: a pandas DataFrame containing the audio files to perform speech recognition on.
         :param column: the name of the column containing the file paths or urls of the audio files to perform speech recognition on.
         :param model: the model to use for the speech recognition task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a pandas DataFrame with the text recognized from the audio files. The text will be added as a new column called 'predictions' to the original DataFrame.
         """
         predictions = self._query_in_df(df, column, model=model, task="automatic-speech-recognition")
         df["predictions"] = [prediction['text'] for prediction in predictions]
         return df
 
+    @supports_deadline
     def audio_classification(self, inputs: Text, model: Optional[Text] = None) -> List:
         """
         Classify an audio file from a file path or an url.
 
         :param inputs: a string or a list of strings of the file paths or urls of the audio files to classify.
         :param model: the model to use for the audio classification task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a list of dictionaries or a list of lists of dictionaries each containing the label and the confidence score for that label.
         """
         if type(inputs) == list:
@@ -47,15 +57,28 @@ class AudioProcessing(MultimediaProcessing):
         elif type(inputs) == str:
             return self._query(inputs, model=model, task="audio-classification")
 
-    def audio_classification_in_df(self, df: DataFrame, column: Text, model: Optional[Text] = None) -> DataFrame:
+    @supports_deadline
+    @supports_frames
+    def audio_classification_in_df(self, df: DataFrame, column: Text, model: Optional[Text] = None, columnar: bool = False, score_matrix: bool = False, inplace: bool = True) -> DataFrame:
         """
         Classify audio files from a DataFrame.
 
         :param df: a pandas DataFrame containing the audio files to classify.
         :param column: the name of the column containing the file paths or urls of the audio files to classify.
         :param model: the model to use for the audio classification task. If not provided, the recommended model from Hugging Face will be used.
+        :param columnar: whether to add the labels and their confidence scores as Arrow-backed columns called 'predictions' and 'scores'. Requires pyarrow.
+        :param score_matrix: whether to also store a dense label x confidence score matrix in a list column called 'score_matrix', with the label of each matrix column in df.attrs['score_labels']. hugging_py_face.columnar.get_score_matrix returns it as a 2D NumPy array. Implies columnar.
+        :param inplace: whether to add the predictions to the original DataFrame. If False, a new DataFrame will be returned and the original will be left untouched.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a pandas DataFrame with the label for the audio files. Each label added will be the one with the highest confidence score for that particular audio file. The label will be added as a new column called 'predictions' to the original DataFrame.
         """
         predictions = self._query_in_df(df, column, model=model, task="audio-classification")
+
+        if not inplace:
+            df = df.copy(deep=False)
+
+        if columnar or score_matrix:
+            return add_classification_columns(df, predictions, score_matrix)
+
         df["predictions"] = [prediction[0]['label'] for prediction in predictions]
         return df
\ No newline at end of file
@@ -1,24 +1,68 @@
+import os
 import json
+import time
+import hashlib
+import contextlib
+import contextvars
 import logging
+import weakref
+import threading
 import logging.config
+import requests
+import numpy as np
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 from huggingface_hub import HfApi
-from typing import Text, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError, as_completed, wait
+from typing import Text, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from .config_parser import ConfigParser
-from .exceptions import TaskModelMismatchException
+from .hedging import HedgingPolicy
+from .circuit_breaker import CircuitBreaker
+from .compression import SUPPORTED_ENCODINGS, TransferStats, compress, is_compressible
+from .deadlines import check_deadline, get_expiry, time_left, run_with_expiry
+from .scheduling import PriorityScheduler, get_priority, _priority
+from .coordination import SharedState
+from .cascade import CascadeStats, run_cascade
+from .warm_up import ModelWarmer, build_probe
+from .endpoints import Endpoint, EndpointPool
+from .exceptions import TaskModelMismatchException, HTTPServiceUnavailableException, APICallException, CircuitOpenException, InsufficientParametersException, DeadlineExceededException
 
 logging_config_parser = ConfigParser('config/logging.yaml')
 logging.config.dictConfig(logging_config_parser.get_config_dict())
 logger = logging.getLogger()
 
+# the clients of the process, which are marked stale in a forked child so that it does not share their connections and locks with the parent
+_clients = weakref.WeakSet()
+# serializes the rebuilding of stale clients, in case a child starts threads before it first uses them
+_rebuild_lock = threading.Lock()
+
+
+def _mark_clients_stale_after_fork() -> None:
+    # the child only drops the state of its clients here, as building it again may take locks or do I/O, which is unsafe in a fork hook.
+    # Each client rebuilds its state on first use instead, through BaseAPI.__getattr__
+    global _rebuild_lock
+    _rebuild_lock = threading.Lock()
+
+    for client in list(_clients):
+        for name in client._setup_attributes:
+            client.__dict__.pop(name, None)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_mark_clients_stale_after_fork)
+
 
 class BaseAPI:
-    def __init__(self, api_token: Text, api_url: Optional[Text] = None):
+    def __init__(self, api_token: Text, api_url: Optional[Text] = None, config: Optional[Dict] = None):
         self.api_token = api_token
 
         config_parser = ConfigParser()
         self.config = config_parser.get_config_dict()
 
+        if config is not None:
+            self.config.update(config)
+
         if api_url:
             self.api_url = api_url
         else:
@@ -26,13 +70,478 @@ class BaseAPI:
 
         self.logger = logger
 
+        if self.config['REQUEST_COMPRESSION'] is not None and self.config['REQUEST_COMPRESSION'] not in SUPPORTED_ENCODINGS:
+            raise ValueError(f"Unsupported request compression: {self.config['REQUEST_COMPRESSION']}. Supported compressions are: {', '.join(SUPPORTED_ENCODINGS)}.")
+
+        if self.config['DEFAULT_PRIORITY'] not in self.config['PRIORITY_WEIGHTS']:
+            raise ValueError(f"Unknown default priority: {self.config['DEFAULT_PRIORITY']}. Priorities are: {', '.join(self.config['PRIORITY_WEIGHTS'])}.")
+
+        self._matched_models = set()
+        self._uncompressed_urls = set()
+
+        self._build()
+        _clients.add(self)
+
+    def _build(self) -> None:
+        # the attributes set by _setup are recorded, so that they can be dropped in a forked child and rebuilt when next used
+        attributes = set(self.__dict__)
+        self._setup()
+        self._setup_attributes = frozenset(self.__dict__) - attributes
+
+    def __getattr__(self, name: Text):
+        # only called for missing attributes, so it costs nothing until a fork has dropped the state of the client
+        if name in self.__dict__.get('_setup_attributes', ()):
+            with _rebuild_lock:
+                if name not in self.__dict__:
+                    self._build()
+
+            return self.__dict__[name]
+
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def _setup(self) -> None:
+        # builds the state holding connections, threads and locks, which can neither be pickled nor shared with a forked process
         self.hf_api = HfApi()
 
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.config['MAX_WORKERS'])
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # ask for every response encoding that can be decoded with the installed libraries
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+
+        self.transfer_stats = TransferStats()
+        self.cascade_stats = CascadeStats()
+
+        if self.config['MAX_CONCURRENT_REQUESTS'] is not None:
+            self.scheduler = PriorityScheduler(self.config['MAX_CONCURRENT_REQUESTS'], self.config['PRIORITY_WEIGHTS'])
+        else:
+            self.scheduler = None
+
+        if self.config['SHARED_STATE_PATH']:
+            self.shared_state = SharedState(
+                os.path.expanduser(self.config['SHARED_STATE_PATH']),
+                rate_limit=self.config['SHARED_RATE_LIMIT'],
+                burst=self.config['SHARED_RATE_LIMIT_BURST'],
+                cache_ttl=self.config['SHARED_CACHE_TTL'],
+                claim_timeout=self.config['SHARED_CLAIM_TIMEOUT']
+            )
+        else:
+            self.shared_state = None
+
+        self.endpoint_pools = {
+            key: EndpointPool(
+                urls,
+                routing=self.config['ENDPOINT_ROUTING'],
+                ejection_threshold=self.config['ENDPOINT_EJECTION_THRESHOLD'],
+                health_check_interval=self.config['ENDPOINT_HEALTH_CHECK_INTERVAL'],
+                health_check=self._check_endpoint_health
+            )
+            for key, urls in self.config['ENDPOINTS'].items()
+        }
+
+        self.circuit_breakers = {}
+        self._circuit_breakers_lock = threading.Lock()
+
+        self.model_warmer = ModelWarmer(self._probe_model)
+
+        if self.config['HEDGING']:
+            self.hedging = HedgingPolicy(self.config['HEDGE_DELAY'], self.config['HEDGE_PERCENTILE'], self.config['HEDGE_MAX_PER_SECOND'])
+        else:
+            self.hedging = None
+
+    def __getstate__(self) -> Dict:
+        # only what is needed to build the client again is pickled, so clients can be sent to the processes of a pool
+        return {'api_token': self.api_token, 'api_url': self.api_url, 'config': self.config}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self.logger = logger
+        self._matched_models = set()
+        self._uncompressed_urls = set()
+
+        self._build()
+        _clients.add(self)
+
     def _check_model_task_match(self, model: Text, task: Text) -> None:
+        if (model, task) in self._matched_models:
+            return
+
         metadata = self.hf_api.model_info(model)
         if task != metadata.pipeline_tag:
             raise TaskModelMismatchException(f"The task {task} is not supported by the model {model}.")
-        
+
+        self._matched_models.add((model, task))
+
+    def warm_up(self, models: Optional[List[Text]] = None, tasks: Optional[List[Text]] = None, wait: bool = False, timeout: Optional[float] = None) -> Dict[Text, bool]:
+        """
+        Load models on the Inference API in the background, so that later calls do not spend their retries waiting for the models to load.
+
+        :param models: a list of the models to load. The task of each model is looked up on the Hugging Face Hub.
+        :param tasks: a list of tasks to load the recommended models from Hugging Face for. Translation models have to be passed in models instead.
+        :param wait: whether to block until all of the models have loaded.
+        :param timeout: the maximum number of seconds to wait for the models to load if wait is True.
+        :return: a dict mapping each model to whether it is ready to serve requests.
+        """
+        targets = {}
+        for task in tasks or []:
+            if task == 'translation':
+                raise InsufficientParametersException("Translation models have to be warmed up by passing their names in models.")
+            targets[self.config['TASK_MODEL_MAP'][task]] = task
+
+        for model in models or []:
+            targets[model] = self.hf_api.model_info(model).pipeline_tag
+
+        events = [self.model_warmer.start(model, task) for model, task in targets.items()]
+
+        if wait:
+            deadline = time.monotonic() + timeout if timeout is not None else None
+            for event in events:
+                event.wait(max(0.0, deadline - time.monotonic()) if deadline is not None else None)
+
+        return {model: self.model_warmer.is_ready(model) for model in targets}
+
+    @contextlib.contextmanager
+    def priority(self, priority: Text) -> Iterator[None]:
+        """
+        Send the requests of the calls made within a with block with a priority class, e.g. 'bulk' for a background job that should
+        not hold up latency-sensitive calls. Priorities only take effect if MAX_CONCURRENT_REQUESTS is set.
+
+        :param priority: the priority class, one of the keys of PRIORITY_WEIGHTS.
+        """
+        if priority not in self.config['PRIORITY_WEIGHTS']:
+            raise ValueError(f"Unknown priority: {priority}. Priorities are: {', '.join(self.config['PRIORITY_WEIGHTS'])}.")
+
+        token = _priority.set(priority)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    @contextlib.contextmanager
+    def _scheduled(self) -> Iterator[None]:
+        if self.scheduler is None:
+            yield
+            return
+
+        self.scheduler.acquire(get_priority() or self.config['DEFAULT_PRIORITY'], time_left())
+        try:
+            yield
+        finally:
+            self.scheduler.release()
+
+    def _probe_model(self, model: Text, task: Text) -> bool:
+        data, extra_headers = build_probe(task)
+        try:
+            # the probe is sent even if its response is cached, as its purpose is to load the model
+            self._request(data, model, task, extra_headers)
+        except APICallException:
+            # only a loaded model can reject the probe, so the model is ready all the same
+            pass
+
+        return True
+
+    def _wait_for_model(self, model: Optional[Text], task: Text) -> None:
+        model = model if model is not None else self.config['TASK_MODEL_MAP'][task]
+        if self.model_warmer.is_warming(model):
+            self.logger.info(f"Waiting for {model} to load.")
+            remaining = time_left()
+            self.model_warmer.wait(model, min(self.config['WARM_UP_TIMEOUT'], remaining) if remaining is not None else self.config['WARM_UP_TIMEOUT'])
+
+    def _check_endpoint_health(self, url: Text) -> bool:
+        response = self.session.get(url, headers={"Authorization": f"Bearer {self.api_token}"}, timeout=self._get_timeout())
+        return response.status_code < 500
+
+    def _get_timeout(self) -> Tuple[float, float]:
+        # the connect and read timeouts are cut short if the deadline of the call is closer
+        connect_timeout, read_timeout = self.config['CONNECT_TIMEOUT'], self.config['READ_TIMEOUT']
+
+        remaining = time_left()
+        if remaining is not None:
+            connect_timeout, read_timeout = min(connect_timeout, remaining), min(read_timeout, remaining)
+
+        return connect_timeout, read_timeout
+
+    def _get_endpoint_pool(self, model: Optional[Text], task: Optional[Text]) -> Optional[EndpointPool]:
+        return self.endpoint_pools.get(model) or self.endpoint_pools.get(task)
+
+    def _post(self, data: Union[Text, bytes], model: Optional[Text] = None, task: Optional[Text] = None, extra_headers: Optional[Dict] = None) -> Union[Dict, List]:
+        def send() -> bytes:
+            response = self._request(data, model, task, extra_headers)
+            self.transfer_stats.record_response(response)
+            return response.content
+
+        if self.shared_state is None:
+            content = send()
+        else:
+            content = self.shared_state.fetch(self._get_request_key(data, model, task, extra_headers), send)
+
+        return json.loads(content.decode("utf-8"))
+
+    def _get_request_key(self, data: Union[Text, bytes], model: Optional[Text], task: Optional[Text], extra_headers: Optional[Dict]) -> Text:
+        # the token is part of the key, as responses depend on the account and must not be shared between the clients of different users
+        token_hash = hashlib.sha256((self.api_token or '').encode('utf-8')).hexdigest()
+        key = hashlib.sha256(json.dumps([token_hash, self.api_url, model, task, sorted((extra_headers or {}).items())]).encode('utf-8'))
+        key.update(data.encode('utf-8') if isinstance(data, str) else data)
+        return key.hexdigest()
+
+    def _request(self, data: Union[Text, bytes], model: Optional[Text] = None, task: Optional[Text] = None, extra_headers: Optional[Dict] = None, path: Text = '', stream: bool = False) -> requests.Response:
+        if model:
+            self._check_model_task_match(model, task)
+
+        api_url = f"{self.api_url}/{model if model is not None else self.config['TASK_MODEL_MAP'][task]}"
+        pool = self._get_endpoint_pool(model, task)
+
+        if not self.config['CIRCUIT_BREAKER']:
+            return self._send_with_retries(data, model, task, extra_headers, path, stream, api_url, pool, None, {})
+
+        circuit_breaker = self._get_circuit_breaker(api_url)
+        if not circuit_breaker.allow_request():
+            # the entry for translation in TASK_MODEL_MAP is only a prefix of the model names, so it cannot be fallen back to
+            fallback_model = self.config['TASK_MODEL_MAP'].get(task) if task != 'translation' else None
+            if self.config['CIRCUIT_BREAKER_FALLBACK'] and model is not None and fallback_model is not None and model != fallback_model:
+                self.logger.info(f"The circuit for {model} is open. Falling back to {fallback_model}.")
+                return self._request(data, None, task, extra_headers, path, stream)
+
+            raise CircuitOpenException(f"The circuit for {api_url} is open after repeated failures.")
+
+        # the outcome of the call is recorded once, whatever the number of retries, so that a single call cannot open the circuit on its own
+        outcome = {}
+        try:
+            return self._send_with_retries(data, model, task, extra_headers, path, stream, api_url, pool, circuit_breaker, outcome)
+        finally:
+            if outcome.get('failed'):
+                circuit_breaker.record_failure()
+            elif outcome.get('healthy'):
+                circuit_breaker.record_success()
+
+            # a probe of a half-open circuit that ended without an outcome, e.g. on a deadline, would otherwise keep the circuit half-open
+            circuit_breaker.release_probe()
+
+    def _send_with_retries(self, data: Union[Text, bytes], model: Optional[Text], task: Optional[Text], extra_headers: Optional[Dict], path: Text, stream: bool, api_url: Text, pool: Optional[EndpointPool], circuit_breaker: Optional[CircuitBreaker], outcome: Dict) -> requests.Response:
+        # outcome is filled in with whether the model failed or answered; a model that is loading is healthy, and a client error is not the fault of the model
+        headers = {
+            "Authorization": f"Bearer {self.api_token}"
+        }
+
+        if extra_headers is not None:
+            headers.update(extra_headers)
+
+        body = data.encode('utf-8') if isinstance(data, str) else data
+        if self.config['REQUEST_COMPRESSION'] and len(body) >= self.config['REQUEST_COMPRESSION_THRESHOLD'] and api_url not in self._uncompressed_urls and is_compressible(data, headers):
+            data = compress(body, self.config['REQUEST_COMPRESSION'])
+            headers['Content-Encoding'] = self.config['REQUEST_COMPRESSION']
+
+        retries = 0
+        response = None
+
+        while retries < self.config['MAX_RETRIES']:
+            retries += 1
+
+            try:
+                with self._scheduled():
+                    if self.shared_state is not None:
+                        self.shared_state.acquire_token()
+
+                    response, endpoint = self._send(api_url, pool, headers, data, path, stream, self._get_timeout())
+            except requests.exceptions.RequestException as e:
+                outcome['failed'] = True
+                if isinstance(e, requests.exceptions.Timeout):
+                    # a request that timed out because the deadline of the call ran out is not retried
+                    check_deadline()
+                    self.logger.info("The request timed out.")
+                elif pool is None or not isinstance(e, requests.exceptions.ConnectionError):
+                    raise
+                else:
+                    self.logger.info("Connection to the endpoint failed.")
+
+                self._check_circuit(circuit_breaker, api_url)
+                self.logger.info("Retrying..")
+                continue
+
+            if response.status_code == int(self.config['HTTP_SERVICE_UNAVAILABLE']):
+                self.logger.info(f"Status code: {response.status_code}.")
+                if self._is_model_loading(response):
+                    outcome['healthy'] = True
+                else:
+                    outcome['failed'] = True
+                self._check_circuit(circuit_breaker, api_url)
+                self.logger.info("Retrying..")
+                remaining = time_left()
+                if remaining is not None and remaining <= 1:
+                    raise DeadlineExceededException("The deadline of the call would be exceeded while waiting to retry.")
+                time.sleep(1)
+            elif response.status_code == 415 and 'Content-Encoding' in headers:
+                self.logger.info(f"{api_url} does not accept compressed requests. Retrying uncompressed..")
+                self._uncompressed_urls.add(api_url)
+                del headers['Content-Encoding']
+                data = body
+            elif response.status_code == 200:
+                outcome['healthy'], outcome['failed'] = True, False
+                self.transfer_stats.record_request(len(body), len(data) if 'Content-Encoding' in headers else len(body))
+                self.model_warmer.mark_ready(model if model is not None else self.config['TASK_MODEL_MAP'][task])
+                return response
+            elif endpoint is not None and response.status_code >= 500:
+                # fail over to another endpoint of the pool straight away
+                self.logger.info(f"Status code: {response.status_code} from {endpoint.url}.")
+                outcome['failed'] = True
+                self._check_circuit(circuit_breaker, api_url)
+                self.logger.info("Retrying..")
+            else:
+                self.logger.info(f"Status code: {response.status_code}.")
+                if response.status_code >= 500:
+                    outcome['failed'] = True
+                else:
+                    outcome['healthy'], outcome['failed'] = True, False
+
+                error_message = self._extract_error_message(response)
+                raise APICallException(f"API call failed with the error: {error_message}.")
+
+        if response is not None:
+            self.logger.info(f"Status code: {response.status_code}.")
+            self.logger.debug(f"Response: {self._extract_error_message(response)}.")
+        self.logger.info("Connection to the server failed after reaching maximum retry attempts.")
+        raise HTTPServiceUnavailableException("The HTTP service is unavailable.")
+
+    def _get_circuit_breaker(self, api_url: Text) -> CircuitBreaker:
+        with self._circuit_breakers_lock:
+            if api_url not in self.circuit_breakers:
+                self.circuit_breakers[api_url] = CircuitBreaker(self.config['CIRCUIT_BREAKER_THRESHOLD'], self.config['CIRCUIT_BREAKER_RESET_TIMEOUT'], self.config['CIRCUIT_BREAKER_PROBE_TIMEOUT'])
+
+            return self.circuit_breakers[api_url]
+
+    def _check_circuit(self, circuit_breaker: Optional[CircuitBreaker], api_url: Text) -> None:
+        # another call may have opened the circuit while this one was retrying
+        if circuit_breaker is not None and circuit_breaker.state != CircuitBreaker.CLOSED:
+            self.logger.info(f"Opened the circuit for {api_url}.")
+            raise CircuitOpenException(f"The circuit for {api_url} is open after repeated failures.")
+
+    def _send_to_endpoint(self, api_url: Text, pool: Optional[EndpointPool], endpoint: Optional[Endpoint], headers: Dict, data: Union[Text, bytes], path: Text = '', stream: bool = False, timeout: Optional[Tuple[float, float]] = None) -> requests.Response:
+        start = time.monotonic()
+
+        try:
+            response = self.session.request("POST", f"{endpoint.url if endpoint is not None else api_url}{path}", headers=headers, data=data, stream=stream, timeout=timeout)
+        except requests.exceptions.RequestException:
+            if endpoint is not None:
+                pool.release(endpoint, success=False)
+            raise
+
+        latency = time.monotonic() - start
+        if endpoint is not None:
+            pool.release(endpoint, success=response.status_code < 500, latency=latency)
+
+        if self.hedging is not None and response.status_code == 200:
+            self.hedging.record(api_url, latency)
+
+        return response
+
+    def _send_in_thread(self, *args) -> Future:
+        # every attempt gets a thread of its own rather than a slot in a shared pool, so hedging neither caps the number of concurrent
+        # requests nor queues a request behind others, which would count against its hedge delay
+        attempt = Future()
+
+        def send() -> None:
+            if not attempt.set_running_or_notify_cancel():
+                return
+
+            try:
+                attempt.set_result(self._send_to_endpoint(*args))
+            except BaseException as e:
+                attempt.set_exception(e)
+
+        threading.Thread(target=send, daemon=True).start()
+        return attempt
+
+    def _send(self, api_url: Text, pool: Optional[EndpointPool], headers: Dict, data: Union[Text, bytes], path: Text = '', stream: bool = False, timeout: Optional[Tuple[float, float]] = None) -> Tuple[requests.Response, Optional[Endpoint]]:
+        endpoint = pool.acquire() if pool is not None else None
+
+        delay = self.hedging.get_delay(api_url) if self.hedging is not None else None
+        if delay is None:
+            return self._send_to_endpoint(api_url, pool, endpoint, headers, data, path, stream, timeout), endpoint
+
+        primary = self._send_in_thread(api_url, pool, endpoint, headers, data, path, stream, timeout)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self.hedging.try_acquire():
+            return primary.result(), endpoint
+
+        attempts = {primary: endpoint}
+
+        # send a duplicate, to a different endpoint if there is one, and keep whichever answer arrives first
+        hedge_endpoint = pool.acquire(exclude=endpoint) if pool is not None else None
+        attempts[self._send_in_thread(api_url, pool, hedge_endpoint, headers, data, path, stream, timeout)] = hedge_endpoint
+        self.logger.debug(f"Hedged a request to {hedge_endpoint.url if hedge_endpoint is not None else api_url} after {delay:.3f}s.")
+
+        winner, error = None, None
+        for attempt in as_completed(attempts):
+            try:
+                response = attempt.result()
+            except requests.exceptions.RequestException as e:
+                error = e
+                continue
+
+            if winner is None or winner.result().status_code >= 500:
+                winner = attempt
+            if response.status_code < 500:
+                break
+
+        for attempt in attempts:
+            # requests cannot be interrupted once sent, so the loser is cancelled if it has not started and its response is discarded otherwise
+            if attempt is not winner and not attempt.cancel():
+                attempt.add_done_callback(self._discard_response)
+
+        if winner is None:
+            raise error
+
+        return winner.result(), attempts[winner]
+
+    @staticmethod
+    def _discard_response(attempt) -> None:
+        if not attempt.cancelled() and attempt.exception() is None:
+            attempt.result().close()
+
+    def _run_cascade(self, num_inputs: int, cascade_models: List[Text], model: Optional[Text], threshold: Optional[float], task: Text, classify: Callable[[np.ndarray, Text], List]) -> Tuple[List, List[Text]]:
+        models = [*cascade_models, model if model is not None else self.config['TASK_MODEL_MAP'][task]]
+        threshold = threshold if threshold is not None else self.config['CASCADE_THRESHOLD']
+
+        return run_cascade(num_inputs, models, threshold, classify, self.cascade_stats)
+
+    def _split_into_batches(self, inputs: List) -> List[List]:
+        # the API returns a single input in a different shape to a list of inputs, so batches are balanced to never hold just one
+        num_batches = min(-(-len(inputs) // self.config['BATCH_SIZE']), len(inputs) // 2) or 1
+        size, remainder = divmod(len(inputs), num_batches)
+
+        batches, start = [], 0
+        for i in range(num_batches):
+            end = start + size + (1 if i < remainder else 0)
+            batches.append(inputs[start:end])
+            start = end
+
+        return batches
+
+    def _map_concurrently(self, func: Callable, items: List) -> List:
+        if len(items) <= 1:
+            return [func(item) for item in items]
+
+        # the worker threads do not inherit the deadline and priority of the call, so they are handed to them, and the items not started in time are cancelled
+        expires_at = get_expiry()
+        contexts = [contextvars.copy_context() for _ in items]
+        with ThreadPoolExecutor(max_workers=min(self.config['MAX_WORKERS'], len(items))) as executor:
+            try:
+                return list(executor.map(lambda context, item: context.run(run_with_expiry, expires_at, func, item), contexts, items, timeout=time_left()))
+            except TimeoutError:
+                raise DeadlineExceededException("The deadline of the call was exceeded.") from None
+
+
+    @staticmethod
+    def _is_model_loading(response: requests.Response) -> bool:
+        # the Inference API answers 503 with an estimated_time while a model is being loaded
+        try:
+            content = json.loads(response.content.decode("utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return False
+
+        return isinstance(content, dict) and ('estimated_time' in content or 'loading' in str(content.get('error', '')).lower())
+
     def _extract_error_message(self, response):
         content = response.content.decode("utf-8")
 
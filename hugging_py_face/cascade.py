@@ -0,0 +1,97 @@
+import time
+import threading
+import numpy as np
+from typing import Text, Callable, Dict, List, Optional, Tuple
+
+from .row_errors import RowError
+
+
+def get_top_scores(predictions: List) -> np.ndarray:
+    """
+    Get the top score of each classification prediction.
+
+    :param predictions: a list with one classification prediction or RowError per input.
+    :return: an array of the top score of each prediction. Failed predictions are scored -inf, so that they are escalated.
+    """
+    # the scores are taken straight from the predictions, as a cascade does not require pyarrow
+    return np.array([
+        -np.inf if isinstance(prediction, RowError) or not prediction else max(item['score'] for item in prediction)
+        for prediction in predictions
+    ], dtype=np.float64)
+
+
+def run_cascade(num_inputs: int, models: List[Text], threshold: float, classify: Callable[[np.ndarray, Text], List], stats: Optional['CascadeStats'] = None) -> Tuple[List, List[Text]]:
+    """
+    Classify inputs with a cascade of models, from the fastest to the most accurate. Each model only gets the inputs that the models
+    before it were not confident about, in a single call, so the inputs escalated to a model are batched together.
+
+    :param num_inputs: the number of inputs.
+    :param models: the models of the cascade, in the order they are tried.
+    :param threshold: the top score below which an input is sent on to the next model.
+    :param classify: a function that takes an array of input positions and a model and returns a list with one prediction per position.
+    :param stats: the statistics to record the calls of each model in.
+    :return: a tuple of a list with one prediction per input and a list of the model that answered each input.
+    """
+    predictions, answered_by = [None] * num_inputs, [None] * num_inputs
+    pending = np.arange(num_inputs)
+
+    for tier, model in enumerate(models):
+        start = time.monotonic()
+        tier_predictions = classify(pending, model)
+        elapsed = time.monotonic() - start
+
+        # the last model has to answer every input that is left, however unsure it is
+        accepted = get_top_scores(tier_predictions) >= threshold if tier < len(models) - 1 else np.ones(len(pending), dtype=bool)
+        for position in np.flatnonzero(accepted):
+            predictions[pending[position]] = tier_predictions[position]
+            answered_by[pending[position]] = model
+
+        if stats is not None:
+            stats.record(tier, model, len(pending), int(accepted.sum()), elapsed)
+
+        pending = pending[~accepted]
+        if not len(pending):
+            break
+
+    return predictions, answered_by
+
+
+class CascadeStats:
+    """
+    Count the inputs sent to and answered by each tier of the cascades, and the time spent on them, to report how often inputs are
+    escalated and how much time the cascades save over sending every input to the last tier.
+    """
+    def __init__(self):
+        self.tiers = {}
+        self.inputs = 0
+
+        self._lock = threading.Lock()
+
+    def record(self, tier: int, model: Text, inputs: int, answered: int, seconds: float) -> None:
+        with self._lock:
+            if tier == 0:
+                self.inputs += inputs
+
+            counts = self.tiers.setdefault(model, {'tier': tier, 'inputs': 0, 'answered': 0, 'seconds': 0.0})
+            counts['inputs'] += inputs
+            counts['answered'] += answered
+            counts['seconds'] += seconds
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            tiers = {
+                model: {**counts, 'escalation_rate': 1 - counts['answered'] / counts['inputs'] if counts['inputs'] else 0.0}
+                for model, counts in self.tiers.items()
+            }
+
+            # the time every input would have taken on the last tier is estimated from the inputs that did reach it
+            last = max(tiers.values(), key=lambda counts: counts['tier'], default=None)
+            seconds_saved = None
+            if last is not None and last['tier'] > 0 and last['inputs']:
+                seconds_saved = self.inputs * last['seconds'] / last['inputs'] - sum(counts['seconds'] for counts in tiers.values())
+
+            return {
+                'inputs': self.inputs,
+                'tiers': tiers,
+                'estimated_seconds_saved': seconds_saved,
+            }
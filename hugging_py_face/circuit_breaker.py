@@ -0,0 +1,82 @@
+import time
+import threading
+
+
+class CircuitBreaker:
+    """
+    Stop sending requests to a model that keeps failing, so that calls fail fast instead of waiting out every retry.
+
+    The circuit opens after failure_threshold consecutive failures. Once reset_timeout seconds have passed, it becomes half-open and lets a
+    single probe request through: if the probe succeeds the circuit closes again, otherwise it re-opens. A probe that ends without
+    an outcome, e.g. because its call ran out of time, counts as a failure, and a probe that has not ended after probe_timeout seconds
+    is given up on, so that the circuit never stays half-open for good.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, probe_timeout: float = 120.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe_timeout = probe_timeout
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started_at = 0.0
+        self._probe_thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent. In the half-open state, only the first caller is allowed through, as the probe.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.OPEN and time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+
+            if self._probing and time.monotonic() - self._probe_started_at < self.probe_timeout:
+                return False
+
+            self._state = self.HALF_OPEN
+            self._probing = True
+            self._probe_started_at = time.monotonic()
+            self._probe_thread = threading.get_ident()
+            return True
+
+    def release_probe(self) -> None:
+        """
+        End the probe of the calling thread, if it is still running without an outcome, by counting it as a failure.
+        """
+        with self._lock:
+            if self._probing and self._probe_thread == threading.get_ident():
+                self._open()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probing = False
@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import argparse
+import pandas as pd
+from typing import Text, Dict, List, Iterator, Optional, Sequence
+
+from .nlp import NLP
+from .base_api import logger
+from .computer_vision import ComputerVision
+from .audio_processing import AudioProcessing
+from .optional_dependencies import import_optional_dependency
+
+FORMATS = {'.parquet': 'parquet', '.csv': 'csv', '.jsonl': 'jsonl', '.json': 'jsonl'}
+
+
+def get_row_tasks() -> Dict[Text, tuple]:
+    """
+    Get the tasks that can be run row by row over a file, mapped to the class and the name of the *_in_df method that performs them.
+    """
+    tasks = {}
+    for task_family in [NLP, ComputerVision, AudioProcessing]:
+        for name, func in vars(task_family).items():
+            # only the *_in_df methods that operate row by row are marked by supports_frames, which other decorators copy along
+            if name.endswith('_in_df') and getattr(func, 'supports_frames', False):
+                tasks[name.replace('_in_df', '').replace('_', '-')] = (task_family, name)
+
+    return tasks
+
+
+def _infer_format(path: Text, file_format: Optional[Text]) -> Text:
+    if file_format is not None:
+        return file_format
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Cannot infer the format of {path}. Please specify it with --input-format or --output-format.")
+
+    return FORMATS[extension]
+
+
+def read_chunks(path: Text, file_format: Text, chunk_size: int) -> Iterator:
+    """
+    Read a file as a stream of chunks, so that only one chunk is held in memory at a time.
+
+    :param path: the path of the file to read.
+    :param file_format: the format of the file; one of 'parquet', 'csv' or 'jsonl'.
+    :param chunk_size: the maximum number of rows in each chunk.
+    :return: an iterator of pyarrow Tables for Parquet files and pandas DataFrames for CSV and JSONL files.
+    """
+    if file_format == 'parquet':
+        pa = import_optional_dependency('pyarrow', 'arrow')
+        pq = import_optional_dependency('pyarrow.parquet', 'arrow')
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield pa.Table.from_batches([batch])
+    elif file_format == 'csv':
+        yield from pd.read_csv(path, chunksize=chunk_size)
+    elif file_format == 'jsonl':
+        yield from pd.read_json(path, lines=True, chunksize=chunk_size)
+    else:
+        raise ValueError(f"Unsupported format: {file_format}.")
+
+
+class ChunkWriter:
+    """
+    Write chunks of predictions to a Parquet, CSV or JSONL file incrementally.
+    """
+    def __init__(self, path: Text, file_format: Text):
+        self.path = path
+        self.file_format = file_format
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, chunk) -> None:
+        if self.file_format == 'parquet':
+            pa = import_optional_dependency('pyarrow', 'arrow')
+            pq = import_optional_dependency('pyarrow.parquet', 'arrow')
+
+            table = chunk if isinstance(chunk, pa.Table) else pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._writer is None:
+                # a column without any values in the first chunk, such as the errors of a chunk in which no row failed, is written as strings
+                schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in table.schema])
+                self._writer = pq.ParquetWriter(self.path, schema)
+
+            self._writer.write_table(table.cast(self._writer.schema))
+            return
+
+        if not isinstance(chunk, pd.DataFrame):
+            chunk = chunk.to_pandas()
+
+        if self._writer is None:
+            self._writer = open(self.path, 'w', newline='')
+
+        if self.file_format == 'csv':
+            chunk.to_csv(self._writer, header=self._writer.tell() == 0, index=False)
+        elif self.file_format == 'jsonl':
+            records = chunk.to_json(orient='records', lines=True, force_ascii=False)
+            self._writer.write(records if records.endswith('\n') else records + '\n')
+        else:
+            raise ValueError(f"Unsupported format: {self.file_format}.")
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def _parse_params(params: Sequence[Text]) -> Dict:
+    parsed = {}
+    for param in params:
+        key, _, value = param.partition('=')
+        try:
+            parsed[key] = json.loads(value)
+        except json.JSONDecodeError:
+            parsed[key] = value
+
+    return parsed
+
+
+def run(task: Text, input_path: Text, output_path: Text, columns: List[Text], params: Dict, api_token: Optional[Text] = None, api_url: Optional[Text] = None, config: Optional[Dict] = None, input_format: Optional[Text] = None, output_format: Optional[Text] = None, chunk_size: int = 1000) -> int:
+    """
+    Run a task over every row of a file and write the predictions to another file, one chunk at a time.
+
+    :param task: the name of the task to run, e.g. 'text-classification'.
+    :param input_path: the path of the Parquet, CSV or JSONL file to read the inputs from.
+    :param output_path: the path of the Parquet, CSV or JSONL file to write the inputs and their predictions to.
+    :param columns: the names of the column(s) containing the inputs, in the order expected by the *_in_df method of the task.
+    :param params: the remaining keyword arguments of the *_in_df method of the task.
+    :param api_token: the Hugging Face user access token.
+    :param api_url: the base URL of the Inference API. If not provided, the URL in the configuration will be used.
+    :param config: a dict of configuration values overriding the defaults, e.g. BATCH_SIZE and MAX_WORKERS.
+    :param input_format: the format of the input file. If not provided, it is inferred from the file extension.
+    :param output_format: the format of the output file. If not provided, it is inferred from the file extension.
+    :param chunk_size: the maximum number of rows read, processed and written at a time.
+    :return: the number of rows processed.
+    """
+    tasks = get_row_tasks()
+    if task not in tasks:
+        raise ValueError(f"Unsupported task: {task}. Supported tasks: {', '.join(sorted(tasks))}.")
+
+    task_family, method_name = tasks[task]
+    method = getattr(task_family(api_token, api_url, config), method_name)
+
+    input_format = _infer_format(input_path, input_format)
+    output_format = _infer_format(output_path, output_format)
+
+    rows, start = 0, time.monotonic()
+    with ChunkWriter(output_path, output_format) as writer:
+        for chunk in read_chunks(input_path, input_format, chunk_size):
+            writer.write(method(chunk, *columns, **params))
+
+            rows += len(chunk)
+            elapsed = time.monotonic() - start
+            logger.info(f"Processed {rows} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.1f} rows/s).")
+
+    return rows
+
+
+def main(argv: Optional[Sequence[Text]] = None) -> None:
+    parser = argparse.ArgumentParser(prog='hugging-py-face', description="Hugging-Py-Face, the Python client for the Hugging Face Inference API.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Run a task over every row of a Parquet, CSV or JSONL file.")
+    run_parser.add_argument('task', choices=sorted(get_row_tasks()), help="The task to run.")
+    run_parser.add_argument('--input', required=True, help="The Parquet, CSV or JSONL file to read the inputs from.")
+    run_parser.add_argument('--output', required=True, help="The Parquet, CSV or JSONL file to write the predictions to.")
+    run_parser.add_argument('--column', action='append', required=True, help="The column containing the inputs. Repeat for tasks that take several columns, e.g. question-answering.")
+    run_parser.add_argument('--param', action='append', default=[], help="A KEY=VALUE argument for the task, e.g. --param model=gpt2. VALUE is parsed as JSON if possible.")
+    run_parser.add_argument('--api-token', default=os.environ.get('HF_TOKEN'), help="The Hugging Face user access token. Defaults to the HF_TOKEN environment variable.")
+    run_parser.add_argument('--api-url', help="The base URL of the Inference API.")
+    run_parser.add_argument('--input-format', choices=sorted(set(FORMATS.values())), help="The format of the input file. Inferred from the extension by default.")
+    run_parser.add_argument('--output-format', choices=sorted(set(FORMATS.values())), help="The format of the output file. Inferred from the extension by default.")
+    run_parser.add_argument('--chunk-size', type=int, default=1000, help="The number of rows held in memory at a time.")
+    run_parser.add_argument('--batch-size', type=int, help="The number of inputs sent in each request.")
+    run_parser.add_argument('--max-workers', type=int, help="The number of concurrent requests.")
+
+    args = parser.parse_args(argv)
+
+    config = {}
+    if args.batch_size is not None:
+        config['BATCH_SIZE'] = args.batch_size
+    if args.max_workers is not None:
+        config['MAX_WORKERS'] = args.max_workers
+
+    run(args.task, args.input, args.output, args.column, _parse_params(args.param), args.api_token, args.api_url, config, args.input_format, args.output_format, args.chunk_size)
@@ -0,0 +1,196 @@
+import numpy as np
+import pandas as pd
+from typing import Text, List, Dict, Optional, Tuple, Union
+
+from .optional_dependencies import import_optional_dependency
+from .row_errors import RowError
+
+
+def flatten_classifications(predictions: List[Union[Dict, List]]):
+    """
+    Flatten classification predictions into parallel arrays of labels, scores and row ids.
+
+    The predictions are converted to Arrow as a whole and then flattened, so no Python object is created per label.
+
+    :param predictions: a list with one prediction per row. Each prediction is either a list of dicts with 'label' and 'score' keys or a dict with 'labels' and 'scores' lists (as returned by the zero shot classification task).
+    :return: a tuple of a pyarrow array of labels, a NumPy array of scores and a NumPy array of the row each label belongs to.
+    """
+    pa = import_optional_dependency('pyarrow', 'arrow')
+    pc = import_optional_dependency('pyarrow.compute', 'arrow')
+
+    if isinstance(predictions, dict):
+        predictions = [predictions]
+
+    if any(isinstance(prediction, dict) for prediction in predictions):
+        rows = pa.array(
+            [prediction if isinstance(prediction, dict) else {'labels': [], 'scores': []} for prediction in predictions],
+            type=pa.struct([('labels', pa.list_(pa.string())), ('scores', pa.list_(pa.float64()))])
+        )
+        label_lists, score_lists = rows.field('labels'), rows.field('scores')
+        labels, scores = label_lists.flatten(), score_lists.flatten()
+    else:
+        label_lists = pa.array(predictions, type=pa.list_(pa.struct([('label', pa.string()), ('score', pa.float64())])))
+        items = label_lists.flatten()
+        labels, scores = items.field('label'), items.field('score')
+
+    row_ids = pc.list_parent_indices(label_lists).to_numpy()
+    return labels, scores.to_numpy(zero_copy_only=False), row_ids
+
+
+def top_predictions(labels, scores: np.ndarray, row_ids: np.ndarray, num_rows: int):
+    """
+    Select the label with the highest score for each row.
+
+    :param labels: the flattened labels, as returned by flatten_classifications.
+    :param scores: the flattened scores, as returned by flatten_classifications.
+    :param row_ids: the row each label belongs to, as returned by flatten_classifications.
+    :param num_rows: the number of rows. Rows without any labels will get a missing label and a NaN score.
+    :return: a tuple of a pyarrow array of top labels and a NumPy array of top scores.
+    """
+    pa = import_optional_dependency('pyarrow', 'arrow')
+
+    top_positions = np.full(num_rows, -1)
+    top_scores = np.full(num_rows, np.nan)
+
+    if len(scores):
+        # sort by row and then by descending score, so the first entry of every row is its top prediction
+        order = np.lexsort((-scores, row_ids))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = row_ids[order][1:] != row_ids[order][:-1]
+        top = order[first]
+
+        top_positions[row_ids[top]] = top
+        top_scores[row_ids[top]] = scores[top]
+
+    top_labels = labels.take(pa.array(np.maximum(top_positions, 0), mask=top_positions < 0)) if len(labels) else pa.nulls(num_rows, pa.string())
+    return top_labels, top_scores
+
+
+def score_matrix(labels, scores: np.ndarray, row_ids: np.ndarray, num_rows: int) -> Tuple[np.ndarray, List[Text]]:
+    """
+    Build a dense matrix of scores with one row per input and one column per label.
+
+    :param labels: the flattened labels, as returned by flatten_classifications.
+    :param scores: the flattened scores, as returned by flatten_classifications.
+    :param row_ids: the row each label belongs to, as returned by flatten_classifications.
+    :param num_rows: the number of rows.
+    :return: a tuple of the score matrix and the sorted list of labels corresponding to its columns. Labels that were not returned for a row are scored 0.
+    """
+    pc = import_optional_dependency('pyarrow.compute', 'arrow')
+
+    encoded = pc.dictionary_encode(labels)
+    vocabulary = encoded.dictionary.to_pylist()
+    # the labels are numbered in their order of appearance, and renumbered in sorted order so the columns do not depend on the input
+    order = np.argsort(np.asarray(vocabulary, dtype=object)) if vocabulary else np.zeros(0, dtype=int)
+    ranks = np.empty(len(order), dtype=int)
+    ranks[order] = np.arange(len(order))
+
+    matrix = np.zeros((num_rows, len(vocabulary)))
+    matrix[row_ids, ranks[encoded.indices.to_numpy(zero_copy_only=False)]] = scores
+    return matrix, [vocabulary[i] for i in order]
+
+
+def arrow_series(values, arrow_type, index: pd.Index) -> pd.Series:
+    """
+    Wrap values in a pandas Series backed by a pyarrow array.
+
+    :param values: the values of the Series, or a pyarrow array of them.
+    :param arrow_type: the pyarrow data type of the Series.
+    :param index: the index of the Series.
+    :return: a pandas Series backed by a pyarrow array.
+    """
+    pa = import_optional_dependency('pyarrow', 'arrow')
+    array = values if isinstance(values, pa.Array) else pa.array(values, type=arrow_type, from_pandas=True)
+    return pd.Series(pd.arrays.ArrowExtensionArray(array), index=index)
+
+
+def get_score_matrix(df: pd.DataFrame) -> np.ndarray:
+    """
+    Get the dense score matrix stored by add_classification_columns as a 2D NumPy array, without copying it.
+
+    :param df: the pandas DataFrame returned with include_score_matrix.
+    :return: an array with one row per row of the DataFrame and one column per label of df.attrs['score_labels'].
+    """
+    pa = import_optional_dependency('pyarrow', 'arrow')
+
+    array = pa.array(df['score_matrix'].array)
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+
+    return array.flatten().to_numpy().reshape(len(df), len(df.attrs['score_labels']))
+
+
+def add_classification_columns(df: pd.DataFrame, predictions: List[Union[Dict, List]], include_score_matrix: bool = False, include_errors: bool = False) -> pd.DataFrame:
+    """
+    Add the top label and top score of each classification prediction to a DataFrame as Arrow-backed columns.
+
+    :param df: the pandas DataFrame the predictions were made for.
+    :param predictions: a list with one classification prediction per row of the DataFrame.
+    :param include_score_matrix: whether to also add the dense label x score matrix as a list column called 'score_matrix', with its column labels in df.attrs['score_labels']. The matrix is kept in a column rather than in df.attrs, which pandas copies on most operations. get_score_matrix returns it as a 2D NumPy array.
+    :param include_errors: whether to add the 'errors' column even if no row failed, so that every batch of a frame has the same columns.
+    :return: the DataFrame with the top labels in a column called 'predictions' and the top scores in a column called 'scores'. Rows that failed get a missing label and score, and their errors are added in a column called 'errors'.
+    """
+    pa = import_optional_dependency('pyarrow', 'arrow')
+
+    errors = [prediction.message if isinstance(prediction, RowError) else None for prediction in predictions] if isinstance(predictions, list) else [None] * len(df)
+    if any(error is not None for error in errors):
+        predictions = [[] if isinstance(prediction, RowError) else prediction for prediction in predictions]
+
+    labels, scores, row_ids = flatten_classifications(predictions)
+    top_labels, top_scores = top_predictions(labels, scores, row_ids, len(df))
+
+    df['predictions'] = arrow_series(top_labels, pa.string(), df.index)
+    df['scores'] = arrow_series(top_scores, pa.float64(), df.index)
+
+    if include_errors or any(error is not None for error in errors):
+        df['errors'] = arrow_series(errors, pa.string(), df.index)
+
+    if include_score_matrix:
+        matrix, score_labels = score_matrix(labels, scores, row_ids, len(df))
+        # the lists share the buffer of the matrix, and are of variable length so that batches with different labels have the same type
+        offsets = pa.array(np.arange(len(df) + 1, dtype=np.int32) * len(score_labels))
+        rows = pa.ListArray.from_arrays(offsets, pa.array(matrix.ravel()))
+
+        df['score_matrix'] = arrow_series(rows, None, df.index)
+        df.attrs['score_labels'] = score_labels
+
+    return df
+
+
+# the columns of the frames returned by detections_to_frame, mapped to their type
+DETECTION_COLUMNS = {'row_id': int, 'label': str, 'score': float, 'xmin': float, 'ymin': float, 'xmax': float, 'ymax': float}
+
+
+def detections_to_frame(predictions: List[List[Dict]], index: pd.Index, score_threshold: Optional[float] = None) -> pd.DataFrame:
+    """
+    Convert object detection predictions into a long-format DataFrame of Arrow-backed columns, with one row per detection.
+
+    The predictions are converted to Arrow as a whole and then flattened, so no Python object is created per detection.
+
+    :param predictions: a list with the detections of each image, as returned by the API.
+    :param index: the index of the DataFrame of the images, whose labels are used as the row ids.
+    :param score_threshold: if provided, the detections with a lower score are dropped.
+    :return: a pandas DataFrame with the columns 'row_id', 'label', 'score', 'xmin', 'ymin', 'xmax' and 'ymax'.
+    """
+    pa = import_optional_dependency('pyarrow', 'arrow')
+    pc = import_optional_dependency('pyarrow.compute', 'arrow')
+
+    box_type = pa.struct([(coordinate, pa.float64()) for coordinate in ('xmin', 'ymin', 'xmax', 'ymax')])
+    detection_type = pa.struct([('label', pa.string()), ('score', pa.float64()), ('box', box_type)])
+
+    detections = pa.array(predictions, type=pa.list_(detection_type))
+    parents = pc.list_parent_indices(detections)
+    detections = detections.flatten()
+    boxes = detections.field('box')
+
+    table = pa.table({
+        'row_id': pa.array(index.to_numpy()).take(parents) if len(index) else pa.array([], type=pa.int64()),
+        'label': detections.field('label'),
+        'score': detections.field('score'),
+        **{coordinate: boxes.field(coordinate) for coordinate in ('xmin', 'ymin', 'xmax', 'ymax')}
+    })
+
+    if score_threshold is not None:
+        table = table.filter(pc.greater_equal(table['score'], score_threshold))
+
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
@@ -0,0 +1,83 @@
+import gzip
+import threading
+import requests
+from typing import Text, Dict, Union
+
+from .optional_dependencies import import_optional_dependency
+
+SUPPORTED_ENCODINGS = ('gzip', 'zstd')
+
+
+def compress(data: bytes, encoding: Text) -> bytes:
+    """
+    Compress the body of a request.
+
+    :param data: the body of the request.
+    :param encoding: the content coding to compress with, either 'gzip' or 'zstd'. zstd requires zstandard.
+    :return: the compressed body.
+    """
+    if encoding == 'gzip':
+        # a low level is used as the aim is to cut the transfer time, not the size at any cost
+        return gzip.compress(data, compresslevel=5)
+
+    if encoding == 'zstd':
+        zstandard = import_optional_dependency('zstandard', 'zstd')
+        return zstandard.ZstdCompressor(level=3).compress(data)
+
+    raise ValueError(f"Unsupported request compression: {encoding}. Supported compressions are: {', '.join(SUPPORTED_ENCODINGS)}.")
+
+
+def is_compressible(data: Union[Text, bytes], headers: Dict) -> bool:
+    """
+    Check whether the body of a request is worth compressing. JSON and text bodies are; media files such as JPEG, PNG, FLAC or
+    WAV are sent as they are, as most are already compressed and the rest are not worth the CPU time.
+
+    :param data: the body of the request. Bodies built by the client are strings for JSON and text, and bytes for media files.
+    :param headers: the headers of the request.
+    :return: whether the body should be compressed.
+    """
+    content_type = headers.get('Content-Type', '')
+    return isinstance(data, str) or content_type.startswith('text/') or 'json' in content_type
+
+
+class TransferStats:
+    """
+    Count the bytes of the requests and responses before and after compression, to report how much compression saves.
+    """
+    def __init__(self):
+        self.request_bytes = 0
+        self.request_bytes_sent = 0
+        self.response_bytes = 0
+        self.response_bytes_received = 0
+        self.compressed_requests = 0
+        self.compressed_responses = 0
+
+        self._lock = threading.Lock()
+
+    def record_request(self, size: int, sent_size: int) -> None:
+        with self._lock:
+            self.request_bytes += size
+            self.request_bytes_sent += sent_size
+            self.compressed_requests += sent_size != size
+
+    def record_response(self, response: requests.Response) -> None:
+        # the raw response counts the bytes read from the connection, before they were decoded
+        received_size = response.raw.tell() if response.raw is not None else len(response.content)
+
+        with self._lock:
+            self.response_bytes += len(response.content)
+            self.response_bytes_received += received_size
+            self.compressed_responses += 'Content-Encoding' in response.headers
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            return {
+                'request_bytes': self.request_bytes,
+                'request_bytes_sent': self.request_bytes_sent,
+                'request_bytes_saved': self.request_bytes - self.request_bytes_sent,
+                'compressed_requests': self.compressed_requests,
+                'response_bytes': self.response_bytes,
+                'response_bytes_received': self.response_bytes_received,
+                'response_bytes_saved': self.response_bytes - self.response_bytes_received,
+                'compressed_responses': self.compressed_responses,
+            }
@@ -1,48 +1,142 @@
 from pandas import DataFrame
-from typing import Text, List, Optional, Union
+from typing import Text, List, Dict, Optional, Union
 
+from .columnar import DETECTION_COLUMNS, add_classification_columns, detections_to_frame
+from .frames import supports_frames
+from .deadlines import supports_deadline
 from .multimedia_processing import MultimediaProcessing
+from .tiling import crop_tiles, merge_tile_detections
 
 
 class ComputerVision(MultimediaProcessing):
-    def __init__(self, api_token):
-        super().__init__(api_token)
+    def __init__(self, api_token: Text, api_url: Optional[Text] = None, config: Optional[Dict] = None):
+        super().__init__(api_token, api_url, config)
 
-    def image_classification(self, inputs: Union[Text, List], model: Optional[Text] = None) -> List:
+    @supports_deadline
+    def image_classification(self, inputs: Union[Text, List], model: Optional[Text] = None, cascade_models: Optional[List[Text]] = None, cascade_threshold: Optional[float] = None) -> List:
         """
         Classify an image from a file path or an url.
 
         :param inputs: a string or a list of strings of the file paths or urls of the images to classify.
         :param model: the model to use for the image classification task. If not provided, the recommended model from Hugging Face will be used.
+        :param cascade_models: a list of smaller, faster models to try first, from the fastest. Only the inputs whose top score falls below cascade_threshold are sent on to the next model, and finally to model.
+        :param cascade_threshold: the top score below which an input is sent on to the next model of the cascade. If not provided, CASCADE_THRESHOLD from the config is used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a list of dictionaries each containing the label and the confidence score for that label.
         """
+        if cascade_models:
+            images = inputs if type(inputs) == list else [inputs]
+            predictions, _ = self._run_cascade(
+                len(images), cascade_models, model, cascade_threshold, 'image-classification',
+                lambda positions, tier_model: self._query_in_list([images[i] for i in positions], model=tier_model, task="image-classification")
+            )
+            return predictions if type(inputs) == list else predictions[0]
+
         if type(inputs) == list:
             return self._query_in_list(inputs, model=model, task="image-classification")
         elif type(inputs) == str:
             return self._query(inputs, model=model, task="image-classification")
 
-    def image_classification_in_df(self, df: DataFrame, column: Text, model: Optional[Text] = None) -> DataFrame:
+    @supports_deadline
+    @supports_frames
+    def image_classification_in_df(self, df: DataFrame, column: Text, model: Optional[Text] = None, columnar: bool = False, score_matrix: bool = False, inplace: bool = True, cascade_models: Optional[List[Text]] = None, cascade_threshold: Optional[float] = None) -> DataFrame:
         """
         Classify images from a dataframe.
 
         :param df: a pandas DataFrame containing the images to classify.
         :param column: the name of the column containing the file paths or urls of the images to classify.
         :param model: the model to use for the image classification task. If not provided, the recommended model from Hugging Face will be used.
-        :return: a pandas DataFrame with the label for the images. Each label added will be the one with the highest confidence score for that particular image. The label will be added as a new column called 'predictions' to the original DataFrame.
+        :param columnar: whether to add the labels and their confidence scores as Arrow-backed columns called 'predictions' and 'scores'. Requires pyarrow.
+        :param score_matrix: whether to also store a dense label x confidence score matrix in a list column called 'score_matrix', with the label of each matrix column in df.attrs['score_labels']. hugging_py_face.columnar.get_score_matrix returns it as a 2D NumPy array. Implies columnar.
+        :param inplace: whether to add the predictions to the original DataFrame. If False, a new DataFrame will be returned and the original will be left untouched.
+        :param cascade_models: a list of smaller, faster models to try first, from the fastest. Only the inputs whose top score falls below cascade_threshold are sent on to the next model, and finally to model.
+        :param cascade_threshold: the top score below which an input is sent on to the next model of the cascade. If not provided, CASCADE_THRESHOLD from the config is used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
+        :return: a pandas DataFrame with the label for the images. Each label added will be the one with the highest confidence score for that particular image. The label will be added as a new column called 'predictions' to the original DataFrame. With a cascade, the model that answered each image is added in a column called 'tier'.
         """
-        predictions = self._query_in_df(df, column, model=model, task="image-classification")
-        df["predictions"] = [prediction[0]['label'] for prediction in predictions]
+        if cascade_models:
+            predictions, answered_by = self._run_cascade(
+                len(df), cascade_models, model, cascade_threshold, "image-classification",
+                lambda positions, tier_model: self._query_in_df(df.iloc[positions], column, model=tier_model, task="image-classification")
+            )
+        else:
+            predictions = self._query_in_df(df, column, model=model, task="image-classification")
+
+        if not inplace:
+            df = df.copy(deep=False)
+
+        if columnar or score_matrix:
+            add_classification_columns(df, predictions, score_matrix)
+        else:
+            df["predictions"] = [prediction[0]['label'] for prediction in predictions]
+
+        if cascade_models:
+            df["tier"] = answered_by
+
         return df
 
-    def object_detection(self, inputs: Union[Text, List], model: Optional[Text] = None) -> List:
+    @supports_deadline
+    def object_detection(self, inputs: Union[Text, List], model: Optional[Text] = None, tile_size: Optional[int] = None, tile_overlap: Optional[float] = None, iou_threshold: Optional[float] = None) -> List:
         """
         Perform object detection on an image from a file path or an url.
 
         :param inputs: a string or a list of strings of the file paths or urls of the images to perform object detection on.
         :param model: the model to use for the object detection task. If not provided, the recommended model from Hugging Face will be used.
+        :param tile_size: if provided, images larger than tile_size pixels are cut into overlapping tiles of this size, which are sent concurrently, so that small objects are not lost when the model downsamples the image. Requires Pillow.
+        :param tile_overlap: the fraction of the side of a tile shared with its neighbours. Defaults to OBJECT_DETECTION_TILE_OVERLAP in the configuration.
+        :param iou_threshold: the intersection over union above which duplicate detections from overlapping tiles are removed. Defaults to OBJECT_DETECTION_IOU_THRESHOLD in the configuration.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a list of dictionaries each containing the label, the confidence score for that label, and the bounding box coordinates.
         """
+        if tile_size is not None:
+            if type(inputs) == list:
+                return self._detect_objects_in_tiles(inputs, model, tile_size, tile_overlap, iou_threshold)
+            elif type(inputs) == str:
+                return self._detect_objects_in_tiles([inputs], model, tile_size, tile_overlap, iou_threshold)[0]
+
         if type(inputs) == list:
             return self._query_in_list(inputs, model=model, task="object-detection")
         elif type(inputs) == str:
-            return self._query(inputs, model=model, task="object-detection")
\ No newline at end of file
+            return self._query(inputs, model=model, task="object-detection")
+
+    def _detect_objects_in_tiles(self, inputs: List[Text], model: Optional[Text], tile_size: int, tile_overlap: Optional[float] = None, iou_threshold: Optional[float] = None) -> List:
+        tile_overlap = tile_overlap if tile_overlap is not None else self.config['OBJECT_DETECTION_TILE_OVERLAP']
+        iou_threshold = iou_threshold if iou_threshold is not None else self.config['OBJECT_DETECTION_IOU_THRESHOLD']
+
+        # the images are read and cut concurrently, and the tiles of all of them share one pool, so no image waits for the one before it
+        tiled_images = self._map_concurrently(lambda input: crop_tiles(self._read_media(input), tile_size, tile_overlap), inputs)
+        crops = [(image, crop) for image, (_, image_crops) in enumerate(tiled_images) for crop in image_crops]
+        crop_detections = self._map_concurrently(lambda item: self._post(item[1], model, "object-detection"), crops)
+
+        tile_detections = [[] for _ in inputs]
+        for (image, _), detections in zip(crops, crop_detections):
+            tile_detections[image].append(detections)
+
+        return [
+            detections[0] if len(tiles) == 1 else merge_tile_detections(tiles, detections, iou_threshold)
+            for (tiles, _), detections in zip(tiled_images, tile_detections)
+        ]
+
+    @supports_deadline
+    @supports_frames(output_columns=DETECTION_COLUMNS)
+    def object_detection_in_df(self, df: DataFrame, column: Text, model: Optional[Text] = None, score_threshold: Optional[float] = None, tile_size: Optional[int] = None, tile_overlap: Optional[float] = None, iou_threshold: Optional[float] = None) -> DataFrame:
+        """
+        Perform object detection on the images in a DataFrame. Requires pyarrow.
+
+        :param df: a pandas DataFrame containing the images to perform object detection on. pyarrow Tables and RecordBatchReaders and polars DataFrames are also supported, with rows numbered across their batches.
+        :param column: the name of the column containing the file paths or urls of the images.
+        :param model: the model to use for the object detection task. If not provided, the recommended model from Hugging Face will be used.
+        :param score_threshold: if provided, the detections with a lower confidence score are dropped.
+        :param tile_size: if provided, images larger than tile_size pixels are cut into overlapping tiles of this size, as in object_detection. Requires Pillow.
+        :param tile_overlap: the fraction of the side of a tile shared with its neighbours. Defaults to OBJECT_DETECTION_TILE_OVERLAP in the configuration.
+        :param iou_threshold: the intersection over union above which duplicate detections from overlapping tiles are removed. Defaults to OBJECT_DETECTION_IOU_THRESHOLD in the configuration.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
+        :return: a new pandas DataFrame of Arrow-backed columns with one row per detection: 'row_id', the index of the image in df, followed by 'label', 'score', 'xmin', 'ymin', 'xmax' and 'ymax'.
+        """
+        if tile_size is not None:
+            self._wait_for_model(model, "object-detection")
+            predictions = self._detect_objects_in_tiles(df[column].tolist(), model, tile_size, tile_overlap, iou_threshold)
+        else:
+            predictions = self._query_in_df(df, column, model=model, task="object-detection")
+
+        return detections_to_frame(predictions, df.index, score_threshold)
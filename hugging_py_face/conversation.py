@@ -0,0 +1,132 @@
+import json
+import collections
+from typing import Text, Callable, Dict, List, Optional, Tuple
+
+
+def count_words(text: Text) -> int:
+    # a rough estimate of the number of tokens, which avoids depending on the tokenizer of the model
+    return len(text.split())
+
+
+class Conversation:
+    """
+    A conversation with a chatbot, that keeps its history and sends each turn with a single call.
+
+    The history is kept in a ring buffer of at most max_turns turns, and only the most recent turns that fit into max_chars characters
+    and max_tokens tokens, along with the new input, are sent, so that the size of the requests stays bounded over long conversations.
+    """
+    def __init__(self, nlp, model: Optional[Text] = None, parameters: Optional[Dict] = None, options: Optional[Dict] = None, max_turns: Optional[int] = None, max_chars: Optional[int] = None, max_tokens: Optional[int] = None, count_tokens: Callable[[Text], int] = count_words):
+        self.nlp = nlp
+        self.model = model
+        self.parameters = parameters
+        self.options = options
+        self.max_turns = max_turns if max_turns is not None else nlp.config['CONVERSATION_MAX_TURNS']
+        self.max_chars = max_chars if max_chars is not None else nlp.config['CONVERSATION_MAX_CHARS']
+        self.max_tokens = max_tokens if max_tokens is not None else nlp.config['CONVERSATION_MAX_TOKENS']
+        self.count_tokens = count_tokens
+
+        self.turns = collections.deque(maxlen=self.max_turns)
+
+    @property
+    def past_user_inputs(self) -> List[Text]:
+        return [user_input for user_input, _ in self.turns]
+
+    @property
+    def generated_responses(self) -> List[Text]:
+        return [generated_response for _, generated_response in self.turns]
+
+    def _get_context(self, text: Text) -> List[Tuple[Text, Text]]:
+        # the most recent turns are kept, so the history is walked backwards until the budget runs out
+        chars = len(text)
+        tokens = self.count_tokens(text) if self.max_tokens is not None else 0
+
+        context = []
+        for user_input, generated_response in reversed(self.turns):
+            chars += len(user_input) + len(generated_response)
+            if self.max_chars is not None and chars > self.max_chars:
+                break
+
+            if self.max_tokens is not None:
+                tokens += self.count_tokens(user_input) + self.count_tokens(generated_response)
+                if tokens > self.max_tokens:
+                    break
+
+            context.append((user_input, generated_response))
+
+        context.reverse()
+        return context
+
+    def send(self, text: Text, deadline: Optional[float] = None) -> Text:
+        """
+        Send the next input from the user and add the turn to the history.
+
+        :param text: a string representing the input from the user.
+        :param deadline: the maximum number of seconds the call may take, including retries. The turn is not added to the history if it does not finish in time.
+        :return: a string containing the response from the bot.
+        """
+        context = self._get_context(text)
+
+        result = self.nlp.conversational(
+            text,
+            past_user_inputs=[user_input for user_input, _ in context],
+            generated_responses=[generated_response for _, generated_response in context],
+            parameters=self.parameters,
+            options=self.options,
+            model=self.model,
+            deadline=deadline
+        )
+
+        generated_response = result['generated_text']
+        self.turns.append((text, generated_response))
+
+        return generated_response
+
+    def reset(self) -> None:
+        self.turns.clear()
+
+    def to_dict(self) -> Dict:
+        """
+        Get the state of the conversation, without the client, so that it can be stored and resumed later with from_dict.
+
+        :return: a dict of JSON serializable values.
+        """
+        return {
+            'model': self.model,
+            'parameters': self.parameters,
+            'options': self.options,
+            'max_turns': self.max_turns,
+            'max_chars': self.max_chars,
+            'max_tokens': self.max_tokens,
+            'turns': [list(turn) for turn in self.turns]
+        }
+
+    def to_json(self) -> Text:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_dict(cls, nlp, state: Dict, count_tokens: Callable[[Text], int] = count_words) -> 'Conversation':
+        """
+        Resume a conversation stored with to_dict.
+
+        :param nlp: the NLP client to continue the conversation with.
+        :param state: the dict returned by to_dict.
+        :param count_tokens: the function used to count the tokens of a string, if a token budget is set.
+        :return: the resumed conversation.
+        """
+        conversation = cls(
+            nlp,
+            model=state.get('model'),
+            parameters=state.get('parameters'),
+            options=state.get('options'),
+            max_turns=state.get('max_turns'),
+            max_chars=state.get('max_chars'),
+            max_tokens=state.get('max_tokens'),
+            count_tokens=count_tokens
+        )
+        conversation.turns.extend(tuple(turn) for turn in state.get('turns', []))
+
+        return conversation
+
+    @classmethod
+    def from_json(cls, nlp, state: Text, count_tokens: Callable[[Text], int] = count_words) -> 'Conversation':
+        return cls.from_dict(nlp, json.loads(state), count_tokens)
@@ -0,0 +1,150 @@
+import os
+import time
+import uuid
+import sqlite3
+import threading
+from typing import Text, Callable, Optional, Tuple
+
+from .deadlines import time_left
+
+# the time a response is kept for the duplicate requests waiting on it, if they are slow to pick it up
+_HANDOFF_TTL = 10.0
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+
+    return True
+
+
+class SharedState:
+    """
+    State shared through an SQLite database by every client on a host that points at it, e.g. the workers of a web server and
+    cron jobs, so that they coordinate without an external service.
+
+    The database holds a token bucket that caps the requests per second of all of the clients together, the responses cached
+    for cache_ttl seconds, and the claims of the requests in flight: a request already being sent by another client, in any
+    process, is waited on instead of being sent again. A claim is taken over once its process has died or claim_timeout seconds
+    have passed.
+    """
+    def __init__(self, path: Text, rate_limit: Optional[float] = None, burst: int = 10, cache_ttl: float = 0, claim_timeout: float = 300):
+        self.path = path
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.cache_ttl = cache_ttl
+        self.claim_timeout = claim_timeout
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # transactions are opened explicitly, as the writes have to hold the lock of the database across processes
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)')
+        self._db.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content BLOB NOT NULL, claim TEXT NOT NULL, cached_until REAL NOT NULL, expires_at REAL NOT NULL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)')
+        self._db.execute('CREATE TABLE IF NOT EXISTS claims (key TEXT PRIMARY KEY, claim TEXT NOT NULL, pid INTEGER NOT NULL, expires_at REAL NOT NULL)')
+
+    def _transaction(self, func: Callable, *args):
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                result = func(*args)
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+
+            self._db.execute('COMMIT')
+            return result
+
+    def acquire_token(self) -> None:
+        """
+        Wait for the shared rate limit to allow a request, if there is one. The wait counts against the deadline of the call.
+        """
+        if self.rate_limit is None:
+            return
+
+        while True:
+            wait = self._transaction(self._take_token)
+            if wait == 0:
+                return
+
+            remaining = time_left()
+            time.sleep(min(wait, remaining) if remaining is not None else wait)
+
+    def _take_token(self) -> float:
+        now = time.time()
+        row = self._db.execute("SELECT tokens, updated FROM buckets WHERE name = 'requests'").fetchone()
+        tokens, updated = row if row is not None else (self.burst, now)
+
+        tokens = min(self.burst, tokens + max(now - updated, 0) * self.rate_limit)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate_limit
+
+        self._db.execute("INSERT OR REPLACE INTO buckets VALUES ('requests', ?, ?)", (tokens, now))
+        return wait
+
+    def fetch(self, key: Text, send: Callable[[], bytes]) -> bytes:
+        """
+        Get the response to a request from the cache, from another client sending the same request, or by sending it.
+
+        :param key: a key identifying the request, e.g. a hash of its URL, headers and body.
+        :param send: a function that sends the request and returns the content of the response.
+        :return: the content of the response.
+        """
+        delay, claim = 0.01, None
+        while True:
+            content, claim, claimed = self._transaction(self._get_or_claim, key, claim)
+            if content is not None:
+                return content
+
+            if claimed:
+                break
+
+            # another client is sending the request, so its response is waited for
+            remaining = time_left()
+            time.sleep(min(delay, remaining) if remaining is not None else delay)
+            delay = min(delay * 2, 0.2)
+
+        try:
+            content = send()
+        except BaseException:
+            self._transaction(self._db.execute, 'DELETE FROM claims WHERE key = ? AND claim = ?', (key, claim))
+            raise
+
+        self._transaction(self._complete, key, claim, content)
+        return content
+
+    def _get_or_claim(self, key: Text, waited_claim: Optional[Text]) -> Tuple[Optional[bytes], Optional[Text], bool]:
+        now = time.time()
+        # a response that is not cached is only handed to the requests that were waiting on it
+        row = self._db.execute('SELECT content, claim, cached_until FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is not None and (row[2] > now or row[1] == waited_claim):
+            return row[0], row[1], False
+
+        row = self._db.execute('SELECT claim, pid, expires_at FROM claims WHERE key = ?', (key,)).fetchone()
+        if row is not None and row[2] > now and _is_alive(row[1]):
+            return None, row[0], False
+
+        claim = uuid.uuid4().hex
+        self._db.execute('INSERT OR REPLACE INTO claims VALUES (?, ?, ?, ?)', (key, claim, os.getpid(), now + self.claim_timeout))
+        return None, claim, True
+
+    def _complete(self, key: Text, claim: Text, content: bytes) -> None:
+        now = time.time()
+        self._db.execute('DELETE FROM claims WHERE key = ? AND claim = ?', (key, claim))
+        self._db.execute('DELETE FROM responses WHERE expires_at <= ?', (now,))
+        self._db.execute(
+            'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+            (key, content, claim, now + self.cache_ttl, now + max(self.cache_ttl, _HANDOFF_TTL))
+        )
@@ -0,0 +1,86 @@
+import time
+import inspect
+import functools
+import contextvars
+from typing import Any, Callable, Optional
+
+from .exceptions import DeadlineExceededException
+
+# the time.monotonic() by which the current call has to complete, if any
+_expires_at = contextvars.ContextVar('expires_at', default=None)
+
+
+def get_expiry() -> Optional[float]:
+    return _expires_at.get()
+
+
+def time_left() -> Optional[float]:
+    """
+    Get the number of seconds left before the deadline of the current call.
+
+    :return: the number of seconds left, or None if the call has no deadline.
+    """
+    expires_at = _expires_at.get()
+    if expires_at is None:
+        return None
+
+    remaining = expires_at - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceededException("The deadline of the call was exceeded.")
+
+    return remaining
+
+
+def check_deadline() -> None:
+    """
+    Raise a DeadlineExceededException if the deadline of the current call has passed.
+    """
+    time_left()
+
+
+def run_with_expiry(expires_at: Optional[float], func: Callable, *args) -> Any:
+    """
+    Run a function under the deadline of another call, e.g. in a worker thread, which does not inherit the deadline of the thread that submitted the work.
+
+    :param expires_at: the expiry returned by get_expiry in the submitting thread.
+    :param func: the function to run.
+    :return: the result of the function.
+    """
+    token = _expires_at.set(expires_at)
+    try:
+        check_deadline()
+
+        return func(*args)
+    finally:
+        _expires_at.reset(token)
+
+
+def supports_deadline(method: Callable) -> Callable:
+    """
+    Add a keyword-only deadline argument to a method: the number of seconds the call may take, including its retries, backoff sleeps
+    and batches. Work that cannot start in time is skipped and a DeadlineExceededException is raised. A deadline nested in another
+    call cannot extend the outer deadline.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, deadline: Optional[float] = None, **kwargs):
+        if deadline is None:
+            return method(self, *args, **kwargs)
+
+        expires_at = time.monotonic() + deadline
+        outer_expires_at = _expires_at.get()
+        if outer_expires_at is not None:
+            expires_at = min(expires_at, outer_expires_at)
+
+        token = _expires_at.set(expires_at)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            _expires_at.reset(token)
+
+    signature = inspect.signature(method)
+    wrapper.__signature__ = signature.replace(parameters=[
+        *signature.parameters.values(),
+        inspect.Parameter('deadline', inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[float])
+    ])
+
+    return wrapper
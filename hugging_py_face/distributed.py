@@ -0,0 +1,132 @@
+import os
+import json
+import threading
+import pandas as pd
+from typing import Any, Callable, Dict, Optional, Text, Tuple, Type
+
+from .base_api import BaseAPI
+from .optional_dependencies import import_optional_dependency
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_worker_client(task_family: Type[BaseAPI], api_token: Text, api_url: Optional[Text] = None, config: Optional[Dict] = None) -> BaseAPI:
+    """
+    Get a client for the current worker process, creating it (and its connection pool) on first use.
+
+    Clients are shared by all of the tasks that run in the same process with the same settings.
+
+    :param task_family: the client class, e.g. NLP.
+    :param api_token: the Hugging Face user access token.
+    :param api_url: the base URL of the Inference API.
+    :param config: a dict of configuration values overriding the defaults.
+    :return: a client of the given class.
+    """
+    key = (os.getpid(), task_family, api_token, api_url, json.dumps(config, sort_keys=True, default=str))
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = task_family(api_token, api_url, config)
+
+        return _clients[key]
+
+
+def _describe_method(method: Callable, max_concurrency: Optional[int], slots: Callable[[], int]) -> Tuple:
+    client = method.__self__
+    config = dict(client.config)
+
+    if max_concurrency is not None:
+        # split the concurrency budget of the whole cluster between the partitions that can run at the same time
+        config['MAX_WORKERS'] = max(1, max_concurrency // slots())
+
+    return type(client), client.api_token, client.api_url, config, method.__name__
+
+
+def _prediction_columns(kwargs: Dict) -> Dict[Text, Any]:
+    columns = {'predictions': object}
+    if kwargs.get('columnar') or kwargs.get('score_matrix'):
+        columns['scores'] = float
+    if kwargs.get('score_matrix'):
+        columns['score_matrix'] = list
+
+    return columns
+
+
+def _apply_to_partition(partition: pd.DataFrame, meta: pd.DataFrame, task_family: Type[BaseAPI], api_token: Text, api_url: Optional[Text], config: Dict, method_name: Text, args: Tuple, kwargs: Dict) -> pd.DataFrame:
+    if partition.empty:
+        return meta
+
+    client = get_worker_client(task_family, api_token, api_url, config)
+    # the *_in_df methods add their predictions in place, so work on a copy rather than the partition itself
+    return getattr(client, method_name)(partition.copy(deep=False), *args, **kwargs)
+
+
+def _dask_slots() -> int:
+    try:
+        from distributed import get_client
+        return sum(worker['nthreads'] for worker in get_client().scheduler_info()['workers'].values())
+    except (ImportError, ValueError):
+        dask = import_optional_dependency('dask', 'dask')
+        return dask.config.get('num_workers', None) or os.cpu_count()
+
+
+def apply_in_dask(ddf, method: Callable, *args, max_concurrency: Optional[int] = None, meta: Optional[pd.DataFrame] = None, **kwargs):
+    """
+    Apply an *_in_df method to every partition of a Dask DataFrame.
+
+    Each worker process creates its own client and connection pool from the settings of the client the method is bound to.
+
+    :param ddf: a Dask DataFrame.
+    :param method: an *_in_df method bound to a client, e.g. nlp.text_classification_in_df.
+    :param args: the positional arguments of the method, following the DataFrame.
+    :param max_concurrency: the maximum number of concurrent requests across the whole cluster. If not provided, each partition will use the MAX_WORKERS of the client.
+    :param meta: an empty pandas DataFrame describing the output. If not provided, the columns of ddf with a 'predictions' column (and a 'scores' column for columnar outputs, and a 'score_matrix' column if it is requested) will be assumed.
+    :param kwargs: the keyword arguments of the method.
+    :return: a Dask DataFrame with the predictions.
+    """
+    import_optional_dependency('dask.dataframe', 'dask')
+
+    if meta is None:
+        meta = ddf._meta.assign(**{column: pd.Series(dtype=object if dtype is list else dtype) for column, dtype in _prediction_columns(kwargs).items()})
+
+    return ddf.map_partitions(_apply_to_partition, meta, *_describe_method(method, max_concurrency, _dask_slots), args, kwargs, meta=meta)
+
+
+def apply_in_spark(sdf, method: Callable, *args, max_concurrency: Optional[int] = None, schema=None, **kwargs):
+    """
+    Apply an *_in_df method to every partition of a PySpark DataFrame.
+
+    Each executor process creates its own client and connection pool from the settings of the client the method is bound to.
+
+    :param sdf: a PySpark DataFrame.
+    :param method: an *_in_df method bound to a client, e.g. nlp.text_classification_in_df.
+    :param args: the positional arguments of the method, following the DataFrame.
+    :param max_concurrency: the maximum number of concurrent requests across the whole cluster. If not provided, each partition will use the MAX_WORKERS of the client.
+    :param schema: the schema of the output. If not provided, the schema of sdf with a string 'predictions' column (and a double 'scores' column for columnar outputs, and an array 'score_matrix' column if it is requested) will be assumed.
+    :param kwargs: the keyword arguments of the method.
+    :return: a PySpark DataFrame with the predictions.
+    """
+    types = import_optional_dependency('pyspark.sql.types', 'spark')
+
+    def slots() -> int:
+        try:
+            return sdf.sparkSession.sparkContext.defaultParallelism
+        except Exception:
+            # sessions without a SparkContext, e.g. Spark Connect
+            return int(sdf.sparkSession.conf.get('spark.default.parallelism', os.cpu_count()))
+
+    if schema is None:
+        spark_types = {float: types.DoubleType(), list: types.ArrayType(types.DoubleType()), object: types.StringType()}
+        schema = types.StructType(sdf.schema.fields)
+        for column, dtype in _prediction_columns(kwargs).items():
+            schema = schema.add(column, spark_types[dtype])
+
+    task_family, api_token, api_url, config, method_name = _describe_method(method, max_concurrency, slots)
+
+    def apply(batches):
+        client = get_worker_client(task_family, api_token, api_url, config)
+        for batch in batches:
+            if not batch.empty:
+                yield getattr(client, method_name)(batch, *args, **kwargs)
+
+    return sdf.mapInPandas(apply, schema)
@@ -0,0 +1,109 @@
+import time
+import threading
+from typing import Text, Callable, List, Optional
+
+
+class Endpoint:
+    """
+    An inference endpoint along with the load and health information used to route requests to it.
+    """
+    def __init__(self, url: Text):
+        self.url = url
+        self.outstanding = 0
+        self.latency = None
+        self.consecutive_failures = 0
+        self.ejected = False
+        self.next_health_check = 0.0
+        self.checking = False
+
+
+class EndpointPool:
+    """
+    A pool of endpoints serving the same model, that routes each request to the least loaded healthy endpoint.
+
+    Endpoints that fail ejection_threshold times in a row are ejected from the pool and health-checked every health_check_interval
+    seconds until they recover. If every endpoint has been ejected, requests are spread across all of them.
+    """
+    def __init__(self, urls: List[Text], routing: Text = 'least-outstanding', ejection_threshold: int = 3, health_check_interval: float = 10.0, health_check: Optional[Callable[[Text], bool]] = None, latency_smoothing: float = 0.3):
+        if routing not in ('least-outstanding', 'latency'):
+            raise ValueError(f"Unsupported routing strategy: {routing}.")
+
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.routing = routing
+        self.ejection_threshold = ejection_threshold
+        self.health_check_interval = health_check_interval
+        self.health_check = health_check
+        self.latency_smoothing = latency_smoothing
+
+        self._lock = threading.Lock()
+
+    def _rank(self, endpoint: Endpoint) -> tuple:
+        # endpoints without a latency yet are ranked first, so that every endpoint gets measured
+        latency = endpoint.latency if endpoint.latency is not None else 0.0
+        if self.routing == 'latency':
+            return latency, endpoint.outstanding
+
+        return endpoint.outstanding, latency
+
+    def acquire(self, exclude: Optional[Endpoint] = None) -> Endpoint:
+        """
+        Pick the endpoint to send a request to and count the request as outstanding on it. Every call must be paired with a call to release.
+
+        :param exclude: an endpoint to avoid if any other endpoint is available, e.g. the one a request being duplicated was sent to.
+        """
+        with self._lock:
+            self._schedule_health_checks()
+
+            candidates = [endpoint for endpoint in self.endpoints if not endpoint.ejected] or self.endpoints
+            candidates = [endpoint for endpoint in candidates if endpoint is not exclude] or candidates
+            endpoint = min(candidates, key=self._rank)
+            endpoint.outstanding += 1
+
+            return endpoint
+
+    def release(self, endpoint: Endpoint, success: bool, latency: Optional[float] = None) -> None:
+        """
+        Record the outcome of a request sent to an endpoint.
+
+        :param endpoint: the endpoint returned by acquire.
+        :param success: whether the endpoint handled the request. Client errors should count as successes, as they are not the fault of the endpoint.
+        :param latency: the time taken by the request, in seconds.
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+
+            if latency is not None:
+                if endpoint.latency is None:
+                    endpoint.latency = latency
+                else:
+                    endpoint.latency += self.latency_smoothing * (latency - endpoint.latency)
+
+            if success:
+                endpoint.consecutive_failures = 0
+                endpoint.ejected = False
+            else:
+                endpoint.consecutive_failures += 1
+                if endpoint.consecutive_failures >= self.ejection_threshold and not endpoint.ejected:
+                    endpoint.ejected = True
+                    endpoint.next_health_check = time.monotonic() + self.health_check_interval
+
+    def _schedule_health_checks(self) -> None:
+        now = time.monotonic()
+        for endpoint in self.endpoints:
+            if endpoint.ejected and not endpoint.checking and now >= endpoint.next_health_check:
+                endpoint.checking = True
+                threading.Thread(target=self._check_health, args=(endpoint,), daemon=True).start()
+
+    def _check_health(self, endpoint: Endpoint) -> None:
+        try:
+            healthy = self.health_check is None or self.health_check(endpoint.url)
+        except Exception:
+            healthy = False
+
+        with self._lock:
+            endpoint.checking = False
+            if healthy:
+                endpoint.ejected = False
+                endpoint.consecutive_failures = 0
+            else:
+                endpoint.next_health_check = time.monotonic() + self.health_check_interval
@@ -12,4 +12,12 @@ class APICallException(Exception):
 
 
 class InsufficientParametersException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+
+class CircuitOpenException(HTTPServiceUnavailableException):
+    pass
+
+
+class DeadlineExceededException(Exception):
+    pass
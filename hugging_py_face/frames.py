@@ -0,0 +1,145 @@
+import sys
+import functools
+import pandas as pd
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Text, Tuple
+
+
+def _is_instance(obj: Any, module: str, name: str) -> bool:
+    # objects from an optional dependency can only exist if that dependency has already been imported
+    return module in sys.modules and isinstance(obj, getattr(sys.modules[module], name))
+
+
+def _output_columns(kwargs: Dict, predictions: type, errors: bool = False) -> Dict[Text, type]:
+    # the columns an *_in_df method adds, which give the schema of its output when there are no rows to infer it from
+    columns = {'predictions': predictions}
+    if errors:
+        columns['errors'] = str
+    if kwargs.get('columnar') or kwargs.get('score_matrix'):
+        columns['scores'] = float
+    if kwargs.get('score_matrix'):
+        columns['score_matrix'] = list
+    if kwargs.get('cascade_models'):
+        columns['tier'] = str
+
+    return columns
+
+
+def _arrow_type(dtype: type):
+    pa = sys.modules['pyarrow']
+    return {str: pa.string(), int: pa.int64(), float: pa.float64(), list: pa.list_(pa.float64())}[dtype]
+
+
+def _output_schema(schema, columns: Dict[Text, type]):
+    pa = sys.modules['pyarrow']
+
+    for name, dtype in columns.items():
+        if name in schema.names:
+            schema = schema.remove(schema.get_field_index(name))
+
+        schema = schema.append(pa.field(name, _arrow_type(dtype)))
+
+    return schema
+
+
+def _fill_null_types(batch, columns: Dict[Text, type]):
+    pa = sys.modules['pyarrow']
+
+    # a column without any values, such as the errors of a batch in which no row failed, has no type to infer, so it takes its declared type
+    schema = batch.schema
+    for name, dtype in columns.items():
+        if name in schema.names and pa.types.is_null(schema.field(name).type):
+            schema = schema.set(schema.get_field_index(name), pa.field(name, _arrow_type(dtype)))
+
+    return batch if schema.equals(batch.schema) else pa.Table.from_batches([batch]).cast(schema).to_batches()[0]
+
+
+def _apply_to_batch(batch, func: Callable[[pd.DataFrame], pd.DataFrame], offset: int = 0):
+    pa = sys.modules['pyarrow']
+
+    # map the batch to Arrow-backed pandas dtypes, so the conversion does not copy the data
+    frame = batch.to_pandas(types_mapper=pd.ArrowDtype)
+    # the rows are numbered across the whole frame rather than within each batch, for the methods that refer to rows by index
+    frame.index = pd.RangeIndex(offset, offset + batch.num_rows)
+    return pa.RecordBatch.from_pandas(func(frame), preserve_index=False).replace_schema_metadata(batch.schema.metadata)
+
+
+def _apply_to_batches(batches: Iterable, schema, func: Callable[[pd.DataFrame], pd.DataFrame], columns: Dict[Text, type]) -> Tuple[Any, Iterator]:
+    pa = sys.modules['pyarrow']
+
+    # empty batches are skipped rather than sent to the API as requests without any inputs
+    batches = iter(batches)
+    offset = 0
+    for batch in batches:
+        if batch.num_rows:
+            break
+    else:
+        return _output_schema(schema, columns), iter([])
+
+    first = _fill_null_types(_apply_to_batch(batch, func, offset), columns)
+    offset += batch.num_rows
+
+    def rest(offset: int) -> Iterator:
+        yield first
+        for batch in batches:
+            if not batch.num_rows:
+                continue
+
+            # the type of a column of predictions is inferred per batch, so align later batches with the first one
+            yield pa.Table.from_batches([_apply_to_batch(batch, func, offset)]).cast(first.schema).combine_chunks().to_batches()[0]
+            offset += batch.num_rows
+
+    return first.schema, rest(offset)
+
+
+def apply_to_frame(df: Any, func: Callable[[pd.DataFrame], pd.DataFrame], columns: Optional[Dict[Text, type]] = None, new_frame: bool = False) -> Any:
+    """
+    Apply a function that operates on pandas DataFrames to a pandas DataFrame, pyarrow Table or RecordBatchReader, or polars DataFrame.
+
+    :param df: the frame to apply the function to. pyarrow and polars frames are processed one record batch at a time, and their empty batches are skipped.
+    :param func: a function that receives a pandas DataFrame and returns a pandas DataFrame.
+    :param columns: the columns added by the function, mapped to their type (str, int, float or list), which give the schema of the output of a pyarrow or polars frame without any rows. Defaults to a string 'predictions' column.
+    :param new_frame: whether the function returns a new frame made of the given columns, rather than adding them to its input.
+    :return: the result of the function, in the same container type as df. A RecordBatchReader is processed lazily, as its batches are read.
+    """
+    columns = columns if columns is not None else {'predictions': str}
+
+    if _is_instance(df, 'pyarrow', 'Table'):
+        pa = sys.modules['pyarrow']
+        schema, batches = _apply_to_batches(df.to_batches(), pa.schema([]) if new_frame else df.schema, func, columns)
+        return pa.Table.from_batches(list(batches), schema=schema)
+
+    if _is_instance(df, 'pyarrow', 'RecordBatchReader'):
+        pa = sys.modules['pyarrow']
+        schema, batches = _apply_to_batches(df, pa.schema([]) if new_frame else df.schema, func, columns)
+        return pa.RecordBatchReader.from_batches(schema, batches)
+
+    if _is_instance(df, 'polars', 'DataFrame'):
+        pl = sys.modules['polars']
+        return pl.from_arrow(apply_to_frame(df.to_arrow(), func, columns, new_frame))
+
+    return func(df)
+
+
+def supports_frames(method: Optional[Callable] = None, *, predictions: type = str, output_columns: Optional[Dict[Text, type]] = None, row_errors: bool = False) -> Callable:
+    """
+    Allow an *_in_df method written for pandas DataFrames to also accept pyarrow Tables and RecordBatchReaders, and polars DataFrames.
+
+    The predictions are returned in the same container type as the input. Metadata stored in DataFrame.attrs is only available for pandas DataFrames.
+    Can be used with or without arguments, e.g. @supports_frames(predictions=float) for a method whose predictions are numbers rather than strings,
+    or @supports_frames(output_columns={...}) for a method that returns a new frame of the given columns rather than adding predictions to its input.
+    @supports_frames(row_errors=True) marks a method that adds an 'errors' column when ISOLATE_ROW_ERRORS is enabled.
+    """
+    if method is None:
+        return functools.partial(supports_frames, predictions=predictions, output_columns=output_columns, row_errors=row_errors)
+
+    @functools.wraps(method)
+    def wrapper(self, df, *args, **kwargs):
+        if isinstance(df, pd.DataFrame):
+            return method(self, df, *args, **kwargs)
+
+        columns = output_columns if output_columns is not None else _output_columns(kwargs, predictions, row_errors and self.config['ISOLATE_ROW_ERRORS'])
+        return apply_to_frame(df, lambda frame: method(self, frame, *args, **kwargs), columns, new_frame=output_columns is not None)
+
+    # marks the method as operating row by row on a frame, which the CLI relies on to list the tasks it can run over a file
+    wrapper.supports_frames = True
+    return wrapper
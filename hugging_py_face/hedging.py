@@ -0,0 +1,58 @@
+import time
+import threading
+import collections
+import numpy as np
+from typing import Text, Optional
+
+
+class HedgingPolicy:
+    """
+    Decide when a duplicate of a slow request should be sent, and cap how often that happens.
+
+    The delay before hedging is either fixed or, if no delay is given, the given percentile of the recently observed latencies of
+    the same URL. Hedges are limited to max_per_second with a token bucket, so that a slow server is not flooded with duplicates.
+    """
+    def __init__(self, delay: Optional[float] = None, percentile: float = 95, max_per_second: float = 5, min_samples: int = 20, window: int = 1000):
+        self.delay = delay
+        self.percentile = percentile
+        self.max_per_second = max_per_second
+        self.min_samples = min_samples
+
+        self._latencies = collections.defaultdict(lambda: collections.deque(maxlen=window))
+        self._tokens = max_per_second
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, key: Text, latency: float) -> None:
+        with self._lock:
+            self._latencies[key].append(latency)
+
+    def get_delay(self, key: Text) -> Optional[float]:
+        """
+        Get the time to wait for a request before hedging it, or None if there are not enough observations to tell yet.
+        """
+        if self.delay is not None:
+            return self.delay
+
+        with self._lock:
+            latencies = list(self._latencies[key])
+
+        if len(latencies) < self.min_samples:
+            return None
+
+        return float(np.percentile(latencies, self.percentile))
+
+    def try_acquire(self) -> bool:
+        """
+        Take a hedge from the budget, returning False if the budget for the current second has been used up.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.max_per_second, self._tokens + (now - self._last_refill) * self.max_per_second)
+            self._last_refill = now
+
+            if self._tokens < 1:
+                return False
+
+            self._tokens -= 1
+            return True
@@ -0,0 +1,117 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import requests
+from typing import Text, Optional, Tuple
+
+
+class MediaCache:
+    """
+    A disk cache of the media downloaded for URL inputs, bounded to max_bytes and evicting the least recently used content first.
+
+    Cached URLs are revalidated with the server on every use, with their ETag or Last-Modified date, so that unchanged media is not
+    downloaded again. Content is stored under the hash of its bytes, so identical media served from several URLs is only stored once.
+    """
+    def __init__(self, directory: Text, max_bytes: int = 1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        os.makedirs(os.path.join(directory, 'blobs'), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, 'index.sqlite'), check_same_thread=False)
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, hash TEXT NOT NULL, etag TEXT, last_modified TEXT)')
+            self._db.execute('CREATE TABLE IF NOT EXISTS blobs (hash TEXT PRIMARY KEY, size INTEGER NOT NULL, last_used REAL NOT NULL)')
+
+    def _get_path(self, content_hash: Text) -> Text:
+        return os.path.join(self.directory, 'blobs', content_hash)
+
+    def _read(self, content_hash: Text) -> Optional[bytes]:
+        try:
+            with open(self._get_path(content_hash), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def get(self, url: Text, session: requests.Session, timeout: Optional[Tuple[float, float]] = None) -> bytes:
+        """
+        Get the content of a URL, from the cache if the server confirms that it has not changed.
+
+        :param url: the URL of the media.
+        :param session: the session to download the media with.
+        :param timeout: the connect and read timeouts of the requests.
+        :return: the content of the URL.
+        """
+        with self._lock:
+            entry = self._db.execute('SELECT hash, etag, last_modified FROM urls WHERE url = ?', (url,)).fetchone()
+
+        headers = {}
+        if entry is not None:
+            content_hash, etag, last_modified = entry
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        response = session.get(url, headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and entry is not None:
+            data = self._read(content_hash)
+            if data is not None:
+                self._touch(content_hash)
+                return data
+
+            # the content was removed from disk behind the back of the cache, so it is downloaded again
+            response = session.get(url, timeout=timeout)
+
+        response.raise_for_status()
+        data = response.content
+
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self._store(url, data, etag, last_modified)
+
+        return data
+
+    def _touch(self, content_hash: Text) -> None:
+        with self._lock, self._db:
+            self._db.execute('UPDATE blobs SET last_used = ? WHERE hash = ?', (time.time(), content_hash))
+
+    def _store(self, url: Text, data: bytes, etag: Optional[Text], last_modified: Optional[Text]) -> None:
+        if len(data) > self.max_bytes:
+            return
+
+        content_hash = hashlib.sha256(data).hexdigest()
+        path = self._get_path(content_hash)
+
+        if not os.path.exists(path):
+            # written to a temporary file first, so that a partially written file is never read
+            temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporary_path, 'wb') as f:
+                f.write(data)
+            os.replace(temporary_path, path)
+
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO urls VALUES (?, ?, ?, ?)', (url, content_hash, etag, last_modified))
+            self._db.execute('INSERT OR REPLACE INTO blobs VALUES (?, ?, ?)', (content_hash, len(data), time.time()))
+            self._evict()
+
+    def _evict(self) -> None:
+        total, = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()
+        if total <= self.max_bytes:
+            return
+
+        for content_hash, size in self._db.execute('SELECT hash, size FROM blobs ORDER BY last_used').fetchall():
+            self._db.execute('DELETE FROM blobs WHERE hash = ?', (content_hash,))
+            self._db.execute('DELETE FROM urls WHERE hash = ?', (content_hash,))
+            try:
+                os.remove(self._get_path(content_hash))
+            except FileNotFoundError:
+                pass
+
+            total -= size
+            if total <= self.max_bytes:
+                break
@@ -0,0 +1,72 @@
+import threading
+from typing import Any, Callable, Hashable, List
+
+from .deadlines import time_left
+from .exceptions import DeadlineExceededException
+
+
+class _Batch:
+    def __init__(self):
+        self.items = []
+        self.results = None
+        self.error = None
+        self.full = threading.Event()
+        self.done = threading.Event()
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single-input calls that share a key into one batched call.
+
+    The first caller for a key waits until max_batch_size inputs have been collected or max_wait seconds have passed, then sends
+    the whole batch and hands each of the other callers its own result.
+    """
+    def __init__(self, max_batch_size: int, max_wait: float):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: Hashable, item: Any, send: Callable[[List], List]) -> Any:
+        """
+        Submit an input to be sent in a batch with the other inputs submitted for the same key.
+
+        :param key: the key identifying the inputs that can be sent together, e.g. the model, task and parameters.
+        :param item: the input.
+        :param send: a function that sends a list of inputs and returns a list with one result per input. The function of the first caller for a key is used for the whole batch.
+        :return: the result for the input.
+        """
+        with self._lock:
+            batch = self._pending.get(key)
+            is_leader = batch is None
+            if is_leader:
+                batch = self._pending[key] = _Batch()
+
+            index = len(batch.items)
+            batch.items.append(item)
+
+            if len(batch.items) >= self.max_batch_size:
+                del self._pending[key]
+                batch.full.set()
+
+        if is_leader:
+            batch.full.wait(self.max_wait)
+            with self._lock:
+                if self._pending.get(key) is batch:
+                    del self._pending[key]
+
+            try:
+                batch.results = send(batch.items)
+            except Exception as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        elif not batch.done.wait(time_left()):
+            # the batch is still sent for the other callers, but this one gives up on it
+            raise DeadlineExceededException("The deadline of the call was exceeded while waiting for its batch.")
+
+        if batch.error is not None:
+            raise batch.error
+
+        return batch.results[index]
@@ -1,60 +1,90 @@
-import json
-import time
-import requests
-from typing import Text, Dict, List, Optional, Union
+import os
+import itertools
+import contextvars
+import collections
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from typing import Text, Dict, Iterator, List, Optional, Union
 
 from .base_api import BaseAPI
-from .exceptions import HTTPServiceUnavailableException, APICallException
+from .media_cache import MediaCache
+from .deadlines import get_expiry, time_left, run_with_expiry
+from .exceptions import DeadlineExceededException
 
 
 class MultimediaProcessing(BaseAPI):
-    def __init__(self, api_token: Text, api_url: Optional[Text] = None):
-        super().__init__(api_token, api_url)
+    def __init__(self, api_token: Text, api_url: Optional[Text] = None, config: Optional[Dict] = None):
+        super().__init__(api_token, api_url, config)
 
-    def _query(self, input: Text, model: Optional[Text] = None, task: Optional[Text] = None) -> Union[Dict, List]:
-        if model:
-            self._check_model_task_match(model, task)
-
-        api_url = f"{self.api_url}/{model if model is not None else self.config['TASK_MODEL_MAP'][task]}"
+    def _setup(self) -> None:
+        super()._setup()
 
-        headers = {
-            "Authorization": f"Bearer {self.api_token}"
-        }
+        if self.config['MEDIA_CACHE_DIR']:
+            self.media_cache = MediaCache(os.path.expanduser(self.config['MEDIA_CACHE_DIR']), self.config['MEDIA_CACHE_MAX_BYTES'])
+        else:
+            self.media_cache = None
 
+    def _read_media(self, input: Text) -> bytes:
         if input.startswith("http"):
-            response = requests.get(input)
+            if self.media_cache is not None:
+                return self.media_cache.get(input, self.session, self._get_timeout())
+
+            response = self.session.get(input, timeout=self._get_timeout())
             response.raise_for_status()
 
-            data = response.content
+            return response.content
 
-        else:
-            with open(input, "rb") as f:
-                data = f.read()
+        with open(input, "rb") as f:
+            return f.read()
 
-        retries = 0
+    def _query(self, input: Text, model: Optional[Text] = None, task: Optional[Text] = None) -> Union[Dict, List]:
+        return self._post(self._read_media(input), model, task)
 
-        while retries < self.config['MAX_RETRIES']:
-            retries += 1
+    def _query_in_list(self, inputs: List[Text], model: Optional[Text] = None, task: Optional[Text] = None) -> List[Union[Dict, List]]:
+        if len(inputs) <= 1:
+            return [self._query(input, model, task) for input in inputs]
 
-        response = requests.request("POST", api_url, headers=headers, data=data)
-        if response.status_code == int(self.config['HTTP_SERVICE_UNAVAILABLE']):
-            self.logger.info(f"Status code: {response.status_code}.")
-            self.logger.info("Retrying..")
-            time.sleep(1)
-        elif response.status_code == 200:
-            return json.loads(response.content.decode("utf-8"))
-        else:
-            self.logger.info(f"Status code: {response.status_code}.")
-            error_message = self._extract_error_message(response)
-            raise APICallException(f"API call failed with the error: {error_message}.")
+        max_workers = min(self.config['MAX_WORKERS'], len(inputs))
+        predictions, in_flight = [], collections.deque()
+        expires_at = get_expiry()
 
-        self.logger.info(f"Status code: {response.status_code}.")
-        self.logger.info("Connection to the server failed after reaching maximum retry attempts.")
-        self.logger.debug(f"Response: {json.loads(response.content.decode('utf-8'))}.")
-        raise HTTPServiceUnavailableException("The HTTP service is unavailable.")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                # the media of the next inputs is read while the current ones are being sent, and at most max_workers requests are in flight
+                for data in self._prefetch_media(inputs, expires_at):
+                    if len(in_flight) >= max_workers:
+                        predictions.append(in_flight.popleft().result(time_left()))
 
-    def _query_in_list(self, inputs: List[Text], model: Optional[Text] = None, task: Optional[Text] = None) -> List[Union[Dict, List]]:
-        return [self._query(input, model, task) for input in inputs]
+                    in_flight.append(executor.submit(contextvars.copy_context().run, run_with_expiry, expires_at, self._post, data, model, task))
+
+                predictions.extend(future.result(time_left()) for future in in_flight)
+            except TimeoutError:
+                raise DeadlineExceededException("The deadline of the call was exceeded.") from None
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+        return predictions
+
+    def _prefetch_media(self, inputs: List[Text], expires_at: Optional[float] = None) -> Iterator[bytes]:
+        prefetch = max(self.config['MEDIA_PREFETCH'], 1)
+        pending = iter(inputs)
+
+        # the buffer of media read ahead is bounded by the number of reads kept in flight, which caps the memory used
+        with ThreadPoolExecutor(max_workers=min(self.config['MEDIA_READ_WORKERS'], prefetch)) as executor:
+            reads = collections.deque(executor.submit(contextvars.copy_context().run, run_with_expiry, expires_at, self._read_media, input) for input in itertools.islice(pending, prefetch))
+
+            try:
+                while reads:
+                    data = reads.popleft().result(time_left())
+
+                    for input in itertools.islice(pending, 1):
+                        reads.append(executor.submit(contextvars.copy_context().run, run_with_expiry, expires_at, self._read_media, input))
+
+                    yield data
+            finally:
+                for read in reads:
+                    read.cancel()
 
     def _query_in_df(self, df, input_column: Text, model: Optional[Text] = None, task: Optional[Text] = None) -> List[Union[Dict, List]]:
+        self._wait_for_model(model, task)
         return self._query_in_list(df[input_column].tolist(), model, task)
\ No newline at end of file
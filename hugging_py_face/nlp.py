@@ -1,31 +1,70 @@
 import json
-import time
-import requests
 import pandas as pd
 from pandas import DataFrame
 from typing import Text, List, Dict, Optional, Union
 
 from .base_api import BaseAPI
-from .exceptions import HTTPServiceUnavailableException, APICallException, InsufficientParametersException
+from .columnar import add_classification_columns
+from .frames import supports_frames
+from .deadlines import get_expiry, supports_deadline
+from .micro_batching import MicroBatcher
+from .streaming import TokenStream
+from .conversation import Conversation
+from .tables import PreparedTable, merge_answers
+from .zero_shot import shard_labels, merge_label_scores
+from .row_errors import RowError, query_isolating_errors, set_predictions
+from .exceptions import InsufficientParametersException
+
+
+# the tasks that accept a list of inputs, whose single inputs can be micro-batched
+MICRO_BATCHED_TASKS = frozenset([
+    'fill-mask',
+    'summarization',
+    'text-classification',
+    'text-generation',
+    'zero-shot-classification',
+    'feature-extraction',
+    'translation',
+])
+
+# the tasks whose result for a single input is wrapped in a list, unlike each of their results for a list of inputs
+SINGLE_INPUT_WRAPPED_TASKS = frozenset([
+    'summarization',
+    'text-classification',
+    'translation',
+])
 
 
 class NLP(BaseAPI):
-    def __init__(self, api_token: Text, api_url: Optional[Text] = None):
-        super().__init__(api_token, api_url)
+    def __init__(self, api_token: Text, api_url: Optional[Text] = None, config: Optional[Dict] = None):
+        super().__init__(api_token, api_url, config)
+
+    def _setup(self) -> None:
+        super()._setup()
+
+        if self.config['MICRO_BATCHING']:
+            self.micro_batcher = MicroBatcher(self.config['MICRO_BATCH_MAX_SIZE'], self.config['MICRO_BATCH_MAX_WAIT'])
+        else:
+            self.micro_batcher = None
 
     def _query(self, inputs: Union[Text, List, Dict], parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None, task: Optional[Text] = None, extra_headers: Optional[Dict] = None) -> Union[Dict, List]:
-        if model:
-            self._check_model_task_match(model, task)
+        if self.micro_batcher is not None and isinstance(inputs, str) and task in MICRO_BATCHED_TASKS:
+            return self._query_micro_batched(inputs, parameters, options, model, task, extra_headers)
 
-        api_url = f"{self.api_url}/{model if model is not None else self.config['TASK_MODEL_MAP'][task]}"
+        return self._send_query(inputs, parameters, options, model, task, extra_headers)
 
-        headers = {
-            "Authorization": f"Bearer {self.api_token}"
-        }
+    def _query_micro_batched(self, inputs: Text, parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None, task: Optional[Text] = None, extra_headers: Optional[Dict] = None) -> Union[Dict, List]:
+        def send(batch: List) -> List:
+            if len(batch) == 1:
+                return [self._send_query(batch[0], parameters, options, model, task, extra_headers)]
 
-        if extra_headers is not None:
-            headers.update(extra_headers)
+            predictions = self._send_query(batch, parameters, options, model, task, extra_headers)
+            return [[prediction] for prediction in predictions] if task in SINGLE_INPUT_WRAPPED_TASKS else predictions
 
+        key = (model, task, json.dumps(parameters, sort_keys=True), json.dumps(options, sort_keys=True), json.dumps(extra_headers, sort_keys=True))
+        return self.micro_batcher.submit(key, inputs, send)
+
+    def _send_query(self, inputs: Union[Text, List, Dict], parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None, task: Optional[Text] = None, extra_headers: Optional[Dict] = None) -> Union[Dict, List]:
         data = {
             "inputs": inputs
         }
@@ -36,31 +75,79 @@ class NLP(BaseAPI):
         if options is not None:
             data['options'] = options
 
-        retries = 0
+        return self._post(json.dumps(data), model, task, extra_headers)
+
+    def _query_in_df(self, df: DataFrame, column: Text, parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None, task: Optional[Text] = None, extra_headers: Optional[Dict] = None, model_column: Optional[Text] = None, parameters_column: Optional[Text] = None) -> Union[Dict, List]:
+        if model_column is not None or parameters_column is not None or self.config['ISOLATE_ROW_ERRORS']:
+            models = self._get_row_models(df, model_column, model)
+            row_parameters = self._get_row_parameters(df, parameters_column, parameters)
+            return self._query_grouped(df[column].tolist(), models, row_parameters, options, task, extra_headers)
+
+        self._wait_for_model(model, task)
+
+        batches = self._split_into_batches(df[column].tolist())
+        if len(batches) == 1:
+            return self._query(batches[0], parameters, options, model, task, extra_headers)
+
+        predictions = self._map_concurrently(lambda batch: self._query(batch, parameters, options, model, task, extra_headers), batches)
+        return [prediction for batch_predictions in predictions for prediction in batch_predictions]
+
+    def _get_row_models(self, df: DataFrame, model_column: Optional[Text], model: Optional[Text]) -> List[Optional[Text]]:
+        if model_column is None:
+            return [model] * len(df)
+
+        # rows without a model fall back to the model given for the whole DataFrame
+        return [row_model if isinstance(row_model, str) and row_model else model for row_model in df[model_column].tolist()]
+
+    def _get_row_parameters(self, df: DataFrame, parameters_column: Optional[Text], parameters: Optional[Dict]) -> List[Optional[Dict]]:
+        if parameters_column is None:
+            return [parameters] * len(df)
+
+        row_parameters = []
+        for row_parameter in df[parameters_column].tolist():
+            # parameters read from files such as CSVs arrive as JSON strings
+            if isinstance(row_parameter, str):
+                row_parameter = json.loads(row_parameter) if row_parameter else None
+
+            row_parameters.append(dict(parameters or {}, **row_parameter) if isinstance(row_parameter, dict) else parameters)
+
+        return row_parameters
+
+    def _query_grouped(self, inputs: List, models: List[Optional[Text]], row_parameters: List[Optional[Dict]], options: Optional[Dict] = None, task: Optional[Text] = None, extra_headers: Optional[Dict] = None) -> List:
+        groups = {}
+        for i, (model, parameters) in enumerate(zip(models, row_parameters)):
+            groups.setdefault((model, json.dumps(parameters, sort_keys=True)), []).append(i)
 
-        while retries < self.config['MAX_RETRIES']:
-            retries += 1
+        # the groups of models that are ready are sent first, so that the models that are still loading do not hold up the rest of the rows
+        keys = sorted(groups, key=lambda key: not self.model_warmer.is_ready(key[0] if key[0] is not None else self.config['TASK_MODEL_MAP'][task]))
+        requests = [(key, indices) for key in keys for indices in self._split_into_batches(groups[key])]
 
-            response = requests.request("POST", api_url, headers=headers, data=json.dumps(data))
-            if response.status_code == int(self.config['HTTP_SERVICE_UNAVAILABLE']):
-                self.logger.info(f"Status code: {response.status_code}.")
-                self.logger.info("Retrying..")
-                time.sleep(1)
-            elif response.status_code == 200:
-                return json.loads(response.content.decode("utf-8"))
-            else:
-                self.logger.info(f"Status code: {response.status_code}.")
-                error_message = self._extract_error_message(response)
-                raise APICallException(f"API call failed with the error: {error_message}.")
+        def query(request: tuple) -> List:
+            (model, parameters), indices = request
+            self._wait_for_model(model, task)
 
-        self.logger.info(f"Status code: {response.status_code}.")
-        self.logger.info("Connection to the server failed after reaching maximum retry attempts.")
-        self.logger.debug(f"Response: {json.loads(response.content.decode('utf-8'))}.")
-        raise HTTPServiceUnavailableException("The HTTP service is unavailable.")
+            def query_batch(batch: List) -> List:
+                predictions = self._query(batch if len(batch) > 1 else batch[0], json.loads(parameters), options, model, task, extra_headers)
+                if len(batch) > 1:
+                    return predictions
 
-    def _query_in_df(self, df: DataFrame, column: Text, parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None, task: Optional[Text] = None, extra_headers: Optional[Dict] = None) -> Union[Dict, List]:
-        return self._query(df[column].tolist(), parameters, options, model, task, extra_headers)
+                # a single input is answered in a different shape to a list of inputs
+                return predictions if task in SINGLE_INPUT_WRAPPED_TASKS else [predictions]
 
+            batch = [inputs[i] for i in indices]
+            if self.config['ISOLATE_ROW_ERRORS']:
+                return query_isolating_errors(batch, query_batch)
+
+            return query_batch(batch)
+
+        results = [None] * len(inputs)
+        for (_, indices), predictions in zip(requests, self._map_concurrently(query, requests)):
+            for i, prediction in zip(indices, predictions):
+                results[i] = prediction
+
+        return results
+
+    @supports_deadline
     def fill_mask(self, text: Union[Text, List], options: Optional[Dict] = None, model: Optional[Text] = None) -> List:
         """
         Fill in a masked portion(token) of a string or a list of strings.
@@ -68,11 +155,14 @@ class NLP(BaseAPI):
         :param text: a string or list of strings to be filled. Each input must contain the [MASK] token.
         :param options: a dict of options. For more information, see the `detailed parameters for the fill mask task <https://huggingface.co/docs/api-inference/detailed_parameters#fill-mask-task>`_.
         :param model: the model to use for the fill mask task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a list of dicts or a list of lists (of dicts) containing the possible completions and their associated probabilities.
         """
         return self._query(text, options=options, model=model, task='fill-mask')
 
-    def fill_mask_in_df(self, df: DataFrame, column: Text, options: Optional[Dict] = None, model: Optional[Text] = None) -> DataFrame:
+    @supports_deadline
+    @supports_frames(row_errors=True)
+    def fill_mask_in_df(self, df: DataFrame, column: Text, options: Optional[Dict] = None, model: Optional[Text] = None, model_column: Optional[Text] = None) -> DataFrame:
         """
         Fill in the masked portion(token) of a column of strings in a DataFrame.
 
@@ -80,17 +170,20 @@ class NLP(BaseAPI):
         :param column: the column containing the strings to be filled.
         :param options: a dict of options. For more information, see the `detailed parameters for the fill mask task <https://huggingface.co/docs/api-inference/detailed_parameters#fill-mask-task>`_.
         :param model: the model to use for the fill mask task. If not provided, the recommended model from Hugging Face will be used.
+        :param model_column: a column containing the model to use for each row. Rows are grouped by model and the groups are queried concurrently. Rows without a model use the model argument.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a pandas DataFrame with the completions for the masked strings. Each completion added will be the one with the highest probability for that particular masked string. The completions will be added as a new column called 'predictions' to the original DataFrame.
         """
-        predictions = self._query_in_df(df, column, options=options, model=model, task='fill-mask')
+        predictions = self._query_in_df(df, column, options=options, model=model, task='fill-mask', model_column=model_column)
 
-        if any(isinstance(prediction, list) for prediction in predictions):
-            df['predictions'] = [prediction[0]['sequence'] for prediction in predictions]
+        if any(isinstance(prediction, (list, RowError)) for prediction in predictions):
+            set_predictions(df, predictions, lambda prediction: prediction[0]['sequence'], self.config['ISOLATE_ROW_ERRORS'])
         else:
             df['predictions'] = [predictions[0]['sequence']]
 
         return df
 
+    @supports_deadline
     def summarization(self, text: Union[Text, List], parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None) -> Union[Dict, List]:
         """
         Summarize a string or a list of strings.
@@ -99,11 +192,14 @@ class NLP(BaseAPI):
         :param parameters: a dict of parameters. For more information, see the `detailed parameters for the summarization task <https://huggingface.co/docs/api-inference/detailed_parameters#summarization-task>`_.
         :param options: a dict of options. For more information, see the `detailed parameters for the summarization task <https://huggingface.co/docs/api-inference/detailed_parameters#summarization-task>`_.
         :param model: the model to use for the summarization task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a dict or a list of dicts of the summarized string(s).
         """
         return self._query(text, parameters=parameters, options=options, model=model, task='summarization')
 
-    def summarization_in_df(self, df: DataFrame, column: Text, parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None) -> DataFrame:
+    @supports_deadline
+    @supports_frames(row_errors=True)
+    def summarization_in_df(self, df: DataFrame, column: Text, parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None, model_column: Optional[Text] = None, parameters_column: Optional[Text] = None) -> DataFrame:
         """
         Summarize a column of strings in a DataFrame.
 
@@ -112,12 +208,16 @@ class NLP(BaseAPI):
         :param parameters: a dict of parameters. For more information, see the `detailed parameters for the summarization task <https://huggingface.co/docs/api-inference/detailed_parameters#summarization-task>`_.
         :param options: a dict of options. For more information, see the `detailed parameters for the summarization task <https://huggingface.co/docs/api-inference/detailed_parameters#summarization-task>`_.
         :param model: the model to use for the summarization task. If not provided, the recommended model from Hugging Face will be used.
+        :param model_column: a column containing the model to use for each row. Rows are grouped by model and the groups are queried concurrently. Rows without a model use the model argument.
+        :param parameters_column: a column containing a dict (or a JSON string) of parameters for each row, which are merged over the parameters argument. Rows are grouped by their parameters and the groups are queried concurrently.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a pandas DataFrame with the summarizations for the strings. The summarizations will be added as a new column called 'predictions' to the original DataFrame.
         """
-        predictions = self._query_in_df(df, column, parameters=parameters, options=options, model=model, task='summarization')
-        df['predictions'] = [prediction['summary_text'] for prediction in predictions]
+        predictions = self._query_in_df(df, column, parameters=parameters, options=options, model=model, task='summarization', model_column=model_column, parameters_column=parameters_column)
+        set_predictions(df, predictions, lambda prediction: prediction['summary_text'], self.config['ISOLATE_ROW_ERRORS'])
         return df
 
+    @supports_deadline
     def question_answering(self, question: Text, context: Text, model: Optional[Text] = None) -> Dict:
         """
         Answer a question using the provided context.
@@ -125,6 +225,7 @@ class NLP(BaseAPI):
         :param question: a string of the question to be answered.
         :param context: a string of context. This field is required for the question answering task and cannot be left empty.
         :param model: the model to use for the question answering task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a dict of the answer.
         """
         return self._query(
@@ -136,6 +237,8 @@ class NLP(BaseAPI):
             task='question-answering'
         )
 
+    @supports_deadline
+    @supports_frames
     def question_answering_in_df(self, df: DataFrame, question_column: Text, context_column: Text, model: Optional[Text] = None) -> DataFrame:
         """
         Generate answers for a column of questions based on a provided column of context.
@@ -144,6 +247,7 @@ class NLP(BaseAPI):
         :param question_column: the column containing the questions to be answered.
         :param context_column: the column containing the relevant context for each question.
         :param model: the model to use for the question answering task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a pandas DataFrame with the answers for the questions. The answers will be added as a new column called 'predictions' to the original DataFrame.
         """
         answers = []
@@ -161,6 +265,7 @@ class NLP(BaseAPI):
         df['predictions'] = answers
         return df
 
+    @supports_deadline
     def table_question_answering(self, question: Union[Text, List], table: Dict[Text, List], options: Optional[Dict] = None, model: Optional[Text] = None) -> List:
         """
 
@@ -168,6 +273,7 @@ class NLP(BaseAPI):
         :param table: a dict of lists representing a table of data.
         :param options: a dict of options. For more information, see the `detailed parameters for the table question answering task <https://huggingface.co/docs/api-inference/detailed_parameters#table-question-answering-task>`_.
         :param model: the model to use for the table question answering task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a dict or a list of dicts of the answers.
         """
         return self._query(
@@ -180,22 +286,70 @@ class NLP(BaseAPI):
             task='table-question-answering'
         )
 
-    def table_question_answering_task_in_df(self, df: DataFrame, question: Union[Text, List], options: Optional[Dict] = None, model: Optional[Text] = None) -> DataFrame:
-        answers = self._query(
-            {
-                "query": question,
-                "table": df.to_dict('list')
-            },
-            options=options,
-            model=model,
-            task='table-question-answering'
-        )
+    def prepare_table(self, df: DataFrame, max_chars: Optional[int] = None) -> PreparedTable:
+        """
+        Prepare a table to be queried with table_question_answering_task_in_df, so that it is not serialized again for every call.
+
+        :param df: a pandas DataFrame of the table.
+        :param max_chars: the maximum number of characters in each chunk of the table sent to the API. Defaults to TABLE_QA_MAX_CHARS in the configuration. If neither is set, the table is sent whole.
+        :return: a PreparedTable.
+        """
+        return PreparedTable(df, max_chars if max_chars is not None else self.config['TABLE_QA_MAX_CHARS'])
+
+    @supports_deadline
+    def table_question_answering_task_in_df(self, df: Union[DataFrame, PreparedTable], question: Union[Text, List], options: Optional[Dict] = None, model: Optional[Text] = None, prune_columns: Optional[bool] = None) -> DataFrame:
+        """
+        Answer questions about a table. With TABLE_QA_MAX_CHARS (or the max_chars of prepare_table), tables too large for the model are split into chunks of rows that are queried concurrently, and the answers from the chunks are merged.
+
+        :param df: a pandas DataFrame of the table, or a table prepared with prepare_table.
+        :param question: a string or a list of strings of the question(s) to be answered.
+        :param options: a dict of options. For more information, see the `detailed parameters for the table question answering task <https://huggingface.co/docs/api-inference/detailed_parameters#table-question-answering-task>`_.
+        :param model: the model to use for the table question answering task. If not provided, the recommended model from Hugging Face will be used.
+        :param prune_columns: whether to only send the columns relevant to each question. Defaults to TABLE_QA_PRUNE_COLUMNS in the configuration.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
+        :return: a pandas DataFrame with the questions and the predicted answers.
+        """
+        table = df if isinstance(df, PreparedTable) else self.prepare_table(df)
+        questions = [question] if isinstance(question, str) else list(question)
+        prune_columns = prune_columns if prune_columns is not None else self.config['TABLE_QA_PRUNE_COLUMNS']
+
+        # questions that need the same columns are asked together, in a single request per chunk
+        questions_by_columns = {}
+        for i, text in enumerate(questions):
+            columns = table.prune_columns(text) if prune_columns else tuple(table.columns)
+            questions_by_columns.setdefault(columns, []).append(i)
+
+        requests = [(columns, start, chunk, indices) for columns, indices in questions_by_columns.items() for start, chunk in table.get_chunks(columns)]
+
+        def answer(request: tuple) -> List:
+            _, _, chunk, indices = request
+            queries = [questions[i] for i in indices]
+            answers = self._query(
+                {
+                    "query": queries if len(queries) > 1 else queries[0],
+                    "table": chunk
+                },
+                options=options,
+                model=model,
+                task='table-question-answering'
+            )
+
+            return answers if len(queries) > 1 else [answers]
+
+        self._wait_for_model(model, 'table-question-answering')
+        results = self._map_concurrently(answer, requests)
+
+        chunk_answers = [[] for _ in questions]
+        for (columns, start, _, indices), answers in zip(requests, results):
+            for i, chunk_answer in zip(indices, answers):
+                chunk_answers[i].append((start, columns, chunk_answer))
 
         return pd.DataFrame({
-            "question": question,
-            "predictions": [answer['answer'] for answer in answers]
+            "question": questions,
+            "predictions": [merge_answers(answers, table.columns, text, table.cells)['answer'] for text, answers in zip(questions, chunk_answers)]
         })
 
+    @supports_deadline
     def sentence_similarity(self, source_sentence: Text, sentences: List, options: Optional[Dict] = None, model: Optional[Text] = None) -> List:
         """
         Calculate the semantic similarity between one text and a list of other sentences by comparing their embeddings.
@@ -204,6 +358,7 @@ class NLP(BaseAPI):
         :param sentences: a list of strings which will be compared against the source_sentence.
         :param options: a dict of options. For more information, see the `detailed parameters for the sentence similarity task <https://huggingface.co/docs/api-inference/detailed_parameters#sentence-similarity-task>`_.
         :param model: the model to use for the sentence similarity task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a list of similarity scores.
         """
         return self._query(
@@ -216,6 +371,8 @@ class NLP(BaseAPI):
             task='sentence-similarity'
         )
 
+    @supports_deadline
+    @supports_frames(predictions=float)
     def sentence_similarity_in_df(self, df: DataFrame, source_sentence_column: Text, sentence_column: Text, options: Optional[Dict] = None, model: Optional[Text] = None) -> DataFrame:
         """
         Calculate the semantic similarity between sentences in two columns by comparing their embeddings.
@@ -225,6 +382,7 @@ class NLP(BaseAPI):
         :param sentence_column: the column containing the strings which will be compared against the source_sentence.
         :param options: a dict of options. For more information, see the `detailed parameters for the sentence similarity task <https://huggingface.co/docs/api-inference/detailed_parameters#sentence-similarity-task>`_.
         :param model: the model to use for the sentence similarity task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a pandas DataFrame with the similarity scores for the sentences. The scores will be added as a new column called 'predictions' to the original DataFrame.
         """
         scores = []
@@ -243,18 +401,32 @@ class NLP(BaseAPI):
         df['predictions'] = scores
         return df
 
-    def text_classification(self, text: Union[Text, List], options: Optional[Dict] = None, model: Optional[Text] = None) -> Union[Dict, List]:
+    @supports_deadline
+    def text_classification(self, text: Union[Text, List], options: Optional[Dict] = None, model: Optional[Text] = None, cascade_models: Optional[List[Text]] = None, cascade_threshold: Optional[float] = None) -> Union[Dict, List]:
         """
         Analyze the sentiment of a string or a list of strings.
 
         :param text: a string or list of strings to be analyzed.
         :param options: a dict of options. For more information, see the `detailed parameters for the summarization task <https://huggingface.co/docs/api-inference/detailed_parameters#text-classification-task>`_.
         :param model: the model to use for the text classification task. If not provided, the recommended model from Hugging Face will be used.
+        :param cascade_models: a list of smaller, faster models to try first, from the fastest. Only the inputs whose top score falls below cascade_threshold are sent on to the next model, and finally to model.
+        :param cascade_threshold: the top score below which an input is sent on to the next model of the cascade. If not provided, CASCADE_THRESHOLD from the config is used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a dict or a list of dicts indicating the possible sentiments of the string(s) and their associated probabilities.
         """
+        if cascade_models:
+            texts = text if isinstance(text, list) else [text]
+            predictions, _ = self._run_cascade(
+                len(texts), cascade_models, model, cascade_threshold, 'text-classification',
+                lambda positions, tier_model: self._query([texts[i] for i in positions], options=options, model=tier_model, task='text-classification')
+            )
+            return predictions
+
         return self._query(text, options=options, model=model, task='text-classification')
 
-    def text_classification_in_df(self, df: DataFrame, column: Text, options: Optional[Dict] = None, model: Optional[Text] = None) -> DataFrame:
+    @supports_deadline
+    @supports_frames(row_errors=True)
+    def text_classification_in_df(self, df: DataFrame, column: Text, options: Optional[Dict] = None, model: Optional[Text] = None, columnar: bool = False, score_matrix: bool = False, inplace: bool = True, model_column: Optional[Text] = None, cascade_models: Optional[List[Text]] = None, cascade_threshold: Optional[float] = None) -> DataFrame:
         """
         Analyze the sentiment of a column of strings in a DataFrame.
 
@@ -262,12 +434,40 @@ class NLP(BaseAPI):
         :param column: the column containing the strings to be analyzed.
         :param options: a dict of options. For more information, see the `detailed parameters for the summarization task <https://huggingface.co/docs/api-inference/detailed_parameters#text-classification-task>`_.
         :param model: the model to use for the text classification task. If not provided, the recommended model from Hugging Face will be used.
-        :return: a pandas DataFrame with the sentiment of the strings. Each sentiment added will be the one with the highest probability for that particular string. The sentiment will be added as a new column called 'predictions' to the original DataFrame.
-        """
-        predictions = self._query_in_df(df, column, options=options, model=model, task='text-classification')
-        df['predictions'] = [prediction[0]['label'] for prediction in predictions]
+        :param columnar: whether to add the sentiments and their probabilities as Arrow-backed columns called 'predictions' and 'scores'. Requires pyarrow.
+        :param score_matrix: whether to also store a dense sentiment x probability matrix in a list column called 'score_matrix', with the sentiment of each matrix column in df.attrs['score_labels']. hugging_py_face.columnar.get_score_matrix returns it as a 2D NumPy array. Implies columnar.
+        :param inplace: whether to add the predictions to the original DataFrame. If False, a new DataFrame will be returned and the original will be left untouched.
+        :param model_column: a column containing the model to use for each row. Rows are grouped by model and the groups are queried concurrently. Rows without a model use the model argument.
+        :param cascade_models: a list of smaller, faster models to try first, from the fastest. Only the inputs whose top score falls below cascade_threshold are sent on to the next model, and finally to model.
+        :param cascade_threshold: the top score below which an input is sent on to the next model of the cascade. If not provided, CASCADE_THRESHOLD from the config is used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
+        :return: a pandas DataFrame with the sentiment of the strings. Each sentiment added will be the one with the highest probability for that particular string. The sentiment will be added as a new column called 'predictions' to the original DataFrame. With a cascade, the model that answered each row is added in a column called 'tier'.
+        """
+        if cascade_models:
+            if model_column is not None:
+                raise ValueError("A cascade cannot be combined with a model column.")
+
+            predictions, answered_by = self._run_cascade(
+                len(df), cascade_models, model, cascade_threshold, 'text-classification',
+                lambda positions, tier_model: self._query_in_df(df.iloc[positions], column, options=options, model=tier_model, task='text-classification')
+            )
+        else:
+            predictions = self._query_in_df(df, column, options=options, model=model, task='text-classification', model_column=model_column)
+
+        if not inplace:
+            df = df.copy(deep=False)
+
+        if columnar or score_matrix:
+            add_classification_columns(df, predictions, score_matrix, self.config['ISOLATE_ROW_ERRORS'])
+        else:
+            set_predictions(df, predictions, lambda prediction: prediction[0]['label'], self.config['ISOLATE_ROW_ERRORS'])
+
+        if cascade_models:
+            df['tier'] = answered_by
+
         return df
 
+    @supports_deadline
     def text_generation(self, text: Union[Text, List], parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None) -> Union[Dict, List]:
         """
         Continue text from a prompt.
@@ -276,6 +476,7 @@ class NLP(BaseAPI):
         :param parameters: a dict of parameters. For more information, see the `detailed parameters for the text generation task <https://huggingface.co/docs/api-inference/detailed_parameters#text-generation-task>`_.
         :param options: a dict of options. For more information, see the `detailed parameters for the text generation task <https://huggingface.co/docs/api-inference/detailed_parameters#text-generation-task>`_.
         :param model: the model to use for the text generation task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a dict or a list of dicts containing the generated text.
         """
         return self._query(
@@ -289,7 +490,54 @@ class NLP(BaseAPI):
             }
         )
 
-    def text_generation_in_df(self, df: DataFrame, column: Text, parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None) -> DataFrame:
+    @supports_deadline
+    def text_generation_stream(self, text: Text, parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None) -> TokenStream:
+        """
+        Continue text from a prompt, streaming the tokens as they are generated. The model must be served by text-generation-inference.
+
+        :param text: a string to be generated from.
+        :param parameters: a dict of parameters. For more information, see the `detailed parameters for the text generation task <https://huggingface.co/docs/api-inference/detailed_parameters#text-generation-task>`_.
+        :param options: a dict of options. For more information, see the `detailed parameters for the text generation task <https://huggingface.co/docs/api-inference/detailed_parameters#text-generation-task>`_.
+        :param model: the model to use for the text generation task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the stream may take, from sending the request to its last token. A stream that has not ended in time is closed and a DeadlineExceededException is raised.
+        :return: a TokenStream of the generated tokens, which can be iterated over with either a for loop or an async for loop. Once it has been consumed, its result attribute holds a dict containing the generated text and its stats attribute holds the time to first token, the total time and the number of tokens per second.
+        """
+        data = {
+            "inputs": text,
+            "stream": True
+        }
+
+        if parameters is not None:
+            data['parameters'] = parameters
+
+        if options is not None:
+            data['options'] = options
+
+        response = self._request(
+            json.dumps(data),
+            model,
+            'text-generation',
+            extra_headers={
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
+            },
+            stream=True
+        )
+
+        def parse_event(event: Dict) -> Optional[Text]:
+            token = event.get('token') or {}
+            return None if token.get('special') else token.get('text')
+
+        def build_result(generated_text: Text, events: List[Dict]) -> Dict:
+            # the last event of text-generation-inference carries the full generated text
+            final_text = events[-1].get('generated_text') if events else None
+            return {'generated_text': final_text if final_text is not None else generated_text}
+
+        return TokenStream(response, parse_event, build_result, get_expiry())
+
+    @supports_deadline
+    @supports_frames(row_errors=True)
+    def text_generation_in_df(self, df: DataFrame, column: Text, parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None, model_column: Optional[Text] = None, parameters_column: Optional[Text] = None) -> DataFrame:
         """
         Continue text from a prompt in the column of a DataFrame.
 
@@ -298,6 +546,9 @@ class NLP(BaseAPI):
         :param parameters: a dict of parameters. For more information, see the `detailed parameters for the text generation task <https://huggingface.co/docs/api-inference/detailed_parameters#text-generation-task>`_.
         :param options: a dict of options. For more information, see the `detailed parameters for the text generation task <https://huggingface.co/docs/api-inference/detailed_parameters#text-generation-task>`_.
         :param model: the model to use for the text generation task. If not provided, the recommended model from Hugging Face will be used.
+        :param model_column: a column containing the model to use for each row. Rows are grouped by model and the groups are queried concurrently. Rows without a model use the model argument.
+        :param parameters_column: a column containing a dict (or a JSON string) of parameters for each row, which are merged over the parameters argument. Rows are grouped by their parameters and the groups are queried concurrently.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a pandas DataFrame with the generated text. The generated text will be added as a new column called 'predictions' to the original DataFrame.
         """
         predictions = self._query_in_df(
@@ -309,12 +560,15 @@ class NLP(BaseAPI):
             task='text-generation',
             extra_headers={
                 'Content-Type': 'application/json'
-            }
+            },
+            model_column=model_column,
+            parameters_column=parameters_column
         )
-        df['predictions'] = [prediction[0]['generated_text'] for prediction in predictions]
+        set_predictions(df, predictions, lambda prediction: prediction[0]['generated_text'], self.config['ISOLATE_ROW_ERRORS'])
         return df
 
-    def zero_shot_classification(self, text: Union[Text, List], candidate_labels: List, parameters: Optional[Dict] = {}, options: Optional[Dict] = None, model: Optional[Text] = None) -> Union[Dict, List]:
+    @supports_deadline
+    def zero_shot_classification(self, text: Union[Text, List], candidate_labels: List, parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None, shard_size: Optional[int] = None, label_groups: Optional[Dict[Text, List]] = None, top_groups: int = 3) -> Union[Dict, List]:
         """
         Classify a sentence/paragraph to one of the candidate labels provided.
 
@@ -323,19 +577,82 @@ class NLP(BaseAPI):
         :param parameters: a dict of parameters excluding candidate_labels which is passed in as a separate argument. For more information, see the `detailed parameters for the zero shot classification task <https://huggingface.co/docs/api-inference/detailed_parameters#zeroshot-classification-task>`_.
         :param options: a dict of options. For more information, see the `detailed parameters for the zero shot classification task <https://huggingface.co/docs/api-inference/detailed_parameters#zeroshot-classification-task>`_.
         :param model: the model to use for the zero shot classification task. If not provided, the recommended model from Hugging Face will be used.
+        :param shard_size: the maximum number of candidate labels to send in a single request. Larger label sets are split across concurrent requests and the scores are merged. Defaults to ZERO_SHOT_SHARD_SIZE in the configuration.
+        :param label_groups: a dict of group names to lists of candidate labels. If provided, the inputs are first classified into the groups, and only the labels of the top_groups best groups, along with the labels in no group, are scored.
+        :param top_groups: the number of groups whose labels are scored, if label_groups is provided.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a dict or a list of dicts containing the labels and the corresponding the probability of each label.
         """
-        parameters['candidate_labels'] = candidate_labels
+        shard_size = shard_size if shard_size is not None else self.config['ZERO_SHOT_SHARD_SIZE']
+        if (shard_size and len(candidate_labels) > shard_size) or label_groups:
+            predictions = self._zero_shot_classification_sharded([text] if isinstance(text, str) else text, candidate_labels, parameters, options, model, shard_size, label_groups, top_groups)
+            return predictions[0] if isinstance(text, str) else predictions
 
         return self._query(
             text,
-            parameters=parameters,
+            parameters=dict(parameters or {}, candidate_labels=candidate_labels),
             options=options,
             model=model,
             task='zero-shot-classification'
         )
 
-    def zero_shot_classification_in_df(self, df: DataFrame, column: Text, candidate_labels: List, parameters: Optional[Dict] = {}, options: Optional[Dict] = None, model: Optional[Text] = None):
+    def _zero_shot_classification_sharded(self, texts: List[Text], candidate_labels: List, parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None, shard_size: Optional[int] = None, label_groups: Optional[Dict[Text, List]] = None, top_groups: int = 3) -> List[Dict]:
+        parameters = dict(parameters or {})
+        multi_label = parameters.pop('multi_label', False)
+
+        self._wait_for_model(model, 'zero-shot-classification')
+
+        label_sets = [tuple(candidate_labels)] * len(texts)
+        if label_groups:
+            grouped_labels = {label for labels in label_groups.values() for label in labels}
+            group_predictions = self._score_labels(texts, [tuple(label_groups)] * len(texts), parameters, options, model, shard_size)
+
+            label_sets = []
+            for prediction in group_predictions:
+                selected = {label for group in prediction['labels'][:top_groups] for label in label_groups[group]}
+                label_sets.append(tuple(label for label in candidate_labels if label in selected or label not in grouped_labels))
+
+        predictions = self._score_labels(texts, label_sets, parameters, options, model, shard_size)
+        return [merge_label_scores(text, dict(zip(prediction['labels'], prediction['scores'])), multi_label) for text, prediction in zip(texts, predictions)]
+
+    def _score_labels(self, texts: List[Text], label_sets: List[tuple], parameters: Dict, options: Optional[Dict], model: Optional[Text], shard_size: Optional[int]) -> List[Dict]:
+        # the labels are scored independently of each other, so that the scores from different shards can be compared
+        parameters = dict(parameters, multi_label=True)
+
+        texts_by_labels = {}
+        for i, labels in enumerate(label_sets):
+            texts_by_labels.setdefault(labels, []).append(i)
+
+        requests = [
+            (indices, shard)
+            for labels, label_indices in texts_by_labels.items()
+            for indices in self._split_into_batches(label_indices)
+            for shard in shard_labels(list(labels), shard_size)
+        ]
+
+        def score(request: tuple) -> List[Dict]:
+            indices, shard = request
+            batch = [texts[i] for i in indices]
+            predictions = self._query(
+                batch if len(batch) > 1 else batch[0],
+                parameters=dict(parameters, candidate_labels=shard),
+                options=options,
+                model=model,
+                task='zero-shot-classification'
+            )
+
+            return predictions if len(batch) > 1 else [predictions]
+
+        label_scores = [{} for _ in texts]
+        for (indices, _), predictions in zip(requests, self._map_concurrently(score, requests)):
+            for i, prediction in zip(indices, predictions):
+                label_scores[i].update(zip(prediction['labels'], prediction['scores']))
+
+        return [merge_label_scores(text, scores, multi_label=True) for text, scores in zip(texts, label_scores)]
+
+    @supports_deadline
+    @supports_frames(row_errors=True)
+    def zero_shot_classification_in_df(self, df: DataFrame, column: Text, candidate_labels: List, parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None, columnar: bool = False, score_matrix: bool = False, inplace: bool = True, shard_size: Optional[int] = None, label_groups: Optional[Dict[Text, List]] = None, top_groups: int = 3):
         """
 
         :param df: a pandas DataFrame containing the strings to be classified.
@@ -344,13 +661,31 @@ class NLP(BaseAPI):
         :param parameters: a dict of parameters excluding candidate_labels which is passed in as a separate argument. For more information, see the `detailed parameters for the zero shot classification task <https://huggingface.co/docs/api-inference/detailed_parameters#zeroshot-classification-task>`_.
         :param options: a dict of options. For more information, see the `detailed parameters for the zero shot classification task <https://huggingface.co/docs/api-inference/detailed_parameters#zeroshot-classification-task>`_.
         :param model: the model to use for the zero shot classification task. If not provided, the recommended model from Hugging Face will be used.
+        :param columnar: whether to add the classifications and their probabilities as Arrow-backed columns called 'predictions' and 'scores'. Requires pyarrow.
+        :param score_matrix: whether to also store a dense label x probability matrix in a list column called 'score_matrix', with the label of each matrix column in df.attrs['score_labels']. hugging_py_face.columnar.get_score_matrix returns it as a 2D NumPy array. Implies columnar.
+        :param inplace: whether to add the predictions to the original DataFrame. If False, a new DataFrame will be returned and the original will be left untouched.
+        :param shard_size: the maximum number of candidate labels to send in a single request. Larger label sets are split across concurrent requests and the scores are merged. Defaults to ZERO_SHOT_SHARD_SIZE in the configuration.
+        :param label_groups: a dict of group names to lists of candidate labels. If provided, the strings are first classified into the groups, and only the labels of the top_groups best groups, along with the labels in no group, are scored.
+        :param top_groups: the number of groups whose labels are scored, if label_groups is provided.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a pandas DataFrame with the classifications. The classifications will be added as a new column called 'predictions' to the original DataFrame.
         """
-        parameters['candidate_labels'] = candidate_labels
-        predictions = self._query_in_df(df, column, parameters=parameters, options=options, model=model, task='zero-shot-classification')
-        df['predictions'] = [prediction['labels'][0] for prediction in predictions]
+        shard_size = shard_size if shard_size is not None else self.config['ZERO_SHOT_SHARD_SIZE']
+        if (shard_size and len(candidate_labels) > shard_size) or label_groups:
+            predictions = self._zero_shot_classification_sharded(df[column].tolist(), candidate_labels, parameters, options, model, shard_size, label_groups, top_groups)
+        else:
+            predictions = self._query_in_df(df, column, parameters=dict(parameters or {}, candidate_labels=candidate_labels), options=options, model=model, task='zero-shot-classification')
+
+        if not inplace:
+            df = df.copy(deep=False)
+
+        if columnar or score_matrix:
+            return add_classification_columns(df, predictions, score_matrix, self.config['ISOLATE_ROW_ERRORS'])
+
+        set_predictions(df, predictions, lambda prediction: prediction['labels'][0], self.config['ISOLATE_ROW_ERRORS'])
         return df
 
+    @supports_deadline
     def conversational(self, text: Union[Text, List], past_user_inputs: Optional[List] = None, generated_responses: Optional[List] = None, parameters: Optional[Dict] = None, options: Optional[Dict] = None, model: Optional[Text] = None) -> Union[Dict, List]:
         """
         Corresponds to any chatbot like structure: pass in some text along with the past_user_inputs and generated_responses to receive a response.
@@ -361,6 +696,7 @@ class NLP(BaseAPI):
         :param parameters: a dict of parameters. For more information, see the `detailed parameters for the conversational task <https://huggingface.co/docs/api-inference/detailed_parameters#conversational-task>`_.
         :param options: a dict of options. For more information, see the `detailed parameters for the conversational task <https://huggingface.co/docs/api-inference/detailed_parameters#conversational-task>`_.
         :param model: the model to use for the conversational task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a dict or a list of dicts containing the response(s) from the bot.
         """
         inputs = {
@@ -384,6 +720,80 @@ class NLP(BaseAPI):
             }
         )
 
+    @supports_deadline
+    def conversational_stream(self, text: Text, past_user_inputs: Optional[List] = None, generated_responses: Optional[List] = None, parameters: Optional[Dict] = None, model: Optional[Text] = None) -> TokenStream:
+        """
+        Respond to the last input from the user in a conversation, streaming the tokens of the response as they are generated. The model must be served by text-generation-inference, which provides an OpenAI-compatible chat completions API.
+
+        :param text: a string representing the last input from the user in the conversation.
+        :param past_user_inputs: a list of strings corresponding to the earlier replies from the user. Should be of the same length of generated_responses.
+        :param generated_responses: a list of strings corresponding to the earlier replies from the model.
+        :param parameters: a dict of parameters of the chat completions API, e.g. max_tokens and temperature.
+        :param model: the model to use for the conversational task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the stream may take, from sending the request to its last token. A stream that has not ended in time is closed and a DeadlineExceededException is raised.
+        :return: a TokenStream of the generated tokens, which can be iterated over with either a for loop or an async for loop. Once it has been consumed, its result attribute holds a dict containing the response and the updated conversation, in the same format as the conversational method, and its stats attribute holds the time to first token, the total time and the number of tokens per second.
+        """
+        past_user_inputs = past_user_inputs or []
+        generated_responses = generated_responses or []
+
+        messages = []
+        for user_input, generated_response in zip(past_user_inputs, generated_responses):
+            messages.append({'role': 'user', 'content': user_input})
+            messages.append({'role': 'assistant', 'content': generated_response})
+        messages.append({'role': 'user', 'content': text})
+
+        data = {
+            'model': model if model is not None else self.config['TASK_MODEL_MAP']['conversational'],
+            'messages': messages,
+            'stream': True
+        }
+
+        if parameters is not None:
+            data.update(parameters)
+
+        response = self._request(
+            json.dumps(data),
+            model,
+            # chat models are tagged as text generation models on the Hugging Face Hub
+            'text-generation' if model is not None else 'conversational',
+            extra_headers={
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
+            },
+            path='/v1/chat/completions',
+            stream=True
+        )
+
+        def parse_event(event: Dict) -> Optional[Text]:
+            choices = event.get('choices') or [{}]
+            return (choices[0].get('delta') or {}).get('content')
+
+        def build_result(generated_text: Text, events: List[Dict]) -> Dict:
+            return {
+                'generated_text': generated_text,
+                'conversation': {
+                    'past_user_inputs': past_user_inputs + [text],
+                    'generated_responses': generated_responses + [generated_text]
+                }
+            }
+
+        return TokenStream(response, parse_event, build_result, get_expiry())
+
+    def start_conversation(self, model: Optional[Text] = None, parameters: Optional[Dict] = None, options: Optional[Dict] = None, max_turns: Optional[int] = None, max_chars: Optional[int] = None, max_tokens: Optional[int] = None) -> Conversation:
+        """
+        Start a conversation that keeps its own history, so that each turn only requires the new input from the user.
+
+        :param model: the model to use for the conversational task. If not provided, the recommended model from Hugging Face will be used.
+        :param parameters: a dict of parameters. For more information, see the `detailed parameters for the conversational task <https://huggingface.co/docs/api-inference/detailed_parameters#conversational-task>`_.
+        :param options: a dict of options. For more information, see the `detailed parameters for the conversational task <https://huggingface.co/docs/api-inference/detailed_parameters#conversational-task>`_.
+        :param max_turns: the number of past turns to keep. Defaults to CONVERSATION_MAX_TURNS in the configuration.
+        :param max_chars: the maximum number of characters of history, including the new input, sent with each turn. Defaults to CONVERSATION_MAX_CHARS in the configuration.
+        :param max_tokens: the maximum number of tokens (estimated as words) of history, including the new input, sent with each turn. Defaults to CONVERSATION_MAX_TOKENS in the configuration.
+        :return: a Conversation, whose send method returns the response from the bot to the given input.
+        """
+        return Conversation(self, model=model, parameters=parameters, options=options, max_turns=max_turns, max_chars=max_chars, max_tokens=max_tokens)
+
+    @supports_deadline
     def feature_extraction(self, text: Union[Text, List], options: Optional[Dict] = None, model: Optional[Text] = None) -> Union[Dict, List]:
         """
         Reads some text and outputs raw float values, that are usually consumed as part of a semantic database/semantic search.
@@ -391,10 +801,12 @@ class NLP(BaseAPI):
         :param text: a string or a list of strings to get the features from.
         :param options: a dict of options. For more information, see the `detailed parameters for the feature extraction task <https://huggingface.co/docs/api-inference/detailed_parameters#feature-extraction-task>`_.
         :param model: the model to use for the feature extraction task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a list of dicts or a list of lists (of dicts) containing the representation of the features of the input(s).
         """
         return self._query(text, options=options, model=model, task='feature-extraction')
 
+    @supports_deadline
     def translation(self, text: Union[Text, List], lang_input: Text = None, lang_output: Text = None, options: Optional[Dict] = None, model: Optional[Text] = None) -> Union[Dict, List]:
         """
         Translates text from one language to another.
@@ -404,6 +816,7 @@ class NLP(BaseAPI):
         :param lang_output: the short code of the language to translate the input text to. This parameter is mandatory if the model is not provided.
         :param options: a dict of options. For more information, see the `detailed parameters for the translation task <https://huggingface.co/docs/api-inference/detailed_parameters#translation-task>`_.
         :param model: the model to use for the translation task. If not provided, the recommended model from Hugging Face will be used.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a dict or a list of dicts containing the translated text.
         """
         if model is None:
@@ -414,7 +827,9 @@ class NLP(BaseAPI):
         else:
             return self._query(text, options=options, model=model, task='translation')
 
-    def translation_in_df(self, df: DataFrame, column: Text, lang_input: Text = None, lang_output: Text = None, options: Optional[Dict] = None, model: Optional[Text] = None) -> DataFrame:
+    @supports_deadline
+    @supports_frames(row_errors=True)
+    def translation_in_df(self, df: DataFrame, column: Text, lang_input: Text = None, lang_output: Text = None, options: Optional[Dict] = None, model: Optional[Text] = None, model_column: Optional[Text] = None, lang_input_column: Optional[Text] = None, lang_output_column: Optional[Text] = None) -> DataFrame:
         """
         Translates text from one language to another.
 
@@ -424,9 +839,21 @@ class NLP(BaseAPI):
         :param lang_output: the short code of the language to translate the input text to. This parameter is mandatory if the model is not provided.
         :param options: a dict of options. For more information, see the `detailed parameters for the translation task <https://huggingface.co/docs/api-inference/detailed_parameters#translation-task>`_.
         :param model: the model to use for the translation task. If not provided, the recommended model from Hugging Face will be used.
+        :param model_column: a column containing the model to use for each row. Rows without a model are translated with the model for their language pair.
+        :param lang_input_column: a column containing the short code of the language of each input text. Rows without one use lang_input.
+        :param lang_output_column: a column containing the short code of the language to translate each input text to. Rows without one use lang_output.
+        :param deadline: the maximum number of seconds the call may take, including retries. Work that cannot finish in time is cancelled and a DeadlineExceededException is raised.
         :return: a pandas DataFrame with the translations. The translations will be added as a new column called 'predictions' to the original DataFrame.
         """
-        if model is None:
+        if model_column is not None or lang_input_column is not None or lang_output_column is not None:
+            predictions = self._query_grouped(
+                df[column].tolist(),
+                self._get_translation_models(df, lang_input, lang_output, model, model_column, lang_input_column, lang_output_column),
+                [None] * len(df),
+                options=options,
+                task='translation'
+            )
+        elif model is None:
             if lang_input is None or lang_output is None:
                 raise InsufficientParametersException("lang_input and lang_output are required if model is not provided.")
             model = f"{self.config['TASK_MODEL_MAP']['translation']}{lang_input}-{lang_output}"
@@ -434,5 +861,28 @@ class NLP(BaseAPI):
         else:
             predictions = self._query_in_df(df, column, options=options, model=model, task='translation')
 
-        df['predictions'] = [prediction['translation_text'] for prediction in predictions]
-        return df
\ No newline at end of file
+        set_predictions(df, predictions, lambda prediction: prediction['translation_text'], self.config['ISOLATE_ROW_ERRORS'])
+        return df
+
+    def _get_translation_models(self, df: DataFrame, lang_input: Optional[Text], lang_output: Optional[Text], model: Optional[Text], model_column: Optional[Text], lang_input_column: Optional[Text], lang_output_column: Optional[Text]) -> List[Text]:
+        row_models = self._get_row_models(df, model_column, None)
+        lang_inputs = df[lang_input_column].tolist() if lang_input_column is not None else [lang_input] * len(df)
+        lang_outputs = df[lang_output_column].tolist() if lang_output_column is not None else [lang_output] * len(df)
+
+        models = []
+        for row_model, row_lang_input, row_lang_output in zip(row_models, lang_inputs, lang_outputs):
+            row_lang_input = row_lang_input if isinstance(row_lang_input, str) and row_lang_input else lang_input
+            row_lang_output = row_lang_output if isinstance(row_lang_output, str) and row_lang_output else lang_output
+
+            if row_model is None and row_lang_input is not None and row_lang_output is not None:
+                row_model = f"{self.config['TASK_MODEL_MAP']['translation']}{row_lang_input}-{row_lang_output}"
+
+            if row_model is None:
+                row_model = model
+
+            if row_model is None:
+                raise InsufficientParametersException("lang_input and lang_output are required for every row without a model.")
+
+            models.append(row_model)
+
+        return models
@@ -0,0 +1,17 @@
+import importlib
+from types import ModuleType
+from typing import Text
+
+
+def import_optional_dependency(name: Text, extra: Text) -> ModuleType:
+    """
+    Import an optional dependency, raising an informative error if it is not installed.
+
+    :param name: the name of the module to import.
+    :param extra: the name of the extra of this package that installs the dependency.
+    :return: the imported module.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        raise ImportError(f"Missing optional dependency '{name}'. Install it with: pip install hugging_py_face[{extra}]") from None
@@ -0,0 +1,60 @@
+from pandas import DataFrame
+from typing import Text, Callable, List
+
+from .exceptions import APICallException, CircuitOpenException
+
+
+class RowError:
+    """
+    The error for a row whose input was rejected by the API, returned in place of its prediction.
+    """
+    def __init__(self, message: Text):
+        self.message = message
+
+    def __repr__(self) -> Text:
+        return f"RowError({self.message!r})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RowError) and other.message == self.message
+
+
+def query_isolating_errors(inputs: List, query: Callable[[List], List]) -> List:
+    """
+    Query a batch of inputs and, if the API rejects it, bisect the batch to find the inputs that caused the error.
+
+    Only the half of a batch that fails is split and sent again, so a single bad input in a batch of n costs about 2 log2(n) extra requests.
+    If the circuit breaker of the model opens while bisecting, the inputs that are left are not sent and get the error of the open circuit.
+
+    :param inputs: the batch of inputs.
+    :param query: a function that queries the API with a list of inputs and returns a list with one prediction per input.
+    :return: a list with one prediction per input, or a RowError for each input that the API rejected on its own.
+    """
+    try:
+        return query(inputs)
+    except CircuitOpenException as e:
+        return [RowError(str(e))] * len(inputs)
+    except APICallException as e:
+        if len(inputs) == 1:
+            return [RowError(str(e))]
+
+        middle = len(inputs) // 2
+        return query_isolating_errors(inputs[:middle], query) + query_isolating_errors(inputs[middle:], query)
+
+
+def set_predictions(df: DataFrame, predictions: List, extract: Callable, include_errors: bool = False) -> DataFrame:
+    """
+    Add the predictions to a DataFrame as a column called 'predictions'. If any row failed, its prediction is left missing and its error
+    is added to a column called 'errors'.
+
+    :param df: the pandas DataFrame the predictions were made for.
+    :param predictions: a list with one prediction or RowError per row.
+    :param extract: a function that takes a prediction and returns the value to store for it.
+    :param include_errors: whether to add the 'errors' column even if no row failed, so that every batch of a frame has the same columns.
+    :return: the DataFrame.
+    """
+    df['predictions'] = [None if isinstance(prediction, RowError) else extract(prediction) for prediction in predictions]
+
+    if include_errors or any(isinstance(prediction, RowError) for prediction in predictions):
+        df['errors'] = [prediction.message if isinstance(prediction, RowError) else None for prediction in predictions]
+
+    return df
@@ -0,0 +1,104 @@
+import heapq
+import itertools
+import threading
+import contextvars
+from typing import Text, Dict, Optional
+
+from .exceptions import DeadlineExceededException
+
+# the priority class of the current call, if it was given one
+_priority = contextvars.ContextVar('priority', default=None)
+
+
+def get_priority() -> Optional[Text]:
+    return _priority.get()
+
+
+class _Waiter:
+    def __init__(self, priority: Text):
+        self.priority = priority
+        self.granted = threading.Event()
+        self.cancelled = False
+
+
+class PriorityScheduler:
+    """
+    Share a bounded number of concurrent requests between priority classes, e.g. latency-sensitive calls and bulk jobs.
+
+    Requests are admitted straight away while fewer than max_concurrency are in flight. Beyond that they queue, and each freed slot
+    goes to the queued request with the earliest virtual finish time (self-clocked weighted fair queuing): while every class has
+    requests queued, each class is admitted in proportion to its weight, and a request of a class with a high weight jumps ahead of
+    the backlog of a class with a low weight, which still gets its share of the slots.
+    """
+    def __init__(self, max_concurrency: int, weights: Dict[Text, float]):
+        self.max_concurrency = max_concurrency
+        self.weights = weights
+
+        self._in_flight = 0
+        self._virtual_time = 0.0
+        self._finish_times = {priority: 0.0 for priority in weights}
+        self._queue = []
+        self._order = itertools.count()
+        self._admitted = {priority: 0 for priority in weights}
+        self._lock = threading.Lock()
+
+    def acquire(self, priority: Text, timeout: Optional[float] = None) -> None:
+        """
+        Wait for a slot to send a request in.
+
+        :param priority: the priority class of the request.
+        :param timeout: the maximum number of seconds to wait for a slot. If not provided, the wait is unbounded.
+        """
+        with self._lock:
+            if self._in_flight < self.max_concurrency and not self._queue:
+                self._in_flight += 1
+                self._admitted[priority] += 1
+                return
+
+            # a class that was idle starts from the current virtual time, rather than from the credit it did not use
+            finish_time = max(self._virtual_time, self._finish_times[priority]) + 1 / self.weights[priority]
+            self._finish_times[priority] = finish_time
+
+            waiter = _Waiter(priority)
+            heapq.heappush(self._queue, (finish_time, next(self._order), waiter))
+
+        if waiter.granted.wait(timeout):
+            return
+
+        with self._lock:
+            if not waiter.granted.is_set():
+                waiter.cancelled = True
+                raise DeadlineExceededException("The deadline of the call was exceeded while waiting for a slot to send the request in.")
+
+        # the slot was handed over just as the wait timed out
+        self.release()
+        raise DeadlineExceededException("The deadline of the call was exceeded while waiting for a slot to send the request in.")
+
+    def release(self) -> None:
+        """
+        Free the slot of a request, handing it over to the next queued request if there is one.
+        """
+        with self._lock:
+            while self._queue:
+                finish_time, _, waiter = heapq.heappop(self._queue)
+                if waiter.cancelled:
+                    continue
+
+                self._virtual_time = finish_time
+                self._admitted[waiter.priority] += 1
+                waiter.granted.set()
+                return
+
+            self._in_flight -= 1
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            queued = {priority: 0 for priority in self.weights}
+            for _, _, waiter in self._queue:
+                queued[waiter.priority] += not waiter.cancelled
+
+            return {
+                'in_flight': self._in_flight,
+                'queued': queued,
+                'admitted': dict(self._admitted),
+            }
@@ -0,0 +1,116 @@
+import json
+import time
+import asyncio
+import itertools
+import requests
+from typing import Text, Callable, Dict, Iterator, List, Optional
+
+from .exceptions import APICallException, DeadlineExceededException
+
+_END = object()
+
+
+def iter_server_sent_events(response: requests.Response) -> Iterator[Dict]:
+    """
+    Parse the JSON data of the server-sent events in a streamed response.
+
+    :param response: a response opened with stream=True.
+    :return: an iterator of the decoded events. The iteration ends at the end of the response or at a '[DONE]' event.
+    """
+    # read the response as it arrives rather than in fixed-size chunks, so that each event is seen as soon as it is sent
+    data_lines = []
+    for line in itertools.chain(response.iter_lines(chunk_size=None), [b'']):
+        # server-sent events are always UTF-8, whatever the charset of the response, which requests would otherwise default to ISO-8859-1
+        line = line.decode('utf-8')
+
+        if line:
+            # the data of an event may span several data lines, and lines starting with a colon are comments
+            if line.startswith('data:'):
+                data = line[len('data:'):]
+                data_lines.append(data[1:] if data.startswith(' ') else data)
+            continue
+
+        if not data_lines:
+            continue
+
+        data, data_lines = '\n'.join(data_lines), []
+        if data.strip() == '[DONE]':
+            return
+
+        event = json.loads(data)
+        if 'error' in event:
+            raise APICallException(f"API call failed with the error: {event['error']}.")
+
+        yield event
+
+
+class TokenStream:
+    """
+    A stream of the tokens generated for a request, which can be consumed with either a for loop or an async for loop.
+
+    Once the stream has been consumed, the aggregated result is available in result and the timing statistics in stats. A stream
+    opened with a deadline raises a DeadlineExceededException and closes the response if it has not ended by the deadline.
+    """
+    def __init__(self, response: requests.Response, parse_event: Callable[[Dict], Optional[Text]], build_result: Callable[[Text, List[Dict]], Dict], expires_at: Optional[float] = None):
+        self.result = None
+        self.stats = None
+
+        self._response = response
+        self._parse_event = parse_event
+        self._build_result = build_result
+        self._expires_at = expires_at
+        # the timings start from when the request was sent, which was response.elapsed before the response was received
+        self._start = time.monotonic() - response.elapsed.total_seconds()
+        self._tokens = self._generate()
+
+    def _generate(self) -> Iterator[Text]:
+        start = self._start
+        first_token_time = None
+        tokens, events = [], []
+
+        try:
+            for event in iter_server_sent_events(self._response):
+                # the stream outlives the call that opened it, so its deadline is checked here rather than through the context
+                if self._expires_at is not None and time.monotonic() >= self._expires_at:
+                    raise DeadlineExceededException("The deadline of the stream was exceeded.")
+
+                events.append(event)
+
+                token = self._parse_event(event)
+                if token:
+                    if first_token_time is None:
+                        first_token_time = time.monotonic() - start
+
+                    tokens.append(token)
+                    yield token
+        finally:
+            self._response.close()
+
+        total_time = time.monotonic() - start
+        self.result = self._build_result(''.join(tokens), events)
+        self.stats = {
+            'time_to_first_token': first_token_time,
+            'total_time': total_time,
+            'tokens': len(tokens),
+            'tokens_per_second': len(tokens) / total_time if total_time else None,
+        }
+
+    def __iter__(self) -> Iterator[Text]:
+        return self._tokens
+
+    def __next__(self) -> Text:
+        return next(self._tokens)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Text:
+        # the stream is read with requests, so each token is waited for in a worker thread to keep the event loop free
+        token = await asyncio.get_running_loop().run_in_executor(None, next, self._tokens, _END)
+        if token is _END:
+            raise StopAsyncIteration
+
+        return token
+
+    def close(self) -> None:
+        self._tokens.close()
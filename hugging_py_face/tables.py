@@ -0,0 +1,146 @@
+import re
+import collections
+import numpy as np
+from pandas import DataFrame
+from typing import Text, Dict, List, Optional, Tuple
+
+STOP_WORDS = frozenset([
+    'the', 'and', 'for', 'are', 'was', 'were', 'what', 'which', 'who', 'whom', 'whose', 'when', 'where', 'why', 'how', 'many', 'much',
+    'does', 'did', 'has', 'have', 'had', 'with', 'that', 'this', 'these', 'those', 'from', 'than', 'then', 'there', 'their', 'its', 'all',
+    'any', 'not', 'can', 'between', 'into', 'over', 'under', 'per', 'each', 'most', 'least', 'more', 'less'
+])
+
+
+def _get_keywords(question: Text) -> List[Text]:
+    return [word for word in re.findall(r'\w+', question.lower()) if len(word) > 2 and word not in STOP_WORDS]
+
+
+class PreparedTable:
+    """
+    A table prepared for question answering, that can be queried with many questions without being serialized again.
+
+    The cells are converted to strings once, and the sub-tables sent to the API are built once per set of columns. Tables are split into
+    chunks of consecutive rows of at most max_chars characters, which are queried separately and whose answers are merged. If max_chars is
+    None, the table is sent whole.
+    """
+    def __init__(self, df: DataFrame, max_chars: Optional[int] = None):
+        self.max_chars = max_chars
+
+        # the API only accepts strings, and missing values are sent as empty cells
+        self.columns = [str(column) for column in df.columns]
+        self.cells = df.astype(object).where(df.notna(), '').astype(str)
+        self.cells.columns = self.columns
+
+        self._lowercase_cells = None
+        self._cell_lengths = np.column_stack([self.cells[column].str.len().to_numpy() for column in self.columns]) if len(self.columns) else np.zeros((len(df), 0), dtype=int)
+        self._chunks = {}
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def prune_columns(self, question: Text) -> Tuple[Text, ...]:
+        """
+        Select the columns that are relevant to a question: the columns named in the question, along with the columns holding values
+        mentioned in it. If no column is named in the question, the column holding the answer cannot be told apart and every column is kept.
+
+        :param question: the question to be answered.
+        :return: a tuple of the relevant column names, in their order in the table.
+        """
+        keywords = _get_keywords(question)
+        if not keywords:
+            return tuple(self.columns)
+
+        named = {column for column in self.columns if set(_get_keywords(column)) & set(keywords)}
+        if not named:
+            return tuple(self.columns)
+
+        if self._lowercase_cells is None:
+            self._lowercase_cells = self.cells.apply(lambda column: column.str.lower())
+
+        pattern = r'\b(?:' + '|'.join(map(re.escape, keywords)) + r')\b'
+        mentioned = {column for column in self.columns if column not in named and self._lowercase_cells[column].str.contains(pattern).any()}
+
+        return tuple(column for column in self.columns if column in named or column in mentioned)
+
+    def get_chunks(self, columns: Optional[Tuple[Text, ...]] = None) -> List[Tuple[int, Dict[Text, List[Text]]]]:
+        """
+        Split the table into sub-tables of consecutive rows, each of at most max_chars characters unless a single row is longer. The table is a single chunk if max_chars is None.
+
+        :param columns: the columns to keep. If not provided, every column is kept.
+        :return: a list of tuples of the index of the first row of each chunk and the chunk, as a dict of lists.
+        """
+        columns = tuple(columns) if columns is not None else tuple(self.columns)
+        if columns not in self._chunks:
+            self._chunks[columns] = self._build_chunks(columns)
+
+        return self._chunks[columns]
+
+    def _build_chunks(self, columns: Tuple[Text, ...]) -> List[Tuple[int, Dict[Text, List[Text]]]]:
+        if self.max_chars is None:
+            return [(0, self.cells[list(columns)].to_dict('list'))]
+
+        indices = [self.columns.index(column) for column in columns]
+        header_length = sum(len(column) for column in columns)
+        ends = np.cumsum(self._cell_lengths[:, indices].sum(axis=1))
+
+        boundaries, start = [], 0
+        while start < len(ends):
+            offset = ends[start - 1] if start else 0
+            end = max(int(np.searchsorted(ends, offset + max(self.max_chars - header_length, 0), side='right')), start + 1)
+            boundaries.append((start, end))
+            start = end
+
+        cells = self.cells[list(columns)]
+        return [(start, cells.iloc[start:end].to_dict('list')) for start, end in boundaries] or [(0, cells.to_dict('list'))]
+
+
+def _count_mentions(question: Text, cells: DataFrame, row: int) -> int:
+    # the number of words of the question found in a row, e.g. 'city250' in the row of City250 for "Who is the mayor of City250?"
+    return len(set(_get_keywords(question)) & set(_get_keywords(' '.join(cells.iloc[row]))))
+
+
+def merge_answers(answers: List[Tuple[int, Tuple[Text, ...], Dict]], columns: List[Text], question: Optional[Text] = None, cells: Optional[DataFrame] = None) -> Dict:
+    """
+    Merge the answers to a question given by the chunks of a table into a single answer, in the format returned by the API.
+
+    The cells of aggregations and lists are gathered from every chunk. A lookup of a single cell is answered by every chunk with its own
+    best guess, and the API does not score its answers, so the answer whose row mentions the most words of the question is kept, and the
+    earliest chunk wins a tie. Lookups whose question does not mention a value of the row of the answer are unreliable across chunks.
+
+    :param answers: a list of tuples of the index of the first row of the chunk, the columns of the chunk and the answer.
+    :param columns: the columns of the whole table, which the coordinates of the merged answer refer to.
+    :param question: the question that was answered, used to pick between the answers of the chunks to a lookup.
+    :param cells: the cells of the whole table, as strings, used to pick between the answers of the chunks to a lookup.
+    :return: a dict of the answer, coordinates, cells and aggregator.
+    """
+    if len(answers) == 1:
+        start, chunk_columns, answer = answers[0]
+        if start == 0 and list(chunk_columns) == columns:
+            return answer
+
+    found = []
+    for start, chunk_columns, answer in answers:
+        if not answer.get('cells'):
+            continue
+
+        coordinates = [[start + row, columns.index(chunk_columns[column])] for row, column in answer.get('coordinates', [])]
+        found.append((coordinates, answer['cells'], answer.get('aggregator', 'NONE')))
+
+    # chunks may disagree on how to aggregate the cells, in which case the most common choice wins
+    aggregator = collections.Counter(aggregator for _, _, aggregator in found).most_common(1)[0][0] if found else 'NONE'
+
+    if aggregator == 'NONE' and len(found) > 1 and all(len(chunk_cells) == 1 for _, chunk_cells, _ in found):
+        if question is not None and cells is not None:
+            found = [max(found, key=lambda chunk: _count_mentions(question, cells, chunk[0][0][0]) if chunk[0] else -1)]
+        else:
+            found = found[:1]
+
+    coordinates = [coordinate for chunk_coordinates, _, _ in found for coordinate in chunk_coordinates]
+    merged_cells = [cell for _, chunk_cells, _ in found for cell in chunk_cells]
+
+    return {
+        'answer': ', '.join(merged_cells) if aggregator == 'NONE' else f"{aggregator} > {', '.join(merged_cells)}",
+        'coordinates': coordinates,
+        'cells': merged_cells,
+        'aggregator': aggregator
+    }
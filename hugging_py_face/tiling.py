@@ -0,0 +1,122 @@
+import io
+import numpy as np
+from typing import Dict, List, Tuple
+
+from .optional_dependencies import import_optional_dependency
+
+
+def get_tiles(width: int, height: int, tile_size: int, overlap: float) -> np.ndarray:
+    """
+    Cut an image into overlapping square tiles that cover all of it.
+
+    :param width: the width of the image.
+    :param height: the height of the image.
+    :param tile_size: the side of the tiles, in pixels. Tiles are clipped to the image if it is smaller.
+    :param overlap: the fraction of the side of a tile shared with its neighbours.
+    :return: an array of the (xmin, ymin, xmax, ymax) coordinates of each tile.
+    """
+    stride = max(int(tile_size * (1 - overlap)), 1)
+
+    def get_starts(length: int) -> np.ndarray:
+        if length <= tile_size:
+            return np.array([0])
+
+        # the last tile is aligned with the edge of the image, rather than running past it
+        starts = np.arange(0, length - tile_size, stride)
+        return np.append(starts, length - tile_size)
+
+    xs, ys = np.meshgrid(get_starts(width), get_starts(height))
+    xs, ys = xs.ravel(), ys.ravel()
+
+    return np.stack([xs, ys, np.minimum(xs + tile_size, width), np.minimum(ys + tile_size, height)], axis=1)
+
+
+def crop_tiles(data: bytes, tile_size: int, overlap: float) -> Tuple[np.ndarray, List[bytes]]:
+    """
+    Cut an encoded image into overlapping tiles.
+
+    :param data: the encoded image.
+    :param tile_size: the side of the tiles, in pixels.
+    :param overlap: the fraction of the side of a tile shared with its neighbours.
+    :return: a tuple of the coordinates of the tiles, as returned by get_tiles, and the encoded tiles. Tiles are encoded in the format of the image if it is JPEG, and as PNG otherwise.
+    """
+    Image = import_optional_dependency('PIL.Image', 'vision')
+
+    image = Image.open(io.BytesIO(data))
+    tiles = get_tiles(image.width, image.height, tile_size, overlap)
+    if len(tiles) == 1:
+        return tiles, [data]
+
+    image_format = 'JPEG' if image.format == 'JPEG' else 'PNG'
+
+    crops = []
+    for tile in tiles:
+        buffer = io.BytesIO()
+        image.crop(tuple(int(coordinate) for coordinate in tile)).save(buffer, format=image_format)
+        crops.append(buffer.getvalue())
+
+    return tiles, crops
+
+
+def non_maximum_suppression(boxes: np.ndarray, scores: np.ndarray, labels: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """
+    Remove the boxes that overlap a box of the same label with a higher score.
+
+    :param boxes: an array of the (xmin, ymin, xmax, ymax) coordinates of each box.
+    :param scores: an array of the score of each box.
+    :param labels: an array of the label of each box. Boxes with different labels never suppress each other.
+    :param iou_threshold: the intersection over union above which the box with the lower score is removed.
+    :return: an array of the indices of the boxes kept, in descending order of score.
+    """
+    if not len(boxes):
+        return np.zeros(0, dtype=int)
+
+    # moving the boxes of every label to a separate region lets a single pass handle all of the labels
+    _, label_codes = np.unique(labels, return_inverse=True)
+    boxes = boxes + (label_codes.reshape(-1) * (boxes.max() + 1))[:, None]
+
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    order = np.argsort(-scores, kind='stable')
+
+    keep = []
+    while len(order):
+        best, rest = order[0], order[1:]
+        keep.append(best)
+
+        widths = np.clip(np.minimum(boxes[best, 2], boxes[rest, 2]) - np.maximum(boxes[best, 0], boxes[rest, 0]), 0, None)
+        heights = np.clip(np.minimum(boxes[best, 3], boxes[rest, 3]) - np.maximum(boxes[best, 1], boxes[rest, 1]), 0, None)
+        intersections = widths * heights
+        ious = intersections / np.maximum(areas[best] + areas[rest] - intersections, 1e-12)
+
+        order = rest[ious <= iou_threshold]
+
+    return np.array(keep, dtype=int)
+
+
+def merge_tile_detections(tiles: np.ndarray, tile_detections: List[List[Dict]], iou_threshold: float) -> List[Dict]:
+    """
+    Map the detections made on each tile back to the coordinates of the whole image and remove the duplicates found on overlapping tiles.
+
+    :param tiles: the coordinates of the tiles, as returned by get_tiles.
+    :param tile_detections: a list of the detections returned by the API for each tile.
+    :param iou_threshold: the intersection over union above which duplicate boxes are removed.
+    :return: a list of dicts of the label, score and box of each detection, as returned by the API, in descending order of score.
+    """
+    detections = [detection for detections in tile_detections for detection in detections]
+    if not detections:
+        return []
+
+    tile_ids = np.repeat(np.arange(len(tile_detections)), [len(detections) for detections in tile_detections])
+    boxes = np.array([[detection['box'][key] for key in ('xmin', 'ymin', 'xmax', 'ymax')] for detection in detections], dtype=np.float64)
+    boxes += tiles[tile_ids][:, [0, 1, 0, 1]]
+    scores = np.array([detection['score'] for detection in detections], dtype=np.float64)
+    labels = np.array([detection['label'] for detection in detections], dtype=object)
+
+    return [
+        {
+            'score': float(scores[i]),
+            'label': labels[i],
+            'box': dict(zip(('xmin', 'ymin', 'xmax', 'ymax'), (int(coordinate) for coordinate in boxes[i])))
+        }
+        for i in non_maximum_suppression(boxes, scores, labels, iou_threshold)
+    ]
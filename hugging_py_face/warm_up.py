@@ -0,0 +1,134 @@
+import io
+import json
+import wave
+import base64
+import threading
+from typing import Text, Callable, Dict, Optional, Tuple, Union
+
+# a 1x1 transparent PNG
+PROBE_IMAGE = base64.b64decode('iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII=')
+
+PROBE_INPUTS = {
+    'question-answering': {'question': "What is this?", 'context': "This is a test."},
+    'table-question-answering': {'query': "What is this?", 'table': {'Name': ["test"]}},
+    'sentence-similarity': {'source_sentence': "This is a test.", 'sentences': ["This is a test."]},
+    'conversational': {'text': "Hello."},
+}
+
+PROBE_PARAMETERS = {
+    'zero-shot-classification': {'candidate_labels': ["test"]},
+}
+
+IMAGE_TASKS = ('image-classification', 'object-detection')
+AUDIO_TASKS = ('automatic-speech-recognition', 'audio-classification')
+
+
+def _probe_audio() -> bytes:
+    # a tenth of a second of silence
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(16000)
+        f.writeframes(b'\x00\x00' * 1600)
+
+    return buffer.getvalue()
+
+
+def build_probe(task: Text) -> Tuple[Union[Text, bytes], Dict]:
+    """
+    Build the smallest request that makes the Inference API load a model for a task.
+
+    :param task: the task of the model.
+    :return: a tuple of the body of the request and the headers asking the API to wait for the model to load.
+    """
+    headers = {'X-Wait-For-Model': 'true'}
+
+    if task in IMAGE_TASKS:
+        return PROBE_IMAGE, headers
+
+    if task in AUDIO_TASKS:
+        return _probe_audio(), headers
+
+    data = {
+        'inputs': PROBE_INPUTS.get(task, "This is a test."),
+        'options': {'wait_for_model': True}
+    }
+
+    if task in PROBE_PARAMETERS:
+        data['parameters'] = PROBE_PARAMETERS[task]
+
+    return json.dumps(data), dict(headers, **{'Content-Type': 'application/json'})
+
+
+class ModelWarmer:
+    """
+    Load models in the background and keep track of which models are ready to serve requests.
+    """
+    def __init__(self, probe: Callable[[Text, Text], bool]):
+        self.probe = probe
+
+        self._ready = {}
+        self._failed = set()
+        self._lock = threading.Lock()
+
+    def start(self, model: Text, task: Text) -> threading.Event:
+        """
+        Start loading a model in the background, unless it is already loaded or loading.
+
+        :param model: the model to load.
+        :param task: the task of the model.
+        :return: an event that is set once the model has been loaded, or has failed to load.
+        """
+        with self._lock:
+            if model in self._ready and model not in self._failed:
+                return self._ready[model]
+
+            self._failed.discard(model)
+            ready = self._ready[model] = threading.Event()
+
+        threading.Thread(target=self._warm_up, args=(model, task, ready), daemon=True).start()
+        return ready
+
+    def _warm_up(self, model: Text, task: Text, ready: threading.Event) -> None:
+        try:
+            loaded = self.probe(model, task)
+        except Exception:
+            loaded = False
+
+        if not loaded:
+            with self._lock:
+                self._failed.add(model)
+
+        ready.set()
+
+    def mark_ready(self, model: Text) -> None:
+        with self._lock:
+            event = self._ready.setdefault(model, threading.Event())
+            self._failed.discard(model)
+
+        event.set()
+
+    def is_warming(self, model: Text) -> bool:
+        with self._lock:
+            return model in self._ready and not self._ready[model].is_set()
+
+    def is_ready(self, model: Text) -> bool:
+        with self._lock:
+            return model in self._ready and self._ready[model].is_set() and model not in self._failed
+
+    def wait(self, model: Text, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a model that is being loaded.
+
+        :param model: the model to wait for.
+        :param timeout: the maximum number of seconds to wait.
+        :return: whether the model is ready.
+        """
+        with self._lock:
+            event = self._ready.get(model)
+
+        if event is not None:
+            event.wait(timeout)
+
+        return self.is_ready(model)
@@ -0,0 +1,46 @@
+import numpy as np
+from typing import Text, Dict, List, Optional
+
+
+def shard_labels(labels: List[Text], shard_size: Optional[int]) -> List[List[Text]]:
+    """
+    Split candidate labels into shards of at most shard_size labels, to be scored by separate requests.
+
+    :param labels: the candidate labels.
+    :param shard_size: the maximum number of labels in a shard. If not provided, a single shard is returned.
+    :return: a list of the shards.
+    """
+    if not shard_size or len(labels) <= shard_size:
+        return [list(labels)]
+
+    return [list(labels[i:i + shard_size]) for i in range(0, len(labels), shard_size)]
+
+
+def merge_label_scores(sequence: Text, label_scores: Dict[Text, float], multi_label: bool) -> Dict:
+    """
+    Merge the scores of labels scored independently, i.e. with multi_label set, into a single prediction.
+
+    For single-label classification, the scores are renormalized across all of the labels. The entailment logit of each label is not
+    returned by the API, so the log-odds of its independent score, which is the softmax of its entailment and contradiction logits, is
+    used in its place.
+
+    :param sequence: the classified string.
+    :param label_scores: a dict of each label and its independent score.
+    :param multi_label: whether the labels are independent, in which case the scores are returned as they are.
+    :return: a dict containing the sequence, the labels and their scores, in descending order of score, as returned by the API.
+    """
+    labels = list(label_scores)
+    scores = np.fromiter(label_scores.values(), dtype=float, count=len(labels))
+
+    if not multi_label and len(scores):
+        scores = np.clip(scores, 1e-12, 1 - 1e-12)
+        odds = scores / (1 - scores)
+        scores = odds / odds.sum()
+
+    order = np.argsort(-scores, kind='stable')
+
+    return {
+        'sequence': sequence,
+        'labels': [labels[i] for i in order],
+        'scores': scores[order].tolist()
+    }
@@ -26,11 +26,22 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     packages=setuptools.find_packages(),
     install_requires=requirements,
+    extras_require={
+        'arrow': ['pyarrow'],
+        'polars': ['polars', 'pyarrow'],
+        'dask': ['dask[dataframe]'],
+        'spark': ['pyspark', 'pyarrow'],
+        'vision': ['Pillow'],
+        'zstd': ['zstandard'],
+    },
     classifiers=(
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: GNU General Public License v3 (GPLv3)",
         "Operating System :: OS Independent",
     ),
+    entry_points={
+        'console_scripts': ['hugging-py-face=hugging_py_face.cli:main']
+    },
     package_data={
         'hugging_py_face': ['config/*.yml', 'config/*.yaml']
     },
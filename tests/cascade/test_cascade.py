@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+
+from hugging_py_face.cascade import CascadeStats, get_top_scores, run_cascade
+from hugging_py_face.row_errors import RowError
+
+SCORES = {
+    'small': [0.95, 0.6, 0.99, 0.3],
+    'large': [0.9, 0.7, 0.9, 0.8],
+}
+
+
+def classify(calls):
+    def classify(positions, model):
+        calls.append((model, positions.tolist()))
+        return [[{'label': model, 'score': SCORES[model][position]}] for position in positions]
+
+    return classify
+
+
+class TestCascade(unittest.TestCase):
+    def test_only_unsure_inputs_are_escalated(self):
+        calls = []
+        predictions, answered_by = run_cascade(4, ['small', 'large'], 0.9, classify(calls))
+
+        self.assertEqual(calls, [('small', [0, 1, 2, 3]), ('large', [1, 3])])
+        self.assertEqual(answered_by, ['small', 'large', 'small', 'large'])
+        self.assertEqual(predictions[1], [{'label': 'large', 'score': 0.7}])
+
+    def test_last_tier_is_skipped_if_every_input_is_answered(self):
+        calls = []
+        run_cascade(4, ['small', 'large'], 0.2, classify(calls))
+
+        self.assertEqual(calls, [('small', [0, 1, 2, 3])])
+
+    def test_failed_predictions_are_escalated(self):
+        self.assertEqual(get_top_scores([RowError('error'), [{'label': 'a', 'score': 0.5}]]).tolist(), [-np.inf, 0.5])
+
+    def test_stats(self):
+        stats = CascadeStats()
+        run_cascade(4, ['small', 'large'], 0.9, classify([]), stats)
+
+        tiers = stats.as_dict()['tiers']
+        self.assertEqual(stats.as_dict()['inputs'], 4)
+        self.assertEqual(tiers['small']['escalation_rate'], 0.5)
+        self.assertEqual(tiers['large']['inputs'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import json
+import time
+import unittest
+import requests
+from unittest import mock
+
+from hugging_py_face import NLP
+from hugging_py_face.circuit_breaker import CircuitBreaker
+from hugging_py_face.exceptions import DeadlineExceededException, HTTPServiceUnavailableException
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_repeated_failures(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+        circuit_breaker.record_failure()
+        self.assertTrue(circuit_breaker.allow_request())
+
+        circuit_breaker.record_failure()
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(circuit_breaker.allow_request())
+
+    def test_half_open_probe(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        circuit_breaker.record_failure()
+
+        time.sleep(0.1)
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(circuit_breaker.allow_request())
+        self.assertFalse(circuit_breaker.allow_request())
+
+        circuit_breaker.record_failure()
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.OPEN)
+
+        time.sleep(0.1)
+        self.assertTrue(circuit_breaker.allow_request())
+        circuit_breaker.record_success()
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.CLOSED)
+
+    def test_aborted_probe_reopens_the_circuit(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        circuit_breaker.record_failure()
+
+        time.sleep(0.1)
+        self.assertTrue(circuit_breaker.allow_request())
+        circuit_breaker.release_probe()
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.OPEN)
+
+        time.sleep(0.1)
+        self.assertTrue(circuit_breaker.allow_request())
+
+    def test_probe_lease_expires(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05, probe_timeout=0.05)
+        circuit_breaker.record_failure()
+
+        time.sleep(0.1)
+        self.assertTrue(circuit_breaker.allow_request())
+        self.assertFalse(circuit_breaker.allow_request())
+
+        time.sleep(0.1)
+        self.assertTrue(circuit_breaker.allow_request())
+
+    def test_probe_aborted_by_deadline_in_request(self):
+        nlp = NLP('hf_token', api_url='http://localhost:1', config={'CIRCUIT_BREAKER': True, 'CIRCUIT_BREAKER_THRESHOLD': 1, 'CIRCUIT_BREAKER_RESET_TIMEOUT': 0.05})
+        nlp._matched_models.add(('model', 'text-classification'))
+
+        circuit_breaker = nlp._get_circuit_breaker('http://localhost:1/model')
+        circuit_breaker.record_failure()
+        time.sleep(0.1)
+
+        def send(*args):
+            raise DeadlineExceededException()
+
+        nlp._send = send
+        with self.assertRaises(DeadlineExceededException):
+            nlp._request('{}', 'model', 'text-classification')
+
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.OPEN)
+        time.sleep(0.1)
+        self.assertTrue(circuit_breaker.allow_request())
+
+
+def respond(*statuses, loading=True):
+    responses = []
+    for status in statuses:
+        response = requests.Response()
+        response.status_code = status
+        body = {'error': 'Model model is currently loading', 'estimated_time': 20.0} if loading else {'error': 'Service Unavailable'}
+        response._content = json.dumps(body if status != 200 else [[{'label': 'POSITIVE', 'score': 0.9}]]).encode('utf-8')
+        responses.append((response, None))
+
+    return mock.Mock(side_effect=responses)
+
+
+@mock.patch('time.sleep', lambda seconds: None)
+class TestCircuitBreakerInRequests(unittest.TestCase):
+    def setUp(self):
+        self.nlp = NLP('hf_token', config={'CIRCUIT_BREAKER': True, 'CIRCUIT_BREAKER_THRESHOLD': 2, 'MAX_RETRIES': 3})
+        self.nlp._matched_models.add(('model', 'text-classification'))
+        self.circuit_breaker = self.nlp._get_circuit_breaker(f"{self.nlp.api_url}/model")
+
+    def test_loading_model_is_not_a_failure(self):
+        for _ in range(3):
+            self.nlp._send = respond(503, 503, 503)
+            with self.assertRaises(HTTPServiceUnavailableException):
+                self.nlp._request('{}', 'model', 'text-classification')
+
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.CLOSED)
+
+        self.nlp._send = respond(503, 200)
+        self.assertEqual(self.nlp._request('{}', 'model', 'text-classification').status_code, 200)
+
+    def test_retries_count_as_one_failure(self):
+        self.nlp._send = respond(503, 503, 503, loading=False)
+        with self.assertRaises(HTTPServiceUnavailableException):
+            self.nlp._request('{}', 'model', 'text-classification')
+
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.CLOSED)
+
+        self.nlp._send = respond(503, 503, 503, loading=False)
+        with self.assertRaises(HTTPServiceUnavailableException):
+            self.nlp._request('{}', 'model', 'text-classification')
+
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.OPEN)
+
+    def test_disabled_by_default(self):
+        nlp = NLP('hf_token', config={'MAX_RETRIES': 1})
+        nlp._matched_models.add(('model', 'text-classification'))
+
+        for _ in range(10):
+            nlp._send = respond(503, loading=False)
+            with self.assertRaises(HTTPServiceUnavailableException):
+                nlp._request('{}', 'model', 'text-classification')
+
+        self.assertEqual(nlp.circuit_breakers, {})
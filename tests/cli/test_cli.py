@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from dotenv import load_dotenv
+from pandas.testing import assert_frame_equal
+
+from hugging_py_face.cli import ChunkWriter, run, get_row_tasks
+from hugging_py_face.exceptions import HTTPServiceUnavailableException
+
+load_dotenv()
+
+
+class TestCLI(unittest.TestCase):
+    def test_row_tasks(self):
+        tasks = get_row_tasks()
+
+        self.assertIn('text-classification', tasks)
+        self.assertIn('image-classification', tasks)
+        # methods that do not operate row by row are not run over files, whatever other decorators they have
+        self.assertNotIn('table-question-answering-task', tasks)
+
+    def test_write_parquet_with_empty_column(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output_path = os.path.join(directory, 'predictions.parquet')
+
+            with ChunkWriter(output_path, 'parquet') as writer:
+                writer.write(pd.DataFrame({"predictions": ["POSITIVE"], "errors": [None]}))
+                writer.write(pd.DataFrame({"predictions": [None], "errors": ["bad input"]}))
+
+            self.assertEqual(pd.read_parquet(output_path)["errors"].tolist()[1], "bad input")
+
+    def test_run_text_classification(self):
+        texts = ["I like you. I love you", "I don't like you. I hate you"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, 'inputs.csv')
+            output_path = os.path.join(directory, 'predictions.jsonl')
+            pd.DataFrame(texts, columns=['texts']).to_csv(input_path, index=False)
+
+            try:
+                rows = run('text-classification', input_path, output_path, ['texts'], {}, os.environ.get("API_KEY"), chunk_size=1)
+
+                self.assertEqual(rows, 2)
+                assert_frame_equal(
+                    pd.read_json(output_path, lines=True),
+                    pd.DataFrame(
+                        {
+                            "texts": texts,
+                            "predictions": ["POSITIVE", "NEGATIVE"],
+                        }
+                    ),
+                )
+            except HTTPServiceUnavailableException:
+                pass
@@ -0,0 +1,77 @@
+import unittest
+import importlib.util
+import numpy as np
+import pandas as pd
+
+from hugging_py_face.columnar import add_classification_columns, get_score_matrix
+from hugging_py_face.frames import apply_to_frame
+from hugging_py_face.row_errors import RowError
+
+
+@unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+class TestColumnar(unittest.TestCase):
+    def test_score_matrix_is_stored_in_a_column(self):
+        df = pd.DataFrame({'texts': ['a', 'b', 'c']})
+        predictions = [
+            [{'label': 'POSITIVE', 'score': 0.9}, {'label': 'NEGATIVE', 'score': 0.1}],
+            [{'label': 'NEGATIVE', 'score': 0.7}, {'label': 'POSITIVE', 'score': 0.3}],
+            RowError('failed'),
+        ]
+
+        df = add_classification_columns(df, predictions, include_score_matrix=True)
+
+        self.assertEqual(df['predictions'].tolist()[:2], ['POSITIVE', 'NEGATIVE'])
+        self.assertTrue(pd.isna(df['predictions'].iloc[2]))
+        self.assertEqual(df['scores'].tolist()[:2], [0.9, 0.7])
+        self.assertEqual(df['errors'].iloc[2], 'failed')
+        self.assertEqual(df.attrs['score_labels'], ['NEGATIVE', 'POSITIVE'])
+        self.assertNotIn('score_matrix', df.attrs)
+        np.testing.assert_array_equal(get_score_matrix(df), [[0.1, 0.9], [0.7, 0.3], [0.0, 0.0]])
+
+        # the matrix follows the rows of the DataFrame through pandas operations
+        np.testing.assert_array_equal(get_score_matrix(df.iloc[1:2]), [[0.7, 0.3]])
+
+    def test_zero_shot_predictions(self):
+        df = pd.DataFrame({'texts': ['a', 'b']})
+        predictions = [
+            {'sequence': 'a', 'labels': ['sports', 'politics'], 'scores': [0.8, 0.2]},
+            {'sequence': 'b', 'labels': ['politics', 'sports'], 'scores': [0.6, 0.4]},
+        ]
+
+        df = add_classification_columns(df, predictions, include_score_matrix=True)
+
+        self.assertEqual(df['predictions'].tolist(), ['sports', 'politics'])
+        np.testing.assert_array_equal(get_score_matrix(df), [[0.2, 0.8], [0.6, 0.4]])
+
+    def test_predictions_without_labels(self):
+        df = pd.DataFrame({'texts': ['a']})
+
+        df = add_classification_columns(df, [[]], include_score_matrix=True)
+
+        self.assertTrue(pd.isna(df['predictions'].iloc[0]))
+        self.assertEqual(get_score_matrix(df).shape, (1, 0))
+
+    def test_batches_with_different_labels(self):
+        import pyarrow as pa
+
+        schema = pa.schema([('texts', pa.string())])
+        table = pa.Table.from_batches([
+            pa.RecordBatch.from_pylist([{'texts': 'a'}], schema=schema),
+            pa.RecordBatch.from_pylist([{'texts': 'b'}], schema=schema),
+        ])
+        predictions = {
+            'a': [{'label': 'POSITIVE', 'score': 1.0}],
+            'b': [{'label': 'NEGATIVE', 'score': 0.6}, {'label': 'NEUTRAL', 'score': 0.4}],
+        }
+
+        def classify(df: pd.DataFrame) -> pd.DataFrame:
+            return add_classification_columns(df, [predictions[text] for text in df['texts']], include_score_matrix=True)
+
+        table = apply_to_frame(table, classify, {'predictions': str, 'scores': float, 'score_matrix': list})
+
+        self.assertEqual(table.schema.field('score_matrix').type, pa.list_(pa.float64()))
+        self.assertEqual(table.to_pydict()['score_matrix'], [[1.0], [0.6, 0.4]])
+
+
+if __name__ == '__main__':
+    unittest.main()
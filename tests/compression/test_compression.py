@@ -0,0 +1,77 @@
+import os
+import gzip
+import tempfile
+import unittest
+import requests
+
+from hugging_py_face.nlp import NLP
+from hugging_py_face.computer_vision import ComputerVision
+from hugging_py_face.compression import TransferStats, compress, is_compressible
+
+
+def record_requests(client, sent):
+    def send(api_url, pool, headers, data, path='', stream=False, timeout=None):
+        sent.append((headers, data))
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'[{"label": "cat", "score": 0.9}]'
+        return response, None
+
+    client._send = send
+
+
+class TestCompression(unittest.TestCase):
+    def test_gzip(self):
+        data = b'{"inputs": "I like you. I love you."}' * 100
+
+        self.assertEqual(gzip.decompress(compress(data, 'gzip')), data)
+
+    def test_unsupported_encoding(self):
+        with self.assertRaises(ValueError):
+            compress(b'data', 'br')
+
+    def test_transfer_stats(self):
+        stats = TransferStats()
+        stats.record_request(1000, 100)
+        stats.record_request(10, 10)
+
+        self.assertEqual(stats.as_dict()['request_bytes_saved'], 900)
+        self.assertEqual(stats.as_dict()['compressed_requests'], 1)
+
+    def test_only_json_and_text_bodies_are_compressible(self):
+        self.assertTrue(is_compressible('{"inputs": "text"}', {}))
+        self.assertTrue(is_compressible(b'{"inputs": "text"}', {'Content-Type': 'application/json'}))
+        self.assertFalse(is_compressible(b'\x89PNG\r\n\x1a\n', {}))
+
+    def test_json_requests_are_compressed(self):
+        sent = []
+        nlp = NLP('hf_token', config={'REQUEST_COMPRESSION': 'gzip', 'REQUEST_COMPRESSION_THRESHOLD': 0})
+        record_requests(nlp, sent)
+
+        nlp._post('{"inputs": "I like you. I love you."}', task='text-classification')
+
+        headers, data = sent[0]
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(data), b'{"inputs": "I like you. I love you."}')
+
+    def test_media_requests_are_sent_uncompressed(self):
+        sent = []
+        cv = ComputerVision('hf_token', config={'REQUEST_COMPRESSION': 'gzip', 'REQUEST_COMPRESSION_THRESHOLD': 0})
+        record_requests(cv, sent)
+
+        image = b'\xff\xd8\xff\xe0' + b'\x00' * 1000
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'image.jpg')
+            with open(path, 'wb') as f:
+                f.write(image)
+
+            cv.image_classification(path)
+
+        headers, data = sent[0]
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertEqual(data, image)
+        self.assertEqual(cv.transfer_stats.as_dict()['compressed_requests'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -31,4 +31,17 @@ class TestComputerVisionInDF(unittest.TestCase):
                 check_exact=False,
             )
         except HTTPServiceUnavailableException:
-            pass
\ No newline at end of file
+            pass
+
+    def test_object_detection_in_df(self):
+        df = pd.DataFrame(self.inputs, columns=['inputs'])
+
+        try:
+            detections = self.cp.object_detection_in_df(df, 'inputs', score_threshold=0.9)
+
+            self.assertEqual(detections.columns.tolist(), ['row_id', 'label', 'score', 'xmin', 'ymin', 'xmax', 'ymax'])
+            self.assertTrue((detections['row_id'] == 0).all())
+            self.assertTrue((detections['score'] >= 0.9).all())
+            self.assertIn("dog", detections['label'].tolist())
+        except HTTPServiceUnavailableException:
+            pass
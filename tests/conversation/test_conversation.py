@@ -0,0 +1,57 @@
+import unittest
+
+from hugging_py_face.conversation import Conversation
+
+
+class FakeNLP:
+    config = {
+        'CONVERSATION_MAX_TURNS': 20,
+        'CONVERSATION_MAX_CHARS': None,
+        'CONVERSATION_MAX_TOKENS': None
+    }
+
+    def __init__(self):
+        self.calls = []
+
+    def conversational(self, text, past_user_inputs=None, generated_responses=None, parameters=None, options=None, model=None, deadline=None):
+        self.calls.append((text, past_user_inputs, generated_responses))
+        return {'generated_text': f"reply to {text}"}
+
+
+class TestConversation(unittest.TestCase):
+    def test_history_is_bounded(self):
+        nlp = FakeNLP()
+        conversation = Conversation(nlp, max_turns=2)
+
+        for text in ["a", "b", "c"]:
+            conversation.send(text)
+
+        self.assertEqual(conversation.past_user_inputs, ["b", "c"])
+        self.assertEqual(nlp.calls[-1], ("c", ["a", "b"], ["reply to a", "reply to b"]))
+
+    def test_history_is_trimmed_to_budget(self):
+        nlp = FakeNLP()
+        conversation = Conversation(nlp, max_chars=30)
+
+        conversation.send("first")
+        conversation.send("second")
+        conversation.send("third")
+
+        # only the last turn fits alongside the new input
+        self.assertEqual(nlp.calls[-1], ("third", ["second"], ["reply to second"]))
+        self.assertEqual(len(conversation.turns), 3)
+
+    def test_serialization(self):
+        nlp = FakeNLP()
+        conversation = Conversation(nlp, model="my-model", max_turns=5)
+        conversation.send("hello")
+
+        resumed = Conversation.from_json(nlp, conversation.to_json())
+
+        self.assertEqual(resumed.model, "my-model")
+        self.assertEqual(resumed.max_turns, 5)
+        self.assertEqual(list(resumed.turns), [("hello", "reply to hello")])
+
+
+if __name__ == '__main__':
+    unittest.main()
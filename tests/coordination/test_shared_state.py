@@ -0,0 +1,97 @@
+import os
+import time
+import tempfile
+import threading
+import unittest
+import requests
+
+from hugging_py_face.nlp import NLP
+from hugging_py_face.coordination import SharedState
+
+
+class TestSharedState(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'state.sqlite')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_duplicate_requests_are_sent_once(self):
+        calls, results = [], []
+
+        def send():
+            calls.append(1)
+            time.sleep(0.2)
+            return b'response'
+
+        # each thread has its own view of the database, as separate processes would
+        threads = [threading.Thread(target=lambda: results.append(SharedState(self.path).fetch('key', send))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [b'response'] * 4)
+
+    def test_responses_are_only_cached_with_a_ttl(self):
+        calls = []
+
+        def send():
+            calls.append(1)
+            return b'response'
+
+        SharedState(self.path).fetch('key', send)
+        SharedState(self.path).fetch('key', send)
+        self.assertEqual(len(calls), 2)
+
+        SharedState(self.path, cache_ttl=60).fetch('other', send)
+        SharedState(self.path, cache_ttl=60).fetch('other', send)
+        self.assertEqual(len(calls), 3)
+
+    def test_failed_request_releases_its_claim(self):
+        def fail():
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            SharedState(self.path).fetch('key', fail)
+
+        self.assertEqual(SharedState(self.path).fetch('key', lambda: b'response'), b'response')
+
+    def test_rate_limit(self):
+        states = [SharedState(self.path, rate_limit=20, burst=1) for _ in range(2)]
+
+        start = time.monotonic()
+        for _ in range(3):
+            for state in states:
+                state.acquire_token()
+
+        # the first token is in the bucket, and the other five are refilled at 20 per second
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+    def test_responses_are_not_shared_between_tokens(self):
+        calls = []
+
+        def client(api_token):
+            nlp = NLP(api_token, config={'SHARED_STATE_PATH': self.path, 'SHARED_CACHE_TTL': 60})
+
+            def request(*args, **kwargs):
+                calls.append(api_token)
+                response = requests.Response()
+                response._content = ('{"token": "%s"}' % api_token).encode('utf-8')
+                return response
+
+            nlp._request = request
+            return nlp
+
+        first, second = client('hf_first'), client('hf_second')
+
+        self.assertEqual(first._post('text', task='text-classification'), {'token': 'hf_first'})
+        self.assertEqual(second._post('text', task='text-classification'), {'token': 'hf_second'})
+        self.assertEqual(first._post('text', task='text-classification'), {'token': 'hf_first'})
+        self.assertEqual(calls, ['hf_first', 'hf_second'])
+
+
+if __name__ == '__main__':
+    unittest.main()
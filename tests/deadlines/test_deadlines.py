@@ -0,0 +1,45 @@
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from hugging_py_face.deadlines import get_expiry, time_left, run_with_expiry, supports_deadline
+from hugging_py_face.exceptions import DeadlineExceededException
+
+
+class FakeAPI:
+    @supports_deadline
+    def remaining(self):
+        return time_left()
+
+    @supports_deadline
+    def nested(self, inner_deadline):
+        return self.remaining(deadline=inner_deadline)
+
+    @supports_deadline
+    def in_thread(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(run_with_expiry, get_expiry(), time_left).result()
+
+
+class TestDeadlines(unittest.TestCase):
+    def test_no_deadline(self):
+        self.assertIsNone(FakeAPI().remaining())
+
+    def test_deadline(self):
+        self.assertLessEqual(FakeAPI().remaining(deadline=10), 10)
+        self.assertIsNone(get_expiry())
+
+    def test_nested_deadline_cannot_extend_outer_deadline(self):
+        self.assertLessEqual(FakeAPI().nested(100, deadline=1), 1)
+        self.assertLessEqual(FakeAPI().nested(1, deadline=100), 1)
+
+    def test_deadline_in_worker_thread(self):
+        self.assertLessEqual(FakeAPI().in_thread(deadline=10), 10)
+
+    def test_expired_deadline(self):
+        with self.assertRaises(DeadlineExceededException):
+            run_with_expiry(time.monotonic() - 1, time_left)
+
+
+if __name__ == '__main__':
+    unittest.main()
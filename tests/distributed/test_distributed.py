@@ -0,0 +1,112 @@
+import os
+import unittest
+import importlib.util
+import pandas as pd
+
+from hugging_py_face.nlp import NLP
+from hugging_py_face.distributed import apply_in_dask, apply_in_spark
+
+if importlib.util.find_spec('dask'):
+    import dask
+    import dask.dataframe as dd
+
+
+class FakeNLP(NLP):
+    """
+    A client whose *_in_df methods answer without calling the API, and describe the process and client they ran in.
+    """
+    def upper_in_df(self, df, column, columnar=False):
+        df['predictions'] = df[column].str.upper()
+        if columnar:
+            df['scores'] = 1.0
+
+        return df
+
+    def describe_in_df(self, df, column):
+        df['pid'] = os.getpid()
+        df['client'] = id(self)
+        df['max_workers'] = self.config['MAX_WORKERS']
+        return df
+
+
+@unittest.skipUnless(importlib.util.find_spec('dask'), 'dask is not installed')
+class TestApplyInDask(unittest.TestCase):
+    def setUp(self):
+        self.nlp = FakeNLP('hf_token')
+        self.ddf = dd.from_pandas(pd.DataFrame({'texts': ['a', 'b', 'c', 'd', 'e']}), npartitions=3)
+
+    def test_partitions_are_mapped(self):
+        predictions = apply_in_dask(self.ddf, self.nlp.upper_in_df, 'texts')
+
+        with dask.config.set(scheduler='processes', num_workers=2):
+            result = predictions.compute()
+
+        self.assertEqual(result['predictions'].tolist(), ['A', 'B', 'C', 'D', 'E'])
+        self.assertEqual(result.index.tolist(), [0, 1, 2, 3, 4])
+
+    def test_default_meta(self):
+        predictions = apply_in_dask(self.ddf, self.nlp.upper_in_df, 'texts', columnar=True)
+
+        self.assertEqual(list(predictions.columns), ['texts', 'predictions', 'scores'])
+        self.assertEqual(predictions._meta['scores'].dtype, float)
+
+        result = predictions.compute(scheduler='sync')
+        self.assertEqual(list(result.columns), ['texts', 'predictions', 'scores'])
+
+    def test_client_is_rebuilt_on_workers(self):
+        meta = self.ddf._meta.assign(pid=pd.Series(dtype=int), client=pd.Series(dtype=int), max_workers=pd.Series(dtype=int))
+
+        with dask.config.set(scheduler='processes', num_workers=2):
+            predictions = apply_in_dask(self.ddf, self.nlp.describe_in_df, 'texts', max_concurrency=4, meta=meta)
+            result = predictions.compute()
+
+        self.assertNotIn(os.getpid(), result['pid'].tolist())
+        self.assertNotIn(id(self.nlp), result['client'].tolist())
+        # the concurrency budget of the cluster is split between the worker processes
+        self.assertEqual(set(result['max_workers']), {2})
+        # the partitions that run in the same process share its client
+        self.assertEqual(result.groupby('pid')['client'].nunique().max(), 1)
+        self.assertEqual(len(result), 5)
+
+
+@unittest.skipUnless(importlib.util.find_spec('pyspark'), 'pyspark is not installed')
+class TestApplyInSpark(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from pyspark.sql import SparkSession
+        cls.spark = SparkSession.builder.master('local[2]').appName('hugging_py_face').getOrCreate()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.spark.stop()
+
+    def setUp(self):
+        self.nlp = FakeNLP('hf_token')
+        self.sdf = self.spark.createDataFrame(pd.DataFrame({'texts': ['a', 'b', 'c', 'd', 'e']})).repartition(3)
+
+    def test_partitions_are_mapped(self):
+        predictions = apply_in_spark(self.sdf, self.nlp.upper_in_df, 'texts')
+
+        self.assertEqual(sorted(row['predictions'] for row in predictions.collect()), ['A', 'B', 'C', 'D', 'E'])
+
+    def test_default_schema(self):
+        from pyspark.sql import types
+
+        predictions = apply_in_spark(self.sdf, self.nlp.upper_in_df, 'texts', columnar=True)
+
+        self.assertEqual(predictions.schema['predictions'].dataType, types.StringType())
+        self.assertEqual(predictions.schema['scores'].dataType, types.DoubleType())
+        self.assertEqual(predictions.count(), 5)
+
+    def test_client_is_rebuilt_on_executors(self):
+        from pyspark.sql import types
+
+        schema = types.StructType(self.sdf.schema.fields)
+        for column in ['pid', 'client', 'max_workers']:
+            schema = schema.add(column, types.LongType())
+
+        rows = apply_in_spark(self.sdf, self.nlp.describe_in_df, 'texts', max_concurrency=4, schema=schema).collect()
+
+        self.assertNotIn(id(self.nlp), [row['client'] for row in rows])
+        self.assertEqual({row['max_workers'] for row in rows}, {2})
+        self.assertEqual(len(rows), 5)
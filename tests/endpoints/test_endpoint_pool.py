@@ -0,0 +1,37 @@
+import time
+import unittest
+
+from hugging_py_face.endpoints import EndpointPool
+
+
+class TestEndpointPool(unittest.TestCase):
+    def test_least_outstanding_routing(self):
+        pool = EndpointPool(['a', 'b'])
+
+        first = pool.acquire()
+        second = pool.acquire()
+        self.assertNotEqual(first.url, second.url)
+
+        pool.release(first, success=True, latency=0.1)
+        self.assertEqual(pool.acquire().url, first.url)
+
+    def test_failing_endpoint_is_ejected_until_healthy(self):
+        healthy = {'a': True, 'b': False}
+        pool = EndpointPool(['a', 'b'], ejection_threshold=2, health_check_interval=0.05, health_check=lambda url: healthy[url])
+
+        failing = pool.endpoints[1]
+        for _ in range(2):
+            pool.acquire()
+            pool.release(failing, success=False)
+
+        self.assertTrue(failing.ejected)
+        for _ in range(3):
+            endpoint = pool.acquire()
+            self.assertEqual(endpoint.url, 'a')
+            pool.release(endpoint, success=True)
+
+        healthy['b'] = True
+        time.sleep(0.1)
+        pool.release(pool.acquire(), success=True)
+        time.sleep(0.1)
+        self.assertFalse(failing.ejected)
@@ -0,0 +1,92 @@
+import unittest
+import importlib.util
+import pandas as pd
+
+from hugging_py_face.frames import apply_to_frame
+
+if importlib.util.find_spec('pyarrow'):
+    import pyarrow as pa
+
+
+def classify(calls):
+    def classify(df: pd.DataFrame) -> pd.DataFrame:
+        calls.append(len(df))
+        df['predictions'] = ['POSITIVE'] * len(df)
+        return df
+
+    return classify
+
+
+@unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+class TestFrames(unittest.TestCase):
+    def test_empty_table_is_not_sent(self):
+        calls = []
+        table = pa.table({'texts': pa.array([], pa.string())})
+
+        predictions = apply_to_frame(table, classify(calls), {'predictions': str, 'scores': float})
+
+        self.assertEqual(calls, [])
+        self.assertEqual(predictions.num_rows, 0)
+        self.assertEqual(predictions.schema, pa.schema([('texts', pa.string()), ('predictions', pa.string()), ('scores', pa.float64())]))
+
+    def test_empty_record_batch_reader_is_not_sent(self):
+        calls = []
+        schema = pa.schema([('texts', pa.string())])
+        reader = pa.RecordBatchReader.from_batches(schema, [])
+
+        predictions = apply_to_frame(reader, classify(calls))
+
+        self.assertEqual(predictions.schema, pa.schema([('texts', pa.string()), ('predictions', pa.string())]))
+        self.assertEqual(predictions.read_all().num_rows, 0)
+        self.assertEqual(calls, [])
+
+    def test_empty_batches_are_skipped(self):
+        calls = []
+        schema = pa.schema([('texts', pa.string())])
+        table = pa.Table.from_batches([
+            pa.RecordBatch.from_pylist([], schema=schema),
+            pa.RecordBatch.from_pylist([{'texts': 'a'}, {'texts': 'b'}], schema=schema),
+        ])
+
+        predictions = apply_to_frame(table, classify(calls))
+
+        self.assertEqual(calls, [2])
+        self.assertEqual(predictions.to_pydict(), {'texts': ['a', 'b'], 'predictions': ['POSITIVE', 'POSITIVE']})
+
+    def test_rows_are_numbered_across_batches(self):
+        schema = pa.schema([('texts', pa.string())])
+        reader = pa.RecordBatchReader.from_batches(schema, [
+            pa.RecordBatch.from_pylist([{'texts': 'a'}, {'texts': 'b'}], schema=schema),
+            pa.RecordBatch.from_pylist([{'texts': 'c'}], schema=schema),
+        ])
+
+        def to_rows(df: pd.DataFrame) -> pd.DataFrame:
+            return pd.DataFrame({'row_id': df.index.to_numpy()})
+
+        rows = apply_to_frame(reader, to_rows, {'row_id': int}, new_frame=True)
+
+        self.assertEqual(rows.read_all().to_pydict(), {'row_id': [0, 1, 2]})
+
+    def test_empty_table_of_a_new_frame(self):
+        table = pa.table({'texts': pa.array([], pa.string())})
+
+        rows = apply_to_frame(table, classify([]), {'row_id': int, 'label': str}, new_frame=True)
+
+        self.assertEqual(rows.schema, pa.schema([('row_id', pa.int64()), ('label', pa.string())]))
+
+    def test_errors_of_batches_without_failed_rows(self):
+        schema = pa.schema([('texts', pa.string())])
+        table = pa.Table.from_batches([
+            pa.RecordBatch.from_pylist([{'texts': 'a'}], schema=schema),
+            pa.RecordBatch.from_pylist([{'texts': 'bad'}], schema=schema),
+        ])
+
+        def classify_isolating_errors(df: pd.DataFrame) -> pd.DataFrame:
+            df['predictions'] = [None if text == 'bad' else 'POSITIVE' for text in df['texts']]
+            df['errors'] = ['bad input' if text == 'bad' else None for text in df['texts']]
+            return df
+
+        predictions = apply_to_frame(table, classify_isolating_errors, {'predictions': str, 'errors': str})
+
+        self.assertEqual(predictions.schema.field('errors').type, pa.string())
+        self.assertEqual(predictions.to_pydict()['errors'], [None, 'bad input'])
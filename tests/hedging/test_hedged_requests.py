@@ -0,0 +1,90 @@
+import time
+import threading
+import unittest
+import requests
+
+from hugging_py_face.nlp import NLP
+
+
+class FakeResponse(requests.Response):
+    def __init__(self, url: str):
+        super().__init__()
+        self.status_code = 200
+        self.url = url
+        self._content = b'[]'
+        self.closed = threading.Event()
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeSession:
+    """
+    A session whose requests to the slow endpoint take a while to be answered.
+    """
+    def __init__(self, delays):
+        self.delays = delays
+        self.responses = []
+        self.finished = threading.Event()
+
+    def request(self, method, url, **kwargs):
+        time.sleep(self.delays[url])
+        response = FakeResponse(url)
+        self.responses.append(response)
+        if url == 'http://slow':
+            self.finished.set()
+
+        return response
+
+
+class TestHedgedRequests(unittest.TestCase):
+    def setUp(self):
+        self.nlp = NLP('hf_token', config={
+            'ENDPOINTS': {'text-classification': ['http://slow', 'http://fast']},
+            'HEDGING': True,
+            'HEDGE_DELAY': 0.05,
+        })
+        self.session = FakeSession({'http://slow': 0.5, 'http://fast': 0.0})
+        self.nlp.session = self.session
+        self.pool = self.nlp.endpoint_pools['text-classification']
+
+    def test_first_response_wins(self):
+        start = time.monotonic()
+        response, endpoint = self.nlp._send('http://api/model', self.pool, {}, '{}')
+
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(response.url, 'http://fast')
+        self.assertEqual(endpoint.url, 'http://fast')
+        self.assertFalse(response.closed.is_set())
+
+    def test_loser_is_released_and_closed(self):
+        self.nlp._send('http://api/model', self.pool, {}, '{}')
+
+        self.assertTrue(self.session.finished.wait(2))
+        loser = next(response for response in self.session.responses if response.url == 'http://slow')
+        self.assertTrue(loser.closed.wait(2))
+        # the endpoints are released once their requests complete, whichever won
+        self.assertEqual([endpoint.outstanding for endpoint in self.pool.endpoints], [0, 0])
+
+    def test_requests_are_not_hedged_before_the_delay(self):
+        self.session.delays['http://slow'] = 0.0
+
+        response, endpoint = self.nlp._send('http://api/model', self.pool, {}, '{}')
+
+        self.assertEqual(response.url, 'http://slow')
+        self.assertEqual(len(self.session.responses), 1)
+
+    def test_concurrent_requests_are_not_queued(self):
+        nlp = NLP('hf_token', config={'HEDGING': True, 'HEDGE_DELAY': 0.05, 'HEDGE_MAX_PER_SECOND': 0, 'MAX_WORKERS': 1})
+        nlp.session = FakeSession({'http://slow': 0.3})
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=nlp._send, args=('http://slow', None, {}, '{}')) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # the requests are sent together, however few workers the client has
+        self.assertLess(time.monotonic() - start, 0.6)
+        self.assertEqual(len(nlp.session.responses), 6)
@@ -0,0 +1,22 @@
+import unittest
+
+from hugging_py_face.hedging import HedgingPolicy
+
+
+class TestHedgingPolicy(unittest.TestCase):
+    def test_adaptive_delay(self):
+        policy = HedgingPolicy(percentile=95, min_samples=20)
+
+        for latency in range(19):
+            policy.record('url', latency / 100)
+        self.assertIsNone(policy.get_delay('url'))
+
+        for latency in range(19, 100):
+            policy.record('url', latency / 100)
+        self.assertAlmostEqual(policy.get_delay('url'), 0.9405)
+
+    def test_hedges_are_rate_limited(self):
+        policy = HedgingPolicy(delay=0.1, max_per_second=2)
+
+        self.assertEqual(policy.get_delay('url'), 0.1)
+        self.assertEqual([policy.try_acquire() for _ in range(3)], [True, True, False])
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from hugging_py_face.media_cache import MediaCache
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, contents):
+        self.contents = contents
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        headers = headers or {}
+        self.requests.append((url, headers))
+
+        content = self.contents[url]
+        etag = f'"{hash(content)}"'
+        if headers.get('If-None-Match') == etag:
+            return FakeResponse(304)
+
+        return FakeResponse(200, content, {'ETag': etag})
+
+
+class TestMediaCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_revalidation(self):
+        cache = MediaCache(self.directory)
+        session = FakeSession({'http://a': b'image'})
+
+        self.assertEqual(cache.get('http://a', session), b'image')
+        self.assertEqual(cache.get('http://a', session), b'image')
+        self.assertIn('If-None-Match', session.requests[1][1])
+
+    def test_identical_content_is_stored_once(self):
+        cache = MediaCache(self.directory)
+        session = FakeSession({'http://a': b'image', 'http://b': b'image'})
+
+        cache.get('http://a', session)
+        cache.get('http://b', session)
+
+        self.assertEqual(len(os.listdir(os.path.join(self.directory, 'blobs'))), 1)
+
+    def test_least_recently_used_eviction(self):
+        cache = MediaCache(self.directory, max_bytes=10)
+        session = FakeSession({'http://a': b'aaaa', 'http://b': b'bbbb', 'http://c': b'cccc'})
+
+        cache.get('http://a', session)
+        cache.get('http://b', session)
+        cache.get('http://a', session)
+        cache.get('http://c', session)
+
+        # b was used least recently, so it is downloaded again in full
+        cache.get('http://b', session)
+        self.assertNotIn('If-None-Match', session.requests[-1][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from hugging_py_face.micro_batching import MicroBatcher
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_calls_are_coalesced(self):
+        batcher = MicroBatcher(max_batch_size=4, max_wait=0.5)
+        batches = []
+
+        def send(batch):
+            batches.append(list(batch))
+            return [item * 2 for item in batch]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda item: batcher.submit('key', item, send), range(8)))
+
+        self.assertEqual(results, [item * 2 for item in range(8)])
+        self.assertEqual(sorted(len(batch) for batch in batches), [4, 4])
+
+    def test_errors_are_raised_for_every_caller(self):
+        batcher = MicroBatcher(max_batch_size=2, max_wait=0.5)
+
+        def send(batch):
+            raise ValueError("failed")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(batcher.submit, 'key', item, send) for item in range(2)]
+
+        for future in futures:
+            self.assertRaises(ValueError, future.result)
@@ -182,6 +182,19 @@ class TestNLP(unittest.TestCase):
         except HTTPServiceUnavailableException:
             pass
 
+    def test_text_generation_stream(self):
+        text = "The answer to the universe is"
+
+        try:
+            stream = self.nlp.text_generation_stream(text)
+            tokens = list(stream)
+
+            self.assertTrue(len(tokens) > 0)
+            self.assertEqual(stream.stats['tokens'], len(tokens))
+            self.assertIn(''.join(tokens), stream.result['generated_text'])
+        except HTTPServiceUnavailableException:
+            pass
+
     def test_zero_shot_classification(self):
         text = "Hi, I recently bought a device from your company but it is not working as advertised and I would like to get reimbursed!"
         candidate_labels = ["refund", "legal", "faq"]
@@ -0,0 +1,54 @@
+import os
+import unittest
+import importlib.util
+import pandas as pd
+from dotenv import load_dotenv
+
+from hugging_py_face.nlp import NLP
+from hugging_py_face.columnar import get_score_matrix
+from hugging_py_face.exceptions import HTTPServiceUnavailableException
+
+if importlib.util.find_spec('pyarrow'):
+    import pyarrow as pa
+
+load_dotenv()
+
+
+@unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+class TestNLPInArrow(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.nlp = NLP(os.environ.get("API_KEY"))
+
+    def test_text_classification_in_df_columnar(self):
+        texts = ["I like you. I love you", "I don't like you. I hate you"]
+        df = pd.DataFrame(texts, columns=['texts'])
+
+        try:
+            predictions_df = self.nlp.text_classification_in_df(df, 'texts', score_matrix=True, inplace=False)
+
+            self.assertEqual(list(df.columns), ['texts'])
+            self.assertEqual(predictions_df['predictions'].tolist(), ["POSITIVE", "NEGATIVE"])
+            self.assertTrue(predictions_df['scores'].between(0, 1).all())
+            self.assertEqual(predictions_df.attrs['score_labels'], ["NEGATIVE", "POSITIVE"])
+            self.assertEqual(get_score_matrix(predictions_df).shape, (2, 2))
+        except HTTPServiceUnavailableException:
+            pass
+
+    def test_text_classification_in_arrow_table(self):
+        texts = ["I like you. I love you", "I don't like you. I hate you"]
+        table = pa.Table.from_pydict({"texts": texts})
+
+        try:
+            predictions_table = self.nlp.text_classification_in_df(table, 'texts')
+
+            self.assertIsInstance(predictions_table, pa.Table)
+            self.assertEqual(
+                predictions_table.to_pydict(),
+                {
+                    "texts": texts,
+                    "predictions": ["POSITIVE", "NEGATIVE"],
+                }
+            )
+        except HTTPServiceUnavailableException:
+            pass
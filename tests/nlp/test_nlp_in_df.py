@@ -108,6 +108,18 @@ class TestNLPInDF(unittest.TestCase):
         except HTTPServiceUnavailableException:
             pass
 
+    def test_text_classification_in_df_cascade(self):
+        texts = ["I like you. I love you", "I don't like you. I hate you"]
+        df = pd.DataFrame(texts, columns=['texts'])
+
+        try:
+            predictions_df = self.nlp.text_classification_in_df(df, 'texts', cascade_models=['distilbert-base-uncased-finetuned-sst-2-english'], model='siebert/sentiment-roberta-large-english', cascade_threshold=0.5)
+
+            self.assertEqual(predictions_df['predictions'].tolist(), ["POSITIVE", "NEGATIVE"])
+            self.assertEqual(predictions_df['tier'].tolist(), ['distilbert-base-uncased-finetuned-sst-2-english'] * 2)
+        except HTTPServiceUnavailableException:
+            pass
+
     def test_text_generation_in_df(self):
         texts = ["The answer to the universe is"]
         df = pd.DataFrame(texts, columns=['texts'])
@@ -153,4 +165,44 @@ class TestNLPInDF(unittest.TestCase):
                 ),
             )
         except HTTPServiceUnavailableException:
-            pass
\ No newline at end of file
+            pass
+
+    def test_translation_in_df_with_language_columns(self):
+        texts = ["I like to play football", "Ich spiele gerne Fußball"]
+        df = pd.DataFrame({'texts': texts, 'lang_input': ["en", "de"]})
+
+        try:
+            assert_frame_equal(
+                self.nlp.translation_in_df(df, 'texts', lang_output="fr", lang_input_column='lang_input'),
+                pd.DataFrame(
+                    {
+                        "texts": texts,
+                        "lang_input": ["en", "de"],
+                        "predictions": ["J'aime jouer au football.", "J'aime jouer au football."],
+                    }
+                ),
+            )
+        except HTTPServiceUnavailableException:
+            pass
+
+    def test_table_question_answering_task_in_df(self):
+        question = "How many stars does the transformers repository have?"
+        df = pd.DataFrame({
+            "Repository": ["Transformers", "Datasets", "Tokenizers"],
+            "Stars": [36542, 4512, 3934],
+            "Contributors": [651, 77, 34],
+            "Programming language": ["Python", "Python", "Rust, Python and NodeJS"],
+        })
+
+        try:
+            assert_frame_equal(
+                self.nlp.table_question_answering_task_in_df(self.nlp.prepare_table(df), question, prune_columns=True),
+                pd.DataFrame(
+                    {
+                        "question": [question],
+                        "predictions": ["AVERAGE > 36542"],
+                    }
+                ),
+            )
+        except HTTPServiceUnavailableException:
+            pass
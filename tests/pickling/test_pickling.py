@@ -0,0 +1,52 @@
+import os
+import pickle
+import unittest
+
+from hugging_py_face import NLP, ComputerVision
+
+
+class TestPickling(unittest.TestCase):
+    def test_round_trip(self):
+        nlp = NLP('hf_token', config={'MICRO_BATCHING': True, 'MAX_CONCURRENT_REQUESTS': 4})
+        clone = pickle.loads(pickle.dumps(nlp))
+
+        self.assertEqual(clone.api_token, 'hf_token')
+        self.assertEqual(clone.config, nlp.config)
+        self.assertIsNotNone(clone.micro_batcher)
+        self.assertIsNotNone(clone.scheduler)
+        self.assertIsNot(clone.session, nlp.session)
+        self.assertIsNot(clone.micro_batcher, nlp.micro_batcher)
+        self.assertIsNot(clone.scheduler, nlp.scheduler)
+
+    def test_only_config_is_pickled(self):
+        state = ComputerVision('hf_token').__getstate__()
+
+        self.assertEqual(set(state), {'api_token', 'api_url', 'config'})
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "fork is not available")
+    def test_rebuilt_lazily_after_fork(self):
+        nlp = NLP('hf_token', config={'MICRO_BATCHING': True})
+        session, micro_batcher = nlp.session, nlp.micro_batcher
+
+        read, write = os.pipe()
+        # a lock held by another thread of the parent stays held in the child, so the child must not reuse the objects that own it
+        with micro_batcher._lock:
+            pid = os.fork()
+        if pid == 0:
+            # the state of the client is dropped by the fork hook, and only built again once it is used
+            stale = 'session' not in vars(nlp) and 'micro_batcher' not in vars(nlp)
+            rebuilt = nlp.session is not session and nlp.micro_batcher is not micro_batcher and not nlp.micro_batcher._lock.locked()
+            os.write(write, b'1' if stale and rebuilt else b'0')
+            os._exit(0)
+
+        os.waitpid(pid, 0)
+        self.assertEqual(os.read(read, 1), b'1')
+        self.assertIs(nlp.session, session)
+        self.assertIs(nlp.micro_batcher, micro_batcher)
+
+    def test_missing_attributes(self):
+        with self.assertRaises(AttributeError):
+            NLP('hf_token').missing
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import pandas as pd
+
+from hugging_py_face.exceptions import APICallException, CircuitOpenException
+from hugging_py_face.row_errors import RowError, query_isolating_errors, set_predictions
+
+
+class TestRowErrors(unittest.TestCase):
+    def test_query_isolating_errors(self):
+        batches = []
+
+        def query(batch):
+            batches.append(batch)
+            if "bad" in batch:
+                raise APICallException("API call failed with the error: bad input.")
+
+            return [text.upper() for text in batch]
+
+        predictions = query_isolating_errors(["a", "b", "bad", "c"], query)
+
+        self.assertEqual(predictions, ["A", "B", RowError("API call failed with the error: bad input."), "C"])
+        # the half without the bad input is not split any further
+        self.assertIn(["a", "b"], batches)
+        self.assertNotIn(["a"], batches)
+
+    def test_open_circuit_is_a_row_error(self):
+        batches = []
+
+        def query(batch):
+            batches.append(batch)
+            if len(batches) == 1:
+                raise APICallException("API call failed with the error: server error.")
+
+            raise CircuitOpenException("The circuit breaker of the model is open.")
+
+        predictions = query_isolating_errors(["a", "b", "c", "d"], query)
+
+        self.assertEqual(predictions, [RowError("The circuit breaker of the model is open.")] * 4)
+        self.assertEqual(batches, [["a", "b", "c", "d"], ["a", "b"], ["c", "d"]])
+
+    def test_set_predictions(self):
+        df = pd.DataFrame({'texts': ["a", "b"]})
+
+        set_predictions(df, [{'label': "A"}, RowError("error")], lambda prediction: prediction['label'])
+
+        self.assertEqual(df['predictions'].isna().tolist(), [False, True])
+        self.assertEqual(df['errors'].isna().tolist(), [True, False])
+        self.assertEqual(df.loc[1, 'errors'], "error")
+
+    def test_set_predictions_includes_errors(self):
+        df = pd.DataFrame({'texts': ["a", "b"]})
+
+        set_predictions(df, [{'label': "A"}, {'label': "B"}], lambda prediction: prediction['label'], include_errors=True)
+
+        self.assertEqual(df['errors'].isna().tolist(), [True, True])
+
+
+if __name__ == '__main__':
+    unittest.main()
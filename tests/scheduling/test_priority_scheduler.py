@@ -0,0 +1,66 @@
+import time
+import threading
+import unittest
+
+from hugging_py_face.scheduling import PriorityScheduler
+from hugging_py_face.exceptions import DeadlineExceededException
+
+
+class TestPriorityScheduler(unittest.TestCase):
+    def queue(self, scheduler, priorities):
+        order, threads = [], []
+        for priority in priorities:
+            def acquire(priority=priority):
+                scheduler.acquire(priority)
+                order.append(priority)
+
+            thread = threading.Thread(target=acquire)
+            thread.start()
+            threads.append(thread)
+            # the requests are queued one after the other
+            while sum(scheduler.as_dict()['queued'].values()) < len(threads):
+                time.sleep(0.001)
+
+        return order, threads
+
+    def test_interactive_jumps_ahead_of_bulk(self):
+        scheduler = PriorityScheduler(1, {'interactive': 8, 'bulk': 1})
+        scheduler.acquire('bulk')
+
+        order, threads = self.queue(scheduler, ['bulk', 'bulk', 'bulk', 'interactive'])
+        for thread in threads:
+            scheduler.release()
+            time.sleep(0.01)
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(order[0], 'interactive')
+
+    def test_bulk_gets_its_share(self):
+        scheduler = PriorityScheduler(1, {'interactive': 2, 'bulk': 1})
+        scheduler.acquire('interactive')
+
+        order, threads = self.queue(scheduler, ['interactive'] * 6 + ['bulk'] * 3)
+        for thread in threads:
+            scheduler.release()
+            time.sleep(0.01)
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(order[:6].count('bulk'), 2)
+
+    def test_timeout(self):
+        scheduler = PriorityScheduler(1, {'interactive': 8, 'bulk': 1})
+        scheduler.acquire('bulk')
+
+        with self.assertRaises(DeadlineExceededException):
+            scheduler.acquire('interactive', timeout=0.01)
+
+        scheduler.release()
+        self.assertEqual(scheduler.as_dict()['in_flight'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
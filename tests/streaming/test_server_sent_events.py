@@ -0,0 +1,83 @@
+import time
+import datetime
+import unittest
+
+from hugging_py_face.nlp import NLP
+from hugging_py_face.exceptions import APICallException, DeadlineExceededException
+from hugging_py_face.streaming import iter_server_sent_events
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, delay: float = 0):
+        self.body = body
+        self.delay = delay
+        self.elapsed = datetime.timedelta(0)
+        self.closed = False
+
+    def iter_lines(self, chunk_size=None):
+        for line in self.body.split(b'\n'):
+            time.sleep(self.delay)
+            yield line
+
+    def close(self):
+        self.closed = True
+
+
+class TestServerSentEvents(unittest.TestCase):
+    def test_events(self):
+        body = (
+            ': a comment\n'
+            'data: {"token": {"text": "café"}}\n'
+            '\n'
+            'data: {"token":\n'
+            'data:  {"text": " ✓"}}\n'
+            '\n'
+            'data: [DONE]\n'
+            '\n'
+            'data: {"token": {"text": "ignored"}}\n'
+        ).encode('utf-8')
+
+        events = list(iter_server_sent_events(FakeResponse(body)))
+
+        self.assertEqual([event['token']['text'] for event in events], ['café', ' ✓'])
+
+    def test_last_event_without_blank_line(self):
+        events = list(iter_server_sent_events(FakeResponse(b'data: {"generated_text": "done"}')))
+
+        self.assertEqual(events, [{'generated_text': 'done'}])
+
+    def test_error_event(self):
+        body = b'data: {"token": {"text": "a"}}\n\ndata: {"error": "Model is overloaded"}\n\n'
+
+        events = iter_server_sent_events(FakeResponse(body))
+        self.assertEqual(next(events)['token']['text'], 'a')
+        with self.assertRaises(APICallException):
+            next(events)
+
+
+class TestTokenStream(unittest.TestCase):
+    def setUp(self):
+        self.nlp = NLP('hf_token')
+
+    def test_stream_without_deadline(self):
+        self.nlp._request = lambda *args, **kwargs: FakeResponse(b'data: {"token": {"text": "a"}}\n\ndata: {"token": {"text": "b"}}\n\n')
+
+        stream = self.nlp.text_generation_stream('text', model='gpt2')
+
+        self.assertEqual(list(stream), ['a', 'b'])
+        self.assertEqual(stream.result, {'generated_text': 'ab'})
+
+    def test_stream_past_its_deadline_is_closed(self):
+        body = b''.join(b'data: {"token": {"text": "a"}}\n\n' for _ in range(20))
+        response = FakeResponse(body, delay=0.01)
+        self.nlp._request = lambda *args, **kwargs: response
+
+        stream = self.nlp.conversational_stream('text', model='gpt2', deadline=0.1)
+
+        with self.assertRaises(DeadlineExceededException):
+            list(stream)
+        self.assertTrue(response.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import pandas as pd
+
+from hugging_py_face.tables import PreparedTable, merge_answers
+
+
+class TestPreparedTable(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "City": ["Paris", "London", "Rome", "Berlin"],
+            "Population": [2161000, 8982000, 2873000, None],
+            "Mayor": ["Anne Hidalgo", "Sadiq Khan", "Roberto Gualtieri", "Kai Wegner"],
+        })
+
+    def test_cells_are_strings(self):
+        table = PreparedTable(self.df)
+        chunks = table.get_chunks()
+
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0][1]["Population"], ["2161000.0", "8982000.0", "2873000.0", ""])
+
+    def test_prune_columns(self):
+        table = PreparedTable(self.df)
+
+        self.assertEqual(table.prune_columns("What is the population of Rome?"), ("City", "Population"))
+        self.assertEqual(table.prune_columns("Who is it?"), ("City", "Population", "Mayor"))
+
+    def test_chunks_are_bounded(self):
+        table = PreparedTable(self.df, max_chars=50)
+        chunks = table.get_chunks()
+
+        self.assertEqual([start for start, _ in chunks], [0, 1, 2, 3])
+        self.assertIs(table.get_chunks(), chunks)
+
+    def test_merge_answers(self):
+        answers = [
+            (0, ("City", "Population"), {"answer": "SUM > 1", "coordinates": [[0, 1]], "cells": ["1"], "aggregator": "SUM"}),
+            (2, ("City", "Population"), {"answer": "SUM > 2", "coordinates": [[1, 1]], "cells": ["2"], "aggregator": "SUM"}),
+            (4, ("City", "Population"), {"answer": "", "coordinates": [], "cells": [], "aggregator": "NONE"}),
+        ]
+
+        self.assertEqual(
+            merge_answers(answers, ["City", "Population", "Mayor"]),
+            {"answer": "SUM > 1, 2", "coordinates": [[0, 1], [3, 1]], "cells": ["1", "2"], "aggregator": "SUM"}
+        )
+
+    def test_merge_single_cell_answers(self):
+        df = pd.DataFrame({
+            "City": [f"City{i}" for i in range(6)],
+            "Mayor": [f"Mayor number {i}" for i in range(6)],
+        })
+        table = PreparedTable(df, max_chars=60)
+        answers = [
+            (0, ("City", "Mayor"), {"answer": "Mayor number 0", "coordinates": [[0, 1]], "cells": ["Mayor number 0"], "aggregator": "NONE"}),
+            (2, ("City", "Mayor"), {"answer": "Mayor number 2", "coordinates": [[0, 1]], "cells": ["Mayor number 2"], "aggregator": "NONE"}),
+            (4, ("City", "Mayor"), {"answer": "Mayor number 5", "coordinates": [[1, 1]], "cells": ["Mayor number 5"], "aggregator": "NONE"}),
+        ]
+
+        self.assertEqual(
+            merge_answers(answers, table.columns, "Who is the mayor of City5?", table.cells),
+            {"answer": "Mayor number 5", "coordinates": [[5, 1]], "cells": ["Mayor number 5"], "aggregator": "NONE"}
+        )
+        self.assertEqual(merge_answers(answers, table.columns)["answer"], "Mayor number 0")
+
+    def test_not_chunked_by_default(self):
+        self.assertEqual(len(PreparedTable(pd.concat([self.df] * 100)).get_chunks()), 1)
+
+    def test_merge_list_answers(self):
+        answers = [
+            (0, ("City",), {"answer": "Paris, Lyon", "coordinates": [[0, 0], [1, 0]], "cells": ["Paris", "Lyon"], "aggregator": "NONE"}),
+            (2, ("City",), {"answer": "Rome", "coordinates": [[0, 0]], "cells": ["Rome"], "aggregator": "NONE"}),
+        ]
+
+        self.assertEqual(
+            merge_answers(answers, ["City", "Population"]),
+            {"answer": "Paris, Lyon, Rome", "coordinates": [[0, 0], [1, 0], [2, 0]], "cells": ["Paris", "Lyon", "Rome"], "aggregator": "NONE"}
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
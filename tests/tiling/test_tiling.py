@@ -0,0 +1,80 @@
+import os
+import time
+import tempfile
+import threading
+import unittest
+import importlib.util
+import numpy as np
+
+from hugging_py_face.computer_vision import ComputerVision
+from hugging_py_face.tiling import get_tiles, non_maximum_suppression, merge_tile_detections
+
+
+class TestTiling(unittest.TestCase):
+    def test_get_tiles(self):
+        tiles = get_tiles(250, 100, tile_size=100, overlap=0.2)
+
+        self.assertEqual(tiles.tolist(), [[0, 0, 100, 100], [80, 0, 180, 100], [150, 0, 250, 100]])
+
+    def test_non_maximum_suppression(self):
+        boxes = np.array([[0, 0, 10, 10], [1, 1, 11, 11], [0, 0, 10, 10], [50, 50, 60, 60]], dtype=float)
+        scores = np.array([0.9, 0.8, 0.7, 0.6])
+        labels = np.array(["dog", "dog", "cat", "dog"], dtype=object)
+
+        # the second box duplicates the first, while the third has a different label
+        self.assertEqual(non_maximum_suppression(boxes, scores, labels, 0.5).tolist(), [0, 2, 3])
+
+    def test_merge_tile_detections(self):
+        tiles = np.array([[0, 0, 100, 100], [80, 0, 180, 100]])
+        tile_detections = [
+            [{'score': 0.9, 'label': "dog", 'box': {'xmin': 85, 'ymin': 10, 'xmax': 95, 'ymax': 20}}],
+            [{'score': 0.8, 'label': "dog", 'box': {'xmin': 5, 'ymin': 10, 'xmax': 15, 'ymax': 20}}],
+        ]
+
+        self.assertEqual(
+            merge_tile_detections(tiles, tile_detections, 0.5),
+            [{'score': 0.9, 'label': "dog", 'box': {'xmin': 85, 'ymin': 10, 'xmax': 95, 'ymax': 20}}]
+        )
+
+
+
+@unittest.skipUnless(importlib.util.find_spec('PIL'), 'Pillow is not installed')
+class TestTiledObjectDetection(unittest.TestCase):
+    def setUp(self):
+        from PIL import Image
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(3):
+            path = os.path.join(self.directory.name, f'{i}.png')
+            Image.new('RGB', (250, 100)).save(path)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_tiles_of_every_image_are_sent_concurrently(self):
+        cv = ComputerVision('hf_token', config={'MAX_WORKERS': 9})
+        lock, in_flight, peak = threading.Lock(), [0], [0]
+
+        def post(data, model=None, task=None, extra_headers=None):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.1)
+            with lock:
+                in_flight[0] -= 1
+
+            return [{'score': 0.9, 'label': "dog", 'box': {'xmin': 10, 'ymin': 10, 'xmax': 20, 'ymax': 20}}]
+
+        cv._post = post
+        detections = cv.object_detection(self.paths, tile_size=100)
+
+        # the three tiles of each of the three images are all in flight at once
+        self.assertEqual(peak[0], 9)
+        self.assertEqual(len(detections), 3)
+        self.assertEqual(sorted(detection['box']['xmin'] for detection in detections[0]), [10, 90, 160])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+from hugging_py_face.zero_shot import shard_labels, merge_label_scores
+
+
+class TestLabelShards(unittest.TestCase):
+    def test_shard_labels(self):
+        labels = ["a", "b", "c", "d", "e"]
+
+        self.assertEqual(shard_labels(labels, 2), [["a", "b"], ["c", "d"], ["e"]])
+        self.assertEqual(shard_labels(labels, None), [labels])
+
+    def test_merge_multi_label(self):
+        prediction = merge_label_scores("text", {"a": 0.2, "b": 0.9}, multi_label=True)
+
+        self.assertEqual(prediction, {"sequence": "text", "labels": ["b", "a"], "scores": [0.9, 0.2]})
+
+    def test_merge_single_label(self):
+        prediction = merge_label_scores("text", {"a": 0.5, "b": 0.75}, multi_label=False)
+
+        self.assertEqual(prediction["labels"], ["b", "a"])
+        self.assertAlmostEqual(sum(prediction["scores"]), 1.0)
+        self.assertAlmostEqual(prediction["scores"][0], 0.75)
+
+
+if __name__ == '__main__':
+    unittest.main()